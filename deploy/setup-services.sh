@@ -12,6 +12,14 @@ sudo systemctl enable gunicorn
 sudo systemctl start gunicorn
 sudo systemctl status gunicorn --no-pager
 
+echo ""
+echo "Setting up the email queue worker..."
+sudo cp $APP_DIR/deploy/email-worker.service /etc/systemd/system/
+sudo systemctl daemon-reload
+sudo systemctl enable email-worker
+sudo systemctl start email-worker
+sudo systemctl status email-worker --no-pager
+
 echo ""
 echo "Setting up Nginx..."
 sudo cp $APP_DIR/deploy/nginx-scholarship-backend.conf /etc/nginx/sites-available/scholarship-backend
@@ -38,6 +46,7 @@ echo ""
 echo "Useful commands:"
 echo "  sudo systemctl status gunicorn    # Check Gunicorn status"
 echo "  sudo systemctl restart gunicorn   # Restart backend"
+echo "  sudo systemctl restart email-worker  # Restart the email queue worker"
 echo "  sudo systemctl status nginx       # Check Nginx status"
 echo "  sudo tail -f $APP_DIR/logs/gunicorn-error.log  # View logs"
 echo ""
@@ -3,7 +3,7 @@ from django.contrib import admin
 from django.utils.html import format_html
 from .models import (
     Scholarship, Level, ScholarshipCategory, FieldOfStudy,
-    FundType, SponsorType, LanguageRequirement, Country
+    FundType, SponsorType, LanguageRequirement, Country, ArchivedScholarship
 )
 
 class ScholarshipForm(forms.ModelForm):
@@ -137,3 +137,15 @@ class CountryAdmin(admin.ModelAdmin):
     list_display = ('name',)
     search_fields = ('name',)
     ordering = ('name',)
+
+@admin.register(ArchivedScholarship)
+class ArchivedScholarshipAdmin(admin.ModelAdmin):
+    list_display = ('title', 'country_name', 'deadline', 'archived_at')
+    search_fields = ('title', 'provider')
+    list_filter = ('deadline',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ScholarshipsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'scholarships'
+
+    def ready(self):
+        # Import signals to ensure they're connected
+        import scholarships.signals
@@ -0,0 +1,58 @@
+"""
+Nightly upkeep of the live scholarship table.
+
+is_active is flipped for rows whose deadline passed since the last run, so
+listings keep using the small active-row index, and scholarships that closed
+more than a retention period ago are copied into ArchivedScholarship and
+deleted a batch at a time. Deleting goes through the ORM, so the search
+index, listing cards and cached responses follow. Applications and saved
+scholarships cascade from Scholarship, so rows any user still applied to or
+saved stay in the live table until those are gone.
+"""
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from users.models import SavedScholarship, ScholarshipApplication
+
+from .models import ArchivedScholarship, Scholarship, SCHOLARSHIP_M2M_FIELDS
+from .response_cache import bump_generation
+
+
+def sync_is_active(today=None):
+    """Bring is_active in line with the deadlines; returns (deactivated, reactivated)"""
+    today = today or timezone.localdate()
+    deactivated = Scholarship.objects.filter(is_active=True, deadline__lt=today).update(is_active=False)
+    # Only deadlines moved with queryset.update() can get here
+    reactivated = Scholarship.objects.filter(is_active=False, deadline__gte=today).update(is_active=True)
+    if reactivated:
+        bump_generation()
+    return deactivated, reactivated
+
+
+def archivable(cutoff):
+    """Scholarships closed before ``cutoff`` that no user has applied to or saved"""
+    applied = Exists(ScholarshipApplication.objects.filter(scholarship=OuterRef('pk')))
+    saved = Exists(SavedScholarship.objects.filter(scholarship=OuterRef('pk')))
+    return Scholarship.objects.filter(deadline__lt=cutoff).exclude(applied).exclude(saved)
+
+
+def archive_closed_before(cutoff, batch_size=500):
+    """Move archivable scholarships closed before ``cutoff`` to the archive; returns how many moved"""
+    closed = (
+        archivable(cutoff)
+        .order_by('pk')
+        .select_related('country')
+        .prefetch_related(*SCHOLARSHIP_M2M_FIELDS)
+    )
+    archived = 0
+    while True:
+        with transaction.atomic():
+            batch = list(closed[:batch_size])
+            if not batch:
+                return archived
+            ArchivedScholarship.objects.bulk_create(
+                [ArchivedScholarship.from_scholarship(s) for s in batch]
+            )
+            Scholarship.objects.filter(pk__in=[s.pk for s in batch]).delete()
+        archived += len(batch)
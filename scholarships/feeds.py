@@ -0,0 +1,123 @@
+"""
+Precomputed homepage feeds.
+
+A feed is an ordered list of at most FEED_SIZE ids of open scholarships
+(deadline today or later), built with one LIMIT query and kept in the
+responses cache. Keys carry the scholarship generation, which every write
+bumps, and today's date, so a feed is rebuilt on the first read after a write
+or once the day rolls over and expired rows have to drop out. Running
+`manage.py refresh_feeds` from cron rebuilds them ahead of the traffic. Reads
+hydrate the ids from ScholarshipCard in one query.
+"""
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+from django.utils.connection import ConnectionProxy
+
+from .models import Country, Scholarship, ScholarshipCard
+from .response_cache import get_generation
+from .taxonomy import resolve_taxonomy_ids
+
+cache = ConnectionProxy(caches, settings.RESPONSE_CACHE_ALIAS)
+
+FEED_KEY = 'scholarships:feed:{generation}:{date}:{name}'
+FEED_SIZE = 50
+FEED_TIMEOUT = 60 * 60 * 6
+COUNTRY_FEED_PREFIX = 'country-'
+
+
+def open_scholarships(today):
+    return Scholarship.objects.active(today)
+
+
+def featured(today):
+    return open_scholarships(today).filter(is_featured=True).order_by('deadline', 'id')
+
+
+def closing_soon(today, days):
+    return (
+        open_scholarships(today)
+        .filter(deadline__lte=today + timedelta(days=days))
+        .order_by('deadline', 'id')
+    )
+
+
+def newest(today):
+    return open_scholarships(today).order_by('-created_at', '-id')
+
+
+def by_country(today, country_id):
+    return open_scholarships(today).filter(country_id=country_id).order_by('deadline', 'id')
+
+
+# feed name -> function of today returning the ordered queryset
+FEEDS = {
+    'featured': featured,
+    'closing-7': partial(closing_soon, days=7),
+    'closing-30': partial(closing_soon, days=30),
+    'newest': newest,
+}
+
+
+def resolve_feed(name):
+    """
+    Return (canonical name, queryset builder) for ``name``, or None for an
+    unknown feed. Country feeds are named ``country-<id, slug or name>``.
+    """
+    if name in FEEDS:
+        return name, FEEDS[name]
+    if name.startswith(COUNTRY_FEED_PREFIX):
+        country_ids = resolve_taxonomy_ids(Country, [name[len(COUNTRY_FEED_PREFIX):]])[0]
+        if country_ids:
+            country_id = min(country_ids)
+            return f'{COUNTRY_FEED_PREFIX}{country_id}', partial(by_country, country_id=country_id)
+    return None
+
+
+def feed_key(name, today):
+    return FEED_KEY.format(generation=get_generation(), date=today.isoformat(), name=name)
+
+
+def build_feed(name, builder, today):
+    ids = list(builder(today).values_list('pk', flat=True)[:FEED_SIZE])
+    cache.set(feed_key(name, today), ids, FEED_TIMEOUT)
+    return ids
+
+
+def get_feed_ids(name, today=None):
+    """The ordered scholarship ids of feed ``name``, or None for an unknown feed"""
+    feed = resolve_feed(name)
+    if feed is None:
+        return None
+    name, builder = feed
+    today = today or timezone.localdate()
+    ids = cache.get(feed_key(name, today))
+    if ids is None:
+        ids = build_feed(name, builder, today)
+    return ids
+
+
+def get_feed_cards(ids):
+    """The listing cards of ``ids`` in feed order, from one query"""
+    cards = ScholarshipCard.objects.in_bulk(ids)
+    # Raw (loaddata) saves and bulk inserts skip the card signal; build those cards now,
+    # as the card listing does. Only scholarships deleted since the build drop out.
+    missing = [pk for pk in ids if pk not in cards]
+    if missing:
+        cards.update((card.pk, card) for card in ScholarshipCard.objects.refresh(missing))
+    return [cards[pk] for pk in ids if pk in cards]
+
+
+def refresh_feeds(today=None):
+    """Rebuild every feed, including one per country with open scholarships; returns the count"""
+    today = today or timezone.localdate()
+    feeds = dict(FEEDS)
+    country_ids = open_scholarships(today).order_by().values_list('country_id', flat=True).distinct()
+    for country_id in country_ids:
+        feeds[f'{COUNTRY_FEED_PREFIX}{country_id}'] = partial(by_country, country_id=country_id)
+    for name, builder in feeds.items():
+        build_feed(name, builder, today)
+    return len(feeds)
@@ -1,18 +1,111 @@
+from django.db.models import Exists, OuterRef
 from django_filters import rest_framework as filters
+from django_filters.constants import EMPTY_VALUES
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
 from .models import Scholarship
+from .search import get_search_backend
+from .taxonomy import resolve_taxonomy_ids
+
+
+class TaxonomyFilter(filters.CharFilter):
+    """
+    Filter on a taxonomy relation by comma-separated ids, slugs or names.
+
+    Values are resolved to ids against the cached taxonomy map, so the
+    scholarship query only sees indexed id lookups: ``country_id IN (...)``
+    for the country FK and EXISTS subqueries on the through table for M2M
+    relations, which never duplicate rows. By default any value may match;
+    ``match_all`` requires every value. ``?name_match=contains`` restores the
+    old substring matching on names.
+    """
+
+    def __init__(self, *args, match_all=False, **kwargs):
+        self.match_all = match_all
+        super().__init__(*args, **kwargs)
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        tokens = [token.strip() for token in value.split(',') if token.strip()]
+        if not tokens:
+            return qs
+
+        field = Scholarship._meta.get_field(self.field_name)
+        contains = self.parent.data.get('name_match') == 'contains'
+        resolved = resolve_taxonomy_ids(field.related_model, tokens, contains=contains)
+
+        if self.match_all:
+            if not all(resolved):
+                return qs.none()
+            groups = resolved
+        else:
+            ids = set().union(*resolved)
+            if not ids:
+                return qs.none()
+            groups = [ids]
+
+        if not field.many_to_many:
+            # A scholarship has a single country, so it can only match all of
+            # several values if they resolve to the same one
+            for ids in groups:
+                qs = qs.filter(**{f'{field.attname}__in': ids})
+            return qs
+
+        through = field.remote_field.through
+        source = field.m2m_field_name()
+        target = field.m2m_reverse_field_name()
+        for ids in groups:
+            qs = qs.filter(Exists(through.objects.filter(
+                **{f'{source}_id': OuterRef('pk'), f'{target}_id__in': ids}
+            )))
+        return qs
+
 
 class ScholarshipFilter(filters.FilterSet):
-    levels = filters.CharFilter(field_name='levels__name', lookup_expr='icontains')
-    field_of_study = filters.CharFilter(field_name='field_of_study__name', lookup_expr='icontains')
-    fund_type = filters.CharFilter(field_name='fund_type__name', lookup_expr='icontains')
-    sponsor_type = filters.CharFilter(field_name='sponsor_type__name', lookup_expr='icontains')
-    scholarship_category = filters.CharFilter(field_name='scholarship_category__name', lookup_expr='icontains')
+    levels = TaxonomyFilter(field_name='levels')
+    levels_all = TaxonomyFilter(field_name='levels', match_all=True)
+    field_of_study = TaxonomyFilter(field_name='field_of_study')
+    field_of_study_all = TaxonomyFilter(field_name='field_of_study', match_all=True)
+    fund_type = TaxonomyFilter(field_name='fund_type')
+    fund_type_all = TaxonomyFilter(field_name='fund_type', match_all=True)
+    sponsor_type = TaxonomyFilter(field_name='sponsor_type')
+    sponsor_type_all = TaxonomyFilter(field_name='sponsor_type', match_all=True)
+    scholarship_category = TaxonomyFilter(field_name='scholarship_category')
+    scholarship_category_all = TaxonomyFilter(field_name='scholarship_category', match_all=True)
+    language_requirement = TaxonomyFilter(field_name='language_requirement')
+    language_requirement_all = TaxonomyFilter(field_name='language_requirement', match_all=True)
+    country = TaxonomyFilter(field_name='country')
     deadline_after = filters.DateFilter(field_name='deadline', lookup_expr='gte')
     deadline_before = filters.DateFilter(field_name='deadline', lookup_expr='lte')
-    country = filters.CharFilter(field_name='country__name', lookup_expr='icontains')
-    
+    # Compatibility switch read by TaxonomyFilter, it does not filter by itself
+    name_match = filters.ChoiceFilter(
+        choices=[('exact', 'Exact'), ('contains', 'Contains')],
+        method='filter_name_match',
+    )
+
     class Meta:
         model = Scholarship
         fields = {
             'is_featured': ['exact'],
         }
+
+    def filter_name_match(self, queryset, name, value):
+        return queryset
+
+
+class ScholarshipSearchFilter(SearchFilter):
+    """
+    Drop-in replacement for SearchFilter that runs ?search= through the
+    configured full-text backend and orders by relevance unless the client
+    asked for an explicit ordering.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        queryset = get_search_backend().search(queryset, ' '.join(terms))
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            queryset = queryset.order_by('-search_rank', '-created_at')
+        return queryset
@@ -0,0 +1,39 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from scholarships.archive import archivable, archive_closed_before, sync_is_active
+
+
+class Command(BaseCommand):
+    help = 'Deactivate expired scholarships and move long-closed ones to the archive table (run nightly)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-days', type=int, default=365,
+            help=(
+                'Archive scholarships whose deadline passed more than this many days ago (default: %(default)s); '
+                'ones with applications or saves are kept'
+            ),
+        )
+        parser.add_argument('--batch-size', type=int, default=500, help='Scholarships moved per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Count what would be archived without changing anything')
+
+    def handle(self, *args, **options):
+        if options['older_than_days'] < 0:
+            raise CommandError('--older-than-days must not be negative')
+        today = timezone.localdate()
+        cutoff = today - timedelta(days=options['older_than_days'])
+
+        if options['dry_run']:
+            count = archivable(cutoff).count()
+            self.stdout.write(self.style.SUCCESS(f'Would archive {count} scholarships closed before {cutoff}'))
+            return
+
+        deactivated, reactivated = sync_is_active(today)
+        archived = archive_closed_before(cutoff, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Deactivated {deactivated} and reactivated {reactivated} scholarships; '
+            f'archived {archived} closed before {cutoff}'
+        ))
@@ -0,0 +1,86 @@
+import random
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.filters import SearchFilter
+from rest_framework.test import APIRequestFactory
+from rest_framework.request import Request
+
+from scholarships.filters import ScholarshipSearchFilter
+from scholarships.models import Scholarship, Country
+from scholarships.search import get_search_backend
+
+WORDS = (
+    'engineering medicine business research merit need international graduate '
+    'undergraduate doctoral leadership science technology arts law nursing '
+    'excellence women stem africa asia europe award grant fellowship community '
+    'innovation energy climate data computing mathematics physics chemistry'
+).split()
+
+
+class _SearchView:
+    search_fields = ['title', 'description']
+
+
+class Command(BaseCommand):
+    help = 'Compare the full-text search backend against the legacy icontains SearchFilter'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000, help='Synthetic scholarships to create')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per query')
+        parser.add_argument('--page-size', type=int, default=10)
+        parser.add_argument(
+            'queries', nargs='*',
+            default=['engineering', 'research grant', 'women stem', 'climate fellowship'],
+        )
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        self.stdout.write(f'Search backend: {backend.__class__.__name__}')
+
+        # Everything runs inside a transaction that is rolled back at the end,
+        # so the benchmark never leaves synthetic rows behind
+        with transaction.atomic():
+            self.create_rows(options['rows'], backend)
+            for query in options['queries']:
+                legacy = self.time_filter(SearchFilter(), query, options)
+                fulltext = self.time_filter(ScholarshipSearchFilter(), query, options)
+                self.stdout.write(
+                    f'{query!r:>24}: icontains {legacy * 1000:8.1f} ms | '
+                    f'full-text {fulltext * 1000:8.1f} ms | '
+                    f'speedup x{legacy / fulltext if fulltext else float("inf"):.1f}'
+                )
+            transaction.set_rollback(True)
+
+    def create_rows(self, count, backend, batch_size=2000):
+        country, _ = Country.objects.get_or_create(name='Benchmarkland')
+        rng = random.Random(42)
+        start = time.perf_counter()
+        for offset in range(0, count, batch_size):
+            batch = []
+            for i in range(offset, min(offset + batch_size, count)):
+                title = ' '.join(rng.choices(WORDS, k=4)).title()
+                body = ' '.join(rng.choices(WORDS, k=120))
+                batch.append(Scholarship(
+                    title=title,
+                    slug=f'benchmark-{i}',
+                    description=f'<p>{body}</p>',
+                    country=country,
+                    deadline=date.today() + timedelta(days=rng.randint(-365, 365)),
+                ))
+            backend.index(Scholarship.objects.bulk_create(batch))
+        self.stdout.write(f'Created and indexed {count} rows in {time.perf_counter() - start:.1f}s')
+
+    def time_filter(self, search_filter, query, options):
+        request = Request(APIRequestFactory().get('/', {'search': query}))
+        best = None
+        for _ in range(options['repeat']):
+            start = time.perf_counter()
+            queryset = search_filter.filter_queryset(request, Scholarship.objects.all(), _SearchView())
+            queryset.count()
+            list(queryset[:options['page_size']])
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
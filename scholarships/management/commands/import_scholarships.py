@@ -0,0 +1,339 @@
+import csv
+import hashlib
+import io
+import json
+import sys
+import time
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.dateparse import parse_date
+from django.utils.text import slugify
+
+from scholarships.models import Scholarship, ScholarshipCard, SCHOLARSHIP_M2M_FIELDS
+from scholarships.response_cache import bump_generation
+from scholarships.search import get_search_backend
+from scholarships.taxonomy import bump_taxonomy_version, get_taxonomy_lookup
+
+# Plain columns copied onto Scholarship and refreshed when the row was imported before
+SCALAR_FIELDS = (
+    'title', 'description', 'provider', 'amount', 'deadline', 'open_date',
+    'application_url', 'is_featured', 'country_id', 'updated_at', 'is_active',
+)
+TAXONOMY_FIELDS = ('country',) + SCHOLARSHIP_M2M_FIELDS
+TRUE_VALUES = {'1', 'true', 'yes', 'y'}
+
+
+class RowError(ValueError):
+    pass
+
+
+def import_key_for(external_id, slug, title, provider):
+    """Stable key of a feed row: its external id, else its slug, else its (title, provider)"""
+    if external_id:
+        parts = ('id', external_id)
+    elif slug:
+        parts = ('slug', slug)
+    else:
+        parts = ('title', ' '.join(title.split()).lower(), ' '.join(provider.split()).lower())
+    return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+class Command(BaseCommand):
+    help = (
+        'Stream scholarships from a CSV or JSONL file into the database with bulk upserts. '
+        'Rows are keyed on their external_id column, else their slug, else (title, provider), and '
+        're-imports only update rows an earlier import created; scholarships added any other way '
+        'are never touched. New rows without a slug get one allocated from the title. '
+        'Taxonomy columns (country, levels, field_of_study, fund_type, sponsor_type, '
+        'scholarship_category, language_requirement) take names, slugs or ids.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSONL file, or - for stdin')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help='Defaults to the file extension')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per transaction')
+        parser.add_argument(
+            '--separator', default='|',
+            help='Separator between multiple taxonomy values in a CSV cell (default: |)',
+        )
+        parser.add_argument(
+            '--create-missing', action='store_true',
+            help='Create taxonomy entries that do not exist yet instead of rejecting the row',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Run everything, then roll back')
+        parser.add_argument('--max-errors', type=int, default=20, help='Rejected rows to print')
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.search_backend = get_search_backend()
+        self.load_taxonomies()
+        stats = {'rows': 0, 'created': 0, 'updated': 0, 'rejected': 0}
+
+        start = time.perf_counter()
+        with self.open_source(options['path']) as source:
+            rows = self.iter_rows(source, self.detect_format(options))
+            while True:
+                chunk = list(islice(rows, options['batch_size']))
+                if not chunk:
+                    break
+                self.import_chunk(chunk, stats)
+                if options['verbosity'] > 1:
+                    elapsed = time.perf_counter() - start
+                    self.stdout.write(f"  {stats['rows']} rows, {stats['rows'] / elapsed:.0f} rows/sec")
+
+        elapsed = time.perf_counter() - start
+        rate = stats['rows'] / elapsed if elapsed else 0
+        summary = (
+            f"{stats['rows']} rows in {elapsed:.1f}s ({rate:.0f} rows/sec): "
+            f"{stats['created']} created, {stats['updated']} updated, {stats['rejected']} rejected"
+        )
+        if options['dry_run']:
+            summary = f'Dry run, nothing was saved. {summary}'
+        self.stdout.write(self.style.SUCCESS(summary))
+
+    # Input
+
+    def detect_format(self, options):
+        if options['format']:
+            return options['format']
+        suffix = Path(options['path']).suffix.lower()
+        if suffix in ('.jsonl', '.ndjson'):
+            return 'jsonl'
+        if suffix == '.csv':
+            return 'csv'
+        raise CommandError('Cannot tell the file format from its name, pass --format')
+
+    def open_source(self, path):
+        if path == '-':
+            return io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8-sig')
+        try:
+            return open(path, newline='', encoding='utf-8-sig')
+        except OSError as e:
+            raise CommandError(f'Cannot open {path}: {e}')
+
+    def iter_rows(self, source, fmt):
+        """Yield (row, split taxonomy values) one row at a time, never holding the file in memory"""
+        if fmt == 'csv':
+            for row in csv.DictReader(source):
+                yield row, self.split_csv_values(row)
+            return
+        for line_number, line in enumerate(source, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line), None
+            except json.JSONDecodeError as e:
+                yield {'_error': f'line {line_number}: invalid JSON ({e})'}, None
+
+    def split_csv_values(self, row):
+        separator = self.options['separator']
+        return {
+            field: [value.strip() for value in row[field].split(separator) if value.strip()]
+            for field in SCHOLARSHIP_M2M_FIELDS
+            if row.get(field) is not None
+        }
+
+    # Taxonomies
+
+    def load_taxonomies(self):
+        """Build name/slug/id -> id maps for every taxonomy once, up front"""
+        self.taxonomies = {}
+        for field_name in TAXONOMY_FIELDS:
+            model = Scholarship._meta.get_field(field_name).related_model
+            lookup = get_taxonomy_lookup(model)
+            keys = dict(lookup['keys'])
+            keys.update({str(pk): pk for pk in lookup['ids']})
+            self.taxonomies[field_name] = keys
+
+    def resolve(self, field_name, value):
+        value = str(value).strip()
+        keys = self.taxonomies[field_name]
+        pk = keys.get(value.lower(), keys.get(slugify(value)))
+        if pk is None:
+            raise RowError(f'unknown {field_name} {value!r}')
+        return pk
+
+    def create_missing(self, parsed):
+        """Create every taxonomy name in ``parsed`` that is not in the maps yet"""
+        missing = {}
+        for _, _, values in parsed:
+            for field_name, names in values.items():
+                for name in names:
+                    name = str(name).strip()
+                    keys = self.taxonomies[field_name]
+                    if not name.isdigit() and keys.get(name.lower(), keys.get(slugify(name))) is None:
+                        missing.setdefault(field_name, set()).add(name)
+        for field_name, names in missing.items():
+            model = Scholarship._meta.get_field(field_name).related_model
+            model.objects.bulk_create([model(name=name) for name in names], ignore_conflicts=True)
+            for pk, name in model.objects.filter(name__in=names).values_list('pk', 'name'):
+                self.taxonomies[field_name][name.lower()] = pk
+                self.taxonomies[field_name][slugify(name)] = pk
+        if missing:
+            # bulk_create sends no signals, so invalidate cached taxonomies by hand
+            bump_taxonomy_version()
+        return bool(missing)
+
+    # Rows
+
+    def parse(self, row, split_values):
+        """Validate one input row into (Scholarship, {taxonomy field: [names, slugs or ids]})"""
+        if '_error' in row:
+            raise RowError(row['_error'])
+        title = (row.get('title') or '').strip()
+        if not title:
+            raise RowError('title is required')
+        deadline = parse_date(str(row.get('deadline') or ''))
+        if deadline is None:
+            raise RowError(f"invalid deadline {row.get('deadline')!r}")
+        open_date = None
+        if row.get('open_date'):
+            open_date = parse_date(str(row['open_date']))
+            if open_date is None:
+                raise RowError(f"invalid open_date {row['open_date']!r}")
+        try:
+            amount = Decimal(str(row.get('amount') or 0))
+        except InvalidOperation:
+            raise RowError(f"invalid amount {row.get('amount')!r}")
+        if not row.get('country'):
+            raise RowError('country is required')
+
+        slug = (row.get('slug') or '').strip()
+        provider = (row.get('provider') or '').strip() or 'Unknown Provider'
+        scholarship = Scholarship(
+            title=title,
+            slug=slug,
+            import_key=import_key_for(str(row.get('external_id') or '').strip(), slug, title, provider),
+            description=row.get('description') or '',
+            provider=provider,
+            amount=amount,
+            deadline=deadline,
+            open_date=open_date,
+            application_url=row.get('application_url') or '',
+            is_featured=str(row.get('is_featured', '')).strip().lower() in TRUE_VALUES,
+        )
+        # bulk_create skips save(), which keeps is_active in step with the deadline
+        scholarship.set_is_active()
+
+        if split_values is None:
+            split_values = {}
+            for field in SCHOLARSHIP_M2M_FIELDS:
+                if field in row:
+                    values = row[field] or []
+                    split_values[field] = [values] if isinstance(values, (str, int)) else values
+        return scholarship, dict(split_values, country=[row['country']])
+
+    def reject(self, stats, row_number, message):
+        stats['rejected'] += 1
+        if stats['rejected'] <= self.options['max_errors']:
+            self.stderr.write(f'Row {row_number}: {message}')
+
+    def import_chunk(self, chunk, stats):
+        parsed = []
+        for row, split_values in chunk:
+            stats['rows'] += 1
+            try:
+                parsed.append((stats['rows'], *self.parse(row, split_values)))
+            except RowError as e:
+                self.reject(stats, stats['rows'], e)
+
+        created_taxonomies = False
+        with transaction.atomic():
+            if self.options['create_missing']:
+                created_taxonomies = self.create_missing(parsed)
+
+            built = []
+            for row_number, scholarship, values in parsed:
+                try:
+                    relations = {
+                        field: [self.resolve(field, value) for value in field_values]
+                        for field, field_values in values.items()
+                    }
+                except RowError as e:
+                    self.reject(stats, row_number, e)
+                    continue
+                scholarship.country_id = relations.pop('country')[0]
+                built.append((row_number, scholarship, relations))
+
+            self.write(built, stats)
+            if self.options['dry_run']:
+                transaction.set_rollback(True)
+
+        if self.options['dry_run'] and created_taxonomies:
+            # The new taxonomy rows were rolled back with the chunk
+            self.load_taxonomies()
+
+    def write(self, built, stats):
+        if not built:
+            return
+
+        # Later rows win when the same key appears twice in a chunk
+        by_key = {}
+        for row_number, scholarship, relations in built:
+            by_key[scholarship.import_key] = (row_number, scholarship, relations)
+        existing = dict(
+            Scholarship.objects.filter(import_key__in=list(by_key)).values_list('import_key', 'slug')
+        )
+
+        # New rows may not take a slug that is already in use, by the import or anyone else
+        wanted = [s.slug for _, s, _ in by_key.values() if s.slug and s.import_key not in existing]
+        taken = set(Scholarship.objects.filter(slug__in=wanted).values_list('slug', flat=True))
+        items = []
+        for row_number, scholarship, relations in by_key.values():
+            if scholarship.import_key in existing:
+                # Imported before: keep the slug it was published under
+                scholarship.slug = existing[scholarship.import_key]
+            elif scholarship.slug in taken:
+                self.reject(stats, row_number, f'slug {scholarship.slug!r} is already used by another scholarship')
+                continue
+            elif scholarship.slug:
+                taken.add(scholarship.slug)
+            items.append((scholarship, relations))
+        if not items:
+            return
+        Scholarship.objects.assign_slugs([s for s, _ in items])
+        keys = [s.import_key for s, _ in items]
+
+        # Conflicts are only resolved on import_key, which only imported rows carry
+        Scholarship.objects.bulk_create(
+            [s for s, _ in items],
+            update_conflicts=True,
+            unique_fields=['import_key'],
+            update_fields=list(SCALAR_FIELDS),
+        )
+        ids = dict(Scholarship.objects.filter(import_key__in=keys).values_list('import_key', 'id'))
+        for scholarship, _ in items:
+            scholarship.pk = ids[scholarship.import_key]
+
+        for field in SCHOLARSHIP_M2M_FIELDS:
+            m2m = Scholarship._meta.get_field(field)
+            through = m2m.remote_field.through
+            source = f'{m2m.m2m_field_name()}_id'
+            target = f'{m2m.m2m_reverse_field_name()}_id'
+            touched = [s.pk for s, relations in items if field in relations]
+            if not touched:
+                continue
+            # Replace the links of every row that carried this column
+            through.objects.filter(**{f'{source}__in': touched}).delete()
+            through.objects.bulk_create(
+                [
+                    through(**{source: s.pk, target: pk})
+                    for s, relations in items
+                    for pk in set(relations.get(field, ()))
+                ],
+                ignore_conflicts=True,
+            )
+
+        # bulk_create bypasses post_save, so index the chunk and rebuild its cards in one go
+        self.search_backend.index([s for s, _ in items])
+        ScholarshipCard.objects.refresh(s.pk for s, _ in items)
+        bump_generation()
+
+        updated = sum(1 for key in keys if key in existing)
+        stats['updated'] += updated
+        stats['created'] += len(items) - updated
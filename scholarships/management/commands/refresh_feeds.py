@@ -0,0 +1,16 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from scholarships.feeds import refresh_feeds
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the cached homepage feeds (featured, closing soon, newest and per country)'
+
+    def handle(self, *args, **options):
+        start = time.monotonic()
+        count = refresh_feeds()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {count} feeds in {time.monotonic() - start:.2f}s'
+        ))
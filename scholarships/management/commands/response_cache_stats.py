@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from scholarships import response_cache
+
+
+class Command(BaseCommand):
+    help = 'Show hit/miss counts of the anonymous scholarship response cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Zero the counters after printing them')
+
+    def handle(self, *args, **options):
+        metrics = response_cache.get_metrics()
+        ratio = metrics['hit_ratio']
+        self.stdout.write(
+            f"hits={metrics['hit']} misses={metrics['miss']} bypassed={metrics['bypass']} "
+            f"hit_ratio={'n/a' if ratio is None else f'{ratio:.1%}'}"
+        )
+        if options['reset']:
+            response_cache.reset_metrics()
+            self.stdout.write(self.style.SUCCESS('Counters reset'))
@@ -0,0 +1,59 @@
+from django.db import migrations
+from django.utils.html import strip_tags
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    Scholarship = apps.get_model('scholarships', 'Scholarship')
+    table = Scholarship._meta.db_table
+    documents = [
+        (s.pk, s.title, strip_tags(s.description))
+        for s in Scholarship.objects.only('id', 'title', 'description').iterator()
+    ]
+
+    if vendor == 'postgresql':
+        schema_editor.execute(f'ALTER TABLE "{table}" ADD COLUMN search_vector tsvector')
+        schema_editor.execute(
+            f'CREATE INDEX "{table}_search_vector_gin" ON "{table}" USING GIN (search_vector)'
+        )
+        sql = (
+            f'UPDATE "{table}" SET search_vector = '
+            "setweight(to_tsvector('english', %s), 'A') || "
+            "setweight(to_tsvector('english', %s), 'B') WHERE id = %s"
+        )
+        rows = [(title, body, pk) for pk, title, body in documents]
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {table}_fts USING fts5(title, body, tokenize='porter unicode61')"
+        )
+        sql = f'INSERT INTO {table}_fts (rowid, title, body) VALUES (%s, %s, %s)'
+        rows = documents
+    else:
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    table = apps.get_model('scholarships', 'Scholarship')._meta.db_table
+
+    if vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{table}_search_vector_gin"')
+        schema_editor.execute(f'ALTER TABLE "{table}" DROP COLUMN IF EXISTS search_vector')
+    elif vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {table}_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scholarships', '0016_merge_20260509_2042'),
+    ]
+
+    operations = [
+        # The search structures are vendor specific and invisible to the ORM,
+        # see scholarships/search.py for how they are queried and maintained
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
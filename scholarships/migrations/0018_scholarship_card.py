@@ -0,0 +1,55 @@
+# Generated by Django 5.2.1 on 2026-10-17 00:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+LABEL_FIELDS = ('levels', 'field_of_study', 'fund_type')
+
+
+def build_cards(apps, schema_editor):
+    Scholarship = apps.get_model('scholarships', 'Scholarship')
+    ScholarshipCard = apps.get_model('scholarships', 'ScholarshipCard')
+    scholarships = Scholarship.objects.select_related('country').prefetch_related(*LABEL_FIELDS)
+    cards = [
+        ScholarshipCard(
+            scholarship_id=s.pk,
+            title=s.title,
+            slug=s.slug,
+            provider=s.provider,
+            amount=s.amount,
+            deadline=s.deadline,
+            is_featured=s.is_featured,
+            country_name=s.country.name,
+            labels={
+                field: sorted(item.name for item in getattr(s, field).all())
+                for field in LABEL_FIELDS
+            },
+        )
+        for s in scholarships.iterator(chunk_size=1000)
+    ]
+    ScholarshipCard.objects.bulk_create(cards, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scholarships', '0017_scholarship_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScholarshipCard',
+            fields=[
+                ('scholarship', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='card', serialize=False, to='scholarships.scholarship')),
+                ('title', models.CharField(max_length=200)),
+                ('slug', models.SlugField(max_length=250)),
+                ('provider', models.CharField(max_length=200)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('deadline', models.DateField()),
+                ('is_featured', models.BooleanField(default=False)),
+                ('country_name', models.CharField(max_length=100)),
+                ('labels', models.JSONField(default=dict)),
+            ],
+        ),
+        migrations.RunPython(build_cards, migrations.RunPython.noop),
+    ]
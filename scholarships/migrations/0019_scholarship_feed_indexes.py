@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-17 00:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scholarships', '0018_scholarship_card'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='scholarship',
+            index=models.Index(fields=['is_featured', 'deadline'], name='scholarship_featured_deadline'),
+        ),
+        migrations.AddIndex(
+            model_name='scholarship',
+            index=models.Index(fields=['deadline'], name='scholarship_deadline'),
+        ),
+    ]
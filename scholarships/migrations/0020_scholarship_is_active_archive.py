@@ -0,0 +1,60 @@
+# Generated by Django 5.2.1 on 2026-10-17 00:36
+
+import datetime
+
+import scholarships.models
+from django.db import migrations, models
+
+
+def flag_expired(apps, schema_editor):
+    Scholarship = apps.get_model('scholarships', 'Scholarship')
+    Scholarship.objects.filter(deadline__lt=datetime.date.today()).update(is_active=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scholarships', '0019_scholarship_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedScholarship',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.PositiveBigIntegerField(db_index=True)),
+                ('title', models.CharField(max_length=200)),
+                ('slug', models.SlugField(max_length=250)),
+                ('description', models.TextField()),
+                ('provider', models.CharField(max_length=200)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('deadline', models.DateField()),
+                ('open_date', models.DateField(blank=True, null=True)),
+                ('country_name', models.CharField(max_length=100)),
+                ('application_url', models.URLField(blank=True)),
+                ('image', models.CharField(blank=True, max_length=100)),
+                ('is_featured', models.BooleanField(default=False)),
+                ('taxonomies', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-deadline'],
+            },
+        ),
+        migrations.AddField(
+            model_name='scholarship',
+            name='is_active',
+            field=models.BooleanField(default=True, editable=False),
+        ),
+        migrations.RunPython(flag_expired, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='scholarship',
+            index=scholarships.models.ActiveIndex(fields=['deadline', 'id'], name='scholarship_active_deadline'),
+        ),
+        migrations.AddIndex(
+            model_name='scholarship',
+            index=scholarships.models.ActiveIndex(fields=['-created_at', '-id'], name='scholarship_active_newest'),
+        ),
+    ]
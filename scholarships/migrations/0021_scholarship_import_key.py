@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-17 01:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scholarships', '0020_scholarship_is_active_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scholarship',
+            name='import_key',
+            field=models.CharField(blank=True, editable=False, max_length=40, null=True, unique=True),
+        ),
+    ]
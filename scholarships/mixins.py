@@ -0,0 +1,191 @@
+"""
+Sparse fieldsets for read endpoints.
+
+``?fields=title,slug`` keeps only the listed fields and ``?omit=description``
+drops the listed ones. Both trim the serialized output and the SQL: the
+queryset is reduced to the columns the kept fields read with ``.only()``, and
+select_related joins and prefetches that no kept field uses are dropped.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+
+class SparseFieldsSerializerMixin:
+    """Serializer side: drop every field that is not in context['sparse_fields']"""
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selected = self.context.get('sparse_fields')
+        # Only the top-level serializer is trimmed, never nested ones sharing the context
+        is_root = self.parent is None or (
+            isinstance(self.parent, serializers.ListSerializer) and self.parent.parent is None
+        )
+        if selected is None or not is_root:
+            return fields
+        return {name: field for name, field in fields.items() if name in selected}
+
+
+class _QueryPlan:
+    def __init__(self):
+        self.columns = set()
+        self.relations = set()  # select_related paths traversed for some of their columns
+        self.whole = set()  # related objects needed with every column
+        self.prefetch = set()
+
+
+class SparseFieldsetMixin:
+    """
+    View side: parse ``?fields=`` / ``?omit=`` and narrow the queryset.
+
+    Views call ``self.sparse_queryset(queryset)`` at the end of get_queryset.
+    Serializer fields that read through a method (``source='*'``) declare the
+    ORM paths they need in ``Meta.sparse_field_paths``; when one does not, the
+    columns are left alone and only the output is trimmed.
+    """
+    sparse_fields_param = 'fields'
+    sparse_omit_param = 'omit'
+    # Columns loaded no matter what, e.g. for lookups and cursor pagination
+    sparse_always_fields = ('pk',)
+
+    def get_sparse_fields(self):
+        """Return the set of serializer fields to render, or None for all of them"""
+        if hasattr(self, '_sparse_fields'):
+            return self._sparse_fields
+        self._sparse_fields = None
+        request = self.request
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+        requested = self._split_param(self.sparse_fields_param)
+        omitted = self._split_param(self.sparse_omit_param)
+        if not requested and not omitted:
+            return None
+
+        available = list(self.get_serializer_class()().fields)
+        unknown = sorted((requested | omitted) - set(available))
+        if unknown:
+            raise ValidationError({
+                self.sparse_fields_param if unknown[0] in requested else self.sparse_omit_param:
+                    [f"Unknown field(s): {', '.join(unknown)}"]
+            })
+        selected = requested or set(available)
+        self._sparse_fields = {name for name in available if name in selected and name not in omitted}
+        return self._sparse_fields
+
+    def _split_param(self, name):
+        value = self.request.query_params.get(name, '')
+        return {part.strip() for part in value.split(',') if part.strip()}
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['sparse_fields'] = self.get_sparse_fields()
+        return context
+
+    def sparse_queryset(self, queryset):
+        """Restrict ``queryset`` to what the selected fields read"""
+        selected = self.get_sparse_fields()
+        if selected is None:
+            return queryset
+        serializer_class = self.get_serializer_class()
+        plan = self.build_query_plan(queryset.model, serializer_class, selected)
+        if plan is None:
+            return queryset
+
+        # Prefetches are kept only when a selected field reads them
+        needed_prefetches = plan.prefetch | plan.whole
+        kept = [
+            lookup for lookup in queryset._prefetch_related_lookups
+            if any(self._within(self._lookup_path(lookup), path) for path in needed_prefetches)
+        ]
+        queryset = queryset.prefetch_related(None).prefetch_related(*kept)
+
+        select_related = queryset.query.select_related
+        if select_related is True:
+            # select_related() without arguments cannot be narrowed safely
+            return queryset
+        joined = self._flatten(select_related or {})
+        needed = plan.relations | plan.whole
+        keep_joins = [
+            join for join in joined
+            if any(path == join or path.startswith(f'{join}__') for path in needed)
+            or any(join.startswith(f'{path}__') for path in plan.whole)
+        ]
+
+        columns = set(self.sparse_always_fields)
+        for column in plan.columns:
+            relation, _, _ = column.rpartition('__')
+            if any(column.startswith(f'{path}__') for path in plan.whole):
+                continue
+            if relation and relation not in keep_joins:
+                # Not joined, so only the foreign key can be loaded here
+                column = column.split('__', 1)[0]
+            columns.add(column)
+
+        queryset = queryset.select_related(None)
+        if keep_joins:
+            queryset = queryset.select_related(*keep_joins)
+        return queryset.only(*columns)
+
+    def build_query_plan(self, model, serializer_class, selected):
+        fields = serializer_class().fields
+        extra_paths = getattr(getattr(serializer_class, 'Meta', None), 'sparse_field_paths', {})
+        plan = _QueryPlan()
+        for name in selected:
+            field = fields[name]
+            if name in extra_paths:
+                for path in extra_paths[name]:
+                    if not self._plan_path(model, path.split('__'), True, plan):
+                        return None
+                continue
+            if field.source == '*' or not field.source_attrs:
+                return None
+            nested = isinstance(field, serializers.BaseSerializer)
+            if not self._plan_path(model, field.source_attrs, nested, plan):
+                return None
+        return plan
+
+    @staticmethod
+    def _plan_path(model, parts, whole, plan):
+        """Record what loading ``parts`` from ``model`` costs; False if it is not a model path"""
+        prefix = []
+        for index, part in enumerate(parts):
+            if part == 'pk':
+                part = model._meta.pk.name
+            try:
+                field = model._meta.get_field(part)
+            except FieldDoesNotExist:
+                return False
+            path = '__'.join(prefix + [part])
+            last = index == len(parts) - 1
+            if field.many_to_many or field.one_to_many:
+                plan.prefetch.add(path)
+                return True
+            if not field.is_relation or last:
+                plan.columns.add(path)
+                if field.is_relation and whole:
+                    plan.whole.add(path)
+                return True
+            plan.columns.add(path)
+            plan.relations.add(path)
+            prefix.append(part)
+            model = field.related_model
+        return True
+
+    @staticmethod
+    def _within(lookup, path):
+        return lookup == path or lookup.startswith(f'{path}__')
+
+    @staticmethod
+    def _lookup_path(lookup):
+        return lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup
+
+    @classmethod
+    def _flatten(cls, tree, prefix=''):
+        paths = []
+        for name, children in tree.items():
+            path = f'{prefix}{name}'
+            paths.append(path)
+            paths.extend(cls._flatten(children, f'{path}__'))
+        return paths
@@ -1,5 +1,7 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Q
 from django.contrib.auth.models import User
+from django.utils import timezone
 from django.utils.text import slugify
 from ckeditor.fields import RichTextField
 
@@ -63,6 +65,128 @@ class FieldOfStudy(models.Model):
     class Meta:
         verbose_name_plural = "Fields of Study"
 
+# Many-to-many relations rendered by ScholarshipSerializer
+SCHOLARSHIP_M2M_FIELDS = (
+    'levels',
+    'scholarship_category',
+    'field_of_study',
+    'fund_type',
+    'sponsor_type',
+    'language_requirement',
+)
+
+
+# Attempts to save under a freshly allocated slug before giving up on concurrent inserts
+SLUG_ALLOCATION_ATTEMPTS = 5
+
+
+def base_slug_for(title):
+    return slugify(title) or 'scholarship'
+
+
+def slug_family(base_slug):
+    """Match base_slug and every base_slug-N derived from it"""
+    return Q(slug=base_slug) | Q(slug__startswith=f'{base_slug}-')
+
+
+def next_slug_suffix(base_slug, existing):
+    """
+    Return the suffix for the next free slug in base_slug's family:
+    0 if base_slug itself is free, otherwise one past the highest suffix in use.
+    """
+    if base_slug not in existing:
+        return 0
+    prefix = f'{base_slug}-'
+    highest = 0
+    for slug in existing:
+        if slug.startswith(prefix) and slug[len(prefix):].isdigit():
+            highest = max(highest, int(slug[len(prefix):]))
+    return highest + 1
+
+
+def format_slug(base_slug, suffix):
+    return f'{base_slug}-{suffix}' if suffix else base_slug
+
+
+class ActiveIndex(models.Index):
+    """
+    Index over active scholarships: a partial index WHERE is_active on
+    databases that support them (PostgreSQL, SQLite), elsewhere a composite
+    index led by is_active.
+    """
+
+    def __init__(self, *, fields, name):
+        super().__init__(fields=fields, name=name, condition=Q(is_active=True))
+
+    def deconstruct(self):
+        path, args, kwargs = super().deconstruct()
+        kwargs.pop('condition')
+        return path, args, kwargs
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        if schema_editor.connection.features.supports_partial_indexes:
+            return super().create_sql(model, schema_editor, using=using, **kwargs)
+        composite = models.Index(fields=['is_active', *self.fields], name=self.name)
+        return composite.create_sql(model, schema_editor, using=using, **kwargs)
+
+
+class ScholarshipQuerySet(models.QuerySet):
+    def active(self, today=None):
+        """
+        Scholarships still open for applications. is_active lets the database
+        use the active-row index, the deadline check covers rows that expired
+        since archive_scholarships last ran.
+        """
+        return self.filter(is_active=True, deadline__gte=today or timezone.localdate())
+
+    def with_related(self):
+        """Load the country and every taxonomy the serializer renders up front"""
+        return self.select_related('country').prefetch_related(*SCHOLARSHIP_M2M_FIELDS)
+
+    def next_slug(self, base_slug):
+        """Return the next free slug for base_slug using a single query"""
+        existing = set(self.filter(slug_family(base_slug)).values_list('slug', flat=True))
+        return format_slug(base_slug, next_slug_suffix(base_slug, existing))
+
+    def assign_slugs(self, scholarships, chunk_size=200):
+        """
+        Give every scholarship in ``scholarships`` that has no slug a unique one.
+        Existing slugs are fetched with one query per ``chunk_size`` distinct
+        titles and suffixes are handed out in memory, so bulk imports can
+        allocate thousands of slugs before a single bulk_create.
+        Each title adds two OR terms, so chunks stay well under SQLite's
+        expression depth limit of 1000.
+        """
+        by_base = {}
+        reserved = set()
+        for scholarship in scholarships:
+            if scholarship.slug:
+                reserved.add(scholarship.slug)
+            else:
+                by_base.setdefault(base_slug_for(scholarship.title), []).append(scholarship)
+
+        bases = list(by_base)
+        for start in range(0, len(bases), chunk_size):
+            chunk = bases[start:start + chunk_size]
+            family = Q()
+            for base_slug in chunk:
+                family |= slug_family(base_slug)
+            existing = set(self.filter(family).values_list('slug', flat=True)) | reserved
+            for base_slug in chunk:
+                suffix = next_slug_suffix(base_slug, existing)
+                for scholarship in by_base[base_slug]:
+                    scholarship.slug = format_slug(base_slug, suffix)
+                    suffix += 1
+        return scholarships
+
+
+class ActiveScholarshipManager(models.Manager.from_queryset(ScholarshipQuerySet)):
+    """``Scholarship.active``: only scholarships still open for applications"""
+
+    def get_queryset(self):
+        return super().get_queryset().active()
+
+
 class Scholarship(models.Model):
     title = models.CharField(max_length=200)
     slug = models.SlugField(max_length=250, unique=True, blank=True)
@@ -84,19 +208,167 @@ class Scholarship(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # False once the deadline has passed; see ScholarshipQuerySet.active()
+    is_active = models.BooleanField(default=True, editable=False)
+    # Set by import_scholarships on the rows it creates; re-imports only ever update those
+    import_key = models.CharField(max_length=40, unique=True, null=True, blank=True, editable=False)
+
+    objects = ScholarshipQuerySet.as_manager()
+    active = ActiveScholarshipManager()
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Homepage feeds scan open scholarships in deadline order from today
+            models.Index(fields=['is_featured', 'deadline'], name='scholarship_featured_deadline'),
+            models.Index(fields=['deadline'], name='scholarship_deadline'),
+            # Default listings: active rows in either listing order
+            ActiveIndex(fields=['deadline', 'id'], name='scholarship_active_deadline'),
+            ActiveIndex(fields=['-created_at', '-id'], name='scholarship_active_newest'),
+        ]
 
     def __str__(self):
         return self.title
 
+    def set_is_active(self, today=None):
+        deadline = self._meta.get_field('deadline').to_python(self.deadline)
+        self.is_active = deadline is not None and deadline >= (today or timezone.localdate())
+
     def save(self, *args, **kwargs):
-        if not self.slug:
-            base_slug = slugify(self.title)
-            slug = base_slug
-            counter = 1
-            while Scholarship.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f'{base_slug}-{counter}'
-                counter += 1
-            self.slug = slug
-        super().save(*args, **kwargs)
+        self.set_is_active()
+        if self.slug:
+            return super().save(*args, **kwargs)
+
+        # Allocate the slug with one query and let the unique constraint settle
+        # races with concurrent inserts: on a clash, allocate again and retry
+        base_slug = base_slug_for(self.title)
+        others = Scholarship.objects.exclude(pk=self.pk) if self.pk else Scholarship.objects.all()
+        for attempt in range(SLUG_ALLOCATION_ATTEMPTS):
+            self.slug = others.next_slug(base_slug)
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                slug_clash = others.filter(slug=self.slug).exists()
+                self.slug = ''
+                if not slug_clash or attempt == SLUG_ALLOCATION_ATTEMPTS - 1:
+                    raise
+
+
+# Taxonomies denormalized onto ScholarshipCard as lists of names
+CARD_LABEL_FIELDS = ('levels', 'field_of_study', 'fund_type')
+
+
+class ScholarshipCardQuerySet(models.QuerySet):
+    def refresh(self, scholarship_ids):
+        """Rebuild the cards of the given scholarships with a handful of queries"""
+        scholarships = (
+            Scholarship.objects.filter(pk__in=list(scholarship_ids))
+            .select_related('country')
+            .prefetch_related(*CARD_LABEL_FIELDS)
+        )
+        cards = [ScholarshipCard.from_scholarship(s) for s in scholarships]
+        return self.bulk_create(
+            cards,
+            update_conflicts=True,
+            unique_fields=['scholarship'],
+            update_fields=[
+                'title', 'slug', 'provider', 'amount', 'deadline', 'is_featured',
+                'country_name', 'labels',
+            ],
+        )
+
+
+class ScholarshipCard(models.Model):
+    """
+    Read-only projection of a scholarship holding just what listing cards show.
+    Kept in sync by signals.py so card listings never touch the description or
+    the M2M tables.
+    """
+    scholarship = models.OneToOneField(
+        Scholarship, on_delete=models.CASCADE, primary_key=True, related_name='card'
+    )
+    title = models.CharField(max_length=200)
+    slug = models.SlugField(max_length=250)
+    provider = models.CharField(max_length=200)
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    deadline = models.DateField()
+    is_featured = models.BooleanField(default=False)
+    country_name = models.CharField(max_length=100)
+    # {taxonomy field: [names]} for every field in CARD_LABEL_FIELDS
+    labels = models.JSONField(default=dict)
+
+    objects = ScholarshipCardQuerySet.as_manager()
+
+    def __str__(self):
+        return self.title
+
+    @classmethod
+    def from_scholarship(cls, scholarship):
+        return cls(
+            scholarship_id=scholarship.pk,
+            title=scholarship.title,
+            slug=scholarship.slug,
+            provider=scholarship.provider,
+            amount=scholarship.amount,
+            deadline=scholarship.deadline,
+            is_featured=scholarship.is_featured,
+            country_name=scholarship.country.name,
+            labels={
+                field: sorted(item.name for item in getattr(scholarship, field).all())
+                for field in CARD_LABEL_FIELDS
+            },
+        )
+
+
+class ArchivedScholarship(models.Model):
+    """
+    A long-expired scholarship moved out of the live table by
+    archive_scholarships, flattened so it needs none of the taxonomy tables.
+    """
+    original_id = models.PositiveBigIntegerField(db_index=True)
+    title = models.CharField(max_length=200)
+    slug = models.SlugField(max_length=250)
+    description = models.TextField()
+    provider = models.CharField(max_length=200)
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    deadline = models.DateField()
+    open_date = models.DateField(null=True, blank=True)
+    country_name = models.CharField(max_length=100)
+    application_url = models.URLField(blank=True)
+    image = models.CharField(max_length=100, blank=True)
+    is_featured = models.BooleanField(default=False)
+    # {taxonomy field: [names]} for every field in SCHOLARSHIP_M2M_FIELDS
+    taxonomies = models.JSONField(default=dict)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-deadline']
+
+    def __str__(self):
+        return self.title
+
+    @classmethod
+    def from_scholarship(cls, scholarship):
+        return cls(
+            original_id=scholarship.pk,
+            title=scholarship.title,
+            slug=scholarship.slug,
+            description=scholarship.description,
+            provider=scholarship.provider,
+            amount=scholarship.amount,
+            deadline=scholarship.deadline,
+            open_date=scholarship.open_date,
+            country_name=scholarship.country.name,
+            application_url=scholarship.application_url,
+            image=scholarship.image.name or '',
+            is_featured=scholarship.is_featured,
+            taxonomies={
+                field: sorted(item.name for item in getattr(scholarship, field).all())
+                for field in SCHOLARSHIP_M2M_FIELDS
+            },
+            created_at=scholarship.created_at,
+            updated_at=scholarship.updated_at,
+        )
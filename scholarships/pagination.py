@@ -0,0 +1,199 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db import connection
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError as InvalidParameter
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .models import Scholarship
+
+
+class ScholarshipPageNumberPagination(PageNumberPagination):
+    """
+    PageNumberPagination that takes the row count from ``view.row_count``
+    when the view has already counted the filtered rows, instead of issuing
+    a second COUNT(*).
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.row_count = getattr(view, 'row_count', None)
+        return super().paginate_queryset(queryset, request, view)
+
+    def django_paginator_class(self, object_list, per_page):
+        paginator = DjangoPaginator(object_list, per_page)
+        if self.row_count is not None:
+            # count is a cached_property, so setting it skips the query
+            paginator.count = self.row_count
+        return paginator
+
+
+class ScholarshipCursorPagination(BasePagination):
+    """
+    Keyset pagination for infinite scrolling.
+
+    Pages are located with ``WHERE (key, id) > (last key, last id)`` on one of
+    the allowed orderings instead of OFFSET, and no COUNT(*) is issued, so the
+    cost of a page does not grow with how far the client has scrolled.
+    Only the orderings below are supported; any other ``?ordering=`` is a 400.
+    ``?include_total=1`` adds a cheap approximate total.
+    """
+    page_size = api_settings.PAGE_SIZE or 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    total_query_param = 'include_total'
+    ordering_param = api_settings.ORDERING_PARAM
+
+    # ?ordering= value -> (key field, tie breaker)
+    orderings = {
+        '-created_at': ('-created_at', '-id'),
+        'deadline': ('deadline', 'id'),
+    }
+    default_ordering = '-created_at'
+
+    # Upper bound for the approximate total on databases without planner estimates
+    approximate_count_cap = 1000
+
+    invalid_cursor_message = 'Invalid cursor'
+    invalid_ordering_message = 'Cursor pagination supports only these orderings: {allowed}'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering_name = self.get_ordering_name(request)
+        key, tie_breaker = self.orderings[self.ordering_name]
+        self.key_field = key.lstrip('-')
+        self.descending = key.startswith('-')
+
+        cursor = self.decode_cursor(request)
+        self.approximate_count = None
+        if request.query_params.get(self.total_query_param):
+            self.approximate_count = self.get_approximate_count(queryset)
+
+        reverse = bool(cursor and cursor['reverse'])
+        ordering = (key, tie_breaker) if not reverse else (self.flip(key), self.flip(tie_breaker))
+        queryset = queryset.order_by(*ordering)
+        if cursor:
+            queryset = queryset.filter(self.position_filter(cursor['value'], cursor['id'], reverse))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            # Walking backwards: restore display order, and the page we came from is next
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        response = OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+        ])
+        if self.approximate_count is not None:
+            response['approximate_count'] = self.approximate_count
+        response['results'] = data
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        properties = {
+            'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+            'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+            'approximate_count': {'type': 'integer'},
+            'results': schema,
+        }
+        return {'type': 'object', 'required': ['results'], 'properties': properties}
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def get_ordering_name(self, request):
+        ordering = request.query_params.get(self.ordering_param, '').strip()
+        if not ordering:
+            return self.default_ordering
+        if ordering not in self.orderings:
+            raise InvalidParameter({self.ordering_param: [self.invalid_ordering_message.format(
+                allowed=', '.join(self.orderings)
+            )]})
+        return ordering
+
+    @staticmethod
+    def flip(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    def position_filter(self, value, pk, reverse):
+        # Rows strictly after (value, pk) in the requested direction
+        forward = self.descending != reverse
+        op = 'lt' if forward else 'gt'
+        return (
+            Q(**{f'{self.key_field}__{op}': value})
+            | Q(**{self.key_field: value, f'pk__{op}': pk})
+        )
+
+    def get_approximate_count(self, queryset):
+        """
+        Estimate the number of rows in ``queryset`` without a full COUNT(*):
+        the planner's row estimate on PostgreSQL, elsewhere a count capped at
+        ``approximate_count_cap`` rows.
+        """
+        if connection.vendor == 'postgresql':
+            sql, params = queryset.order_by().values('pk').query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+                plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]['Plan']['Plan Rows'])
+        return queryset.order_by().values('pk')[:self.approximate_count_cap].count()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            if data['o'] != self.ordering_name:
+                raise ValueError
+            field = Scholarship._meta.get_field(self.key_field)
+            return {
+                'value': field.to_python(data['v']),
+                'id': int(data['i']),
+                'reverse': bool(data.get('r')),
+            }
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, instance, reverse):
+        value = getattr(instance, self.key_field)
+        data = {'o': self.ordering_name, 'v': value.isoformat(), 'i': instance.pk}
+        if reverse:
+            data['r'] = 1
+        encoded = base64.urlsafe_b64encode(json.dumps(data).encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
@@ -0,0 +1,131 @@
+"""
+Response cache for anonymous scholarship list and detail requests.
+
+Entries are keyed on the absolute path and the normalized query string
+(parameter order, repeated values and empty parameters do not matter), plus
+two counters: the scholarship generation, which signals.py bumps whenever a
+scholarship or its taxonomy links change, and the taxonomy version. Bumping
+either orphans every cached response at once; the orphans age out after
+SCHOLARSHIP_RESPONSE_CACHE_TIMEOUT seconds. Each entry carries the ETag and Last-Modified validators
+derived from the updated_at of what it shows, so conditional GETs are
+answered from the cache too. Hits, misses and bypasses are counted for
+`manage.py response_cache_stats`.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.connection import ConnectionProxy
+from django.utils.http import parse_etags, parse_http_date_safe
+
+from .taxonomy import get_taxonomy_version
+from .versioning import VersionCounter
+
+cache = ConnectionProxy(caches, settings.RESPONSE_CACHE_ALIAS)
+
+RESPONSE_KEY = 'scholarships:response:{generation}:{taxonomy}:{digest}'
+METRIC_KEY = 'scholarships:response-cache:{outcome}'
+
+HIT = 'hit'
+MISS = 'miss'
+BYPASS = 'bypass'
+OUTCOMES = (HIT, MISS, BYPASS)
+
+
+generation = VersionCounter('scholarships:generation')
+
+
+def get_generation():
+    """Return the current scholarship generation"""
+    return generation.get()
+
+
+def bump_generation():
+    """Invalidate every cached scholarship response"""
+    if transaction.get_connection().in_atomic_block:
+        # Bump again on commit: a request running before then may have cached
+        # the old rows under the new generation
+        generation.bump()
+    transaction.on_commit(generation.bump)
+
+
+def normalized_query(query_params):
+    """The query string in a canonical form: sorted keys, sorted values, no empty values"""
+    return '&'.join(
+        f'{key}={value}'
+        for key in sorted(query_params)
+        for value in sorted(v for v in query_params.getlist(key) if v != '')
+    )
+
+
+def request_target(request):
+    # The host is included because paginated responses embed absolute links
+    return f'{request.build_absolute_uri(request.path)}?{normalized_query(request.query_params)}'
+
+
+def response_key(request):
+    return RESPONSE_KEY.format(
+        generation=get_generation(),
+        taxonomy=get_taxonomy_version(),
+        digest=hashlib.sha256(request_target(request).encode('utf-8')).hexdigest(),
+    )
+
+
+def is_enabled():
+    return settings.SCHOLARSHIP_RESPONSE_CACHE_TIMEOUT > 0
+
+
+def is_cacheable(request):
+    # Authenticated responses carry per-user fields such as is_saved
+    return request.method == 'GET' and not request.user.is_authenticated
+
+
+def make_etag(request, last_modified, *parts):
+    """A strong ETag for the response to ``request`` showing rows last changed at ``last_modified``"""
+    parts = (request_target(request), last_modified.isoformat() if last_modified else '',
+             get_taxonomy_version(), *parts)
+    digest = hashlib.sha256(':'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def get_entry(key):
+    return cache.get(key)
+
+
+def set_entry(key, data, etag, last_modified):
+    """Store a response body with its validators; ``last_modified`` is a POSIX timestamp or None"""
+    entry = {'data': data, 'etag': etag, 'last_modified': last_modified}
+    cache.set(key, entry, settings.SCHOLARSHIP_RESPONSE_CACHE_TIMEOUT)
+    return entry
+
+
+def is_not_modified(request, etag, last_modified):
+    """Whether the client's copy is current; If-None-Match wins over If-Modified-Since"""
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        return etag in etags or '*' in etags
+    since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    return since is not None and last_modified is not None and int(last_modified) <= since
+
+
+def record(outcome):
+    key = METRIC_KEY.format(outcome=outcome)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+
+def get_metrics():
+    counts = cache.get_many([METRIC_KEY.format(outcome=outcome) for outcome in OUTCOMES])
+    metrics = {outcome: counts.get(METRIC_KEY.format(outcome=outcome), 0) for outcome in OUTCOMES}
+    lookups = metrics[HIT] + metrics[MISS]
+    metrics['hit_ratio'] = metrics[HIT] / lookups if lookups else None
+    return metrics
+
+
+def reset_metrics():
+    cache.delete_many([METRIC_KEY.format(outcome=outcome) for outcome in OUTCOMES])
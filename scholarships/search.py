@@ -0,0 +1,168 @@
+"""
+Full-text search backends for scholarships.
+
+PostgreSQL keeps a weighted ``tsvector`` column with a GIN index on the
+scholarship table, SQLite keeps an FTS5 virtual table keyed by scholarship id.
+Both are created by migration 0017 and kept in sync from the post_save and
+post_delete signals. Any other database falls back to the old ``icontains``
+behaviour.
+"""
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.utils.html import strip_tags
+from django.utils.module_loading import import_string
+
+from .models import Scholarship
+
+SCHOLARSHIP_TABLE = Scholarship._meta.db_table
+FTS_TABLE = f'{SCHOLARSHIP_TABLE}_fts'
+SEARCH_CONFIG = 'english'
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def document_for(scholarship):
+    """Return the (title, body) pair that gets indexed for a scholarship"""
+    return scholarship.title or '', strip_tags(scholarship.description or '')
+
+
+class BaseSearchBackend:
+    """Interface every search backend implements"""
+
+    def search(self, queryset, term):
+        """Filter ``queryset`` to matches for ``term`` and annotate ``search_rank``"""
+        raise NotImplementedError
+
+    def index(self, scholarships):
+        """Add or refresh the index entries for the given scholarships"""
+
+    def remove(self, scholarship_ids):
+        """Drop the index entries for the given scholarship ids"""
+
+    def rebuild(self, batch_size=1000):
+        """Re-index every scholarship"""
+        queryset = Scholarship.objects.only('id', 'title', 'description').order_by('pk')
+        batch = []
+        for scholarship in queryset.iterator(chunk_size=batch_size):
+            batch.append(scholarship)
+            if len(batch) >= batch_size:
+                self.index(batch)
+                batch = []
+        if batch:
+            self.index(batch)
+
+
+class IContainsSearchBackend(BaseSearchBackend):
+    """Unindexed ``icontains`` matching on title and description"""
+
+    def search(self, queryset, term):
+        for word in term.split():
+            queryset = queryset.filter(Q(title__icontains=word) | Q(description__icontains=word))
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """tsvector column with a GIN index, ranked with ts_rank"""
+
+    def search(self, queryset, term):
+        tsquery = f"websearch_to_tsquery('{SEARCH_CONFIG}', %s)"
+        vector = f'"{SCHOLARSHIP_TABLE}"."search_vector"'
+        return queryset.filter(
+            RawSQL(f'{vector} @@ {tsquery}', (term,), output_field=BooleanField())
+        ).annotate(
+            search_rank=RawSQL(f'ts_rank({vector}, {tsquery})', (term,), output_field=FloatField())
+        )
+
+    def index(self, scholarships):
+        rows = [(*document_for(s), s.pk) for s in scholarships]
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'UPDATE "{SCHOLARSHIP_TABLE}" SET search_vector = '
+                f"setweight(to_tsvector('{SEARCH_CONFIG}', %s), 'A') || "
+                f"setweight(to_tsvector('{SEARCH_CONFIG}', %s), 'B') "
+                'WHERE id = %s',
+                rows,
+            )
+
+    def remove(self, scholarship_ids):
+        # The vector lives on the scholarship row and goes away with it
+        pass
+
+
+class SQLiteFTSSearchBackend(BaseSearchBackend):
+    """FTS5 virtual table ranked with bm25, used for local development and tests"""
+
+    # bm25 column weights for (title, body)
+    weights = (10.0, 1.0)
+
+    @staticmethod
+    def match_expression(term):
+        # Quote every token so user input can never be parsed as FTS5 syntax,
+        # and prefix-match the words so search-as-you-type keeps working
+        tokens = _TOKEN_RE.findall(term)
+        return ' '.join(f'"{token}"*' for token in tokens)
+
+    def search(self, queryset, term):
+        expression = self.match_expression(term)
+        if not expression:
+            # Nothing but punctuation: no word can match, as with the plain SearchFilter
+            return queryset.annotate(search_rank=Value(0.0, output_field=FloatField())).none()
+        weights = ', '.join(str(w) for w in self.weights)
+        # Join the FTS table so FTS5 drives the query and bm25() is computed
+        # once per match; a correlated rank subquery re-runs MATCH per row.
+        # bm25() is lower-is-better, negate it so every backend ranks descending
+        return queryset.extra(
+            tables=[FTS_TABLE],
+            where=[
+                f'{FTS_TABLE}.rowid = "{SCHOLARSHIP_TABLE}"."id"',
+                f'{FTS_TABLE} MATCH %s',
+            ],
+            params=[expression],
+            select={'search_rank': f'-bm25({FTS_TABLE}, {weights})'},
+        )
+
+    def index(self, scholarships):
+        rows = [(s.pk, *document_for(s)) for s in scholarships]
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT OR REPLACE INTO {FTS_TABLE} (rowid, title, body) VALUES (%s, %s, %s)',
+                rows,
+            )
+
+    def remove(self, scholarship_ids):
+        ids = list(scholarship_ids)
+        if not ids:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [(i,) for i in ids])
+
+    def rebuild(self, batch_size=1000):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        super().rebuild(batch_size)
+
+
+VENDOR_BACKENDS = {
+    'postgresql': PostgresSearchBackend,
+    'sqlite': SQLiteFTSSearchBackend,
+}
+
+
+def get_search_backend():
+    """
+    Return the configured search backend.
+    SCHOLARSHIP_SEARCH_BACKEND may name a backend class by dotted path,
+    otherwise one is picked from the database vendor.
+    """
+    backend_path = getattr(settings, 'SCHOLARSHIP_SEARCH_BACKEND', '')
+    if backend_path:
+        return import_string(backend_path)()
+    return VENDOR_BACKENDS.get(connection.vendor, IContainsSearchBackend)()
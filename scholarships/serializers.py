@@ -1,7 +1,8 @@
 from rest_framework import serializers
+from .mixins import SparseFieldsSerializerMixin
 from .models import (
     Scholarship, Level, ScholarshipCategory, FieldOfStudy,
-    FundType, SponsorType, LanguageRequirement, Country
+    FundType, SponsorType, LanguageRequirement, Country, ScholarshipCard
 )
 
 class LevelSerializer(serializers.ModelSerializer):
@@ -39,7 +40,7 @@ class CountrySerializer(serializers.ModelSerializer):
         model = Country
         fields = ['id', 'name']
 
-class ScholarshipSerializer(serializers.ModelSerializer):
+class ScholarshipSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     levels = LevelSerializer(many=True, read_only=True)
     scholarship_category = ScholarshipCategorySerializer(many=True, read_only=True)
     field_of_study = FieldOfStudySerializer(many=True, read_only=True)
@@ -48,7 +49,29 @@ class ScholarshipSerializer(serializers.ModelSerializer):
     language_requirement = LanguageRequirementSerializer(many=True, read_only=True)
     country_detail = CountrySerializer(source='country', read_only=True)
     country_name = serializers.CharField(source='country.name', read_only=True)
+    is_saved = serializers.SerializerMethodField()
 
     class Meta:
         model = Scholarship
-        fields = '__all__'
+        # import_key only matters to import_scholarships
+        exclude = ['import_key']
+        # is_saved reads context['saved_ids'], not the row
+        sparse_field_paths = {'is_saved': []}
+
+    def get_is_saved(self, obj):
+        return obj.pk in self.context.get('saved_ids', ())
+
+class ScholarshipCardSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
+    """Lightweight listing representation read straight from ScholarshipCard"""
+    id = serializers.IntegerField(source='scholarship_id', read_only=True)
+    is_saved = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ScholarshipCard
+        fields = [
+            'id', 'title', 'slug', 'provider', 'amount', 'deadline',
+            'is_featured', 'country_name', 'labels', 'is_saved',
+        ]
+
+    def get_is_saved(self, obj):
+        return obj.scholarship_id in self.context.get('saved_ids', ())
@@ -0,0 +1,122 @@
+from django.db.models.signals import m2m_changed, post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Scholarship, ScholarshipCard, Country, CARD_LABEL_FIELDS, SCHOLARSHIP_M2M_FIELDS
+from .response_cache import bump_generation
+from .search import get_search_backend
+from .taxonomy import TAXONOMY_MODELS, bump_taxonomy_version
+
+
+@receiver(post_save, sender=Scholarship)
+def index_scholarship(sender, instance, raw=False, **kwargs):
+    """Keep the full-text search index in sync with saved scholarships"""
+    if raw:
+        return
+    get_search_backend().index([instance])
+
+
+@receiver(post_delete, sender=Scholarship)
+def unindex_scholarship(sender, instance, **kwargs):
+    """Remove deleted scholarships from the full-text search index"""
+    get_search_backend().remove([instance.pk])
+
+
+def bump_taxonomy(sender, **kwargs):
+    """Invalidate cached filter options when any taxonomy row changes"""
+    bump_taxonomy_version()
+
+
+for taxonomy_model in TAXONOMY_MODELS:
+    post_save.connect(bump_taxonomy, sender=taxonomy_model)
+    post_delete.connect(bump_taxonomy, sender=taxonomy_model)
+
+
+@receiver(post_save, sender=Scholarship)
+def refresh_card(sender, instance, raw=False, **kwargs):
+    """Rebuild the listing card of a saved scholarship"""
+    if raw:
+        return
+    ScholarshipCard.objects.refresh([instance.pk])
+
+
+@receiver(post_save, sender=Scholarship)
+@receiver(post_delete, sender=Scholarship)
+def invalidate_responses(sender, raw=False, **kwargs):
+    """Drop cached list and detail responses once any scholarship changes"""
+    if raw:
+        return
+    bump_generation()
+
+
+def touch_scholarships(pks):
+    """
+    Move updated_at forward on scholarships whose rendered relations changed,
+    so their Last-Modified and ETag change with them
+    """
+    pks = list(pks)
+    if pks:
+        Scholarship.objects.filter(pk__in=pks).update(updated_at=timezone.now())
+        bump_generation()
+
+
+# Taxonomies whose names appear on listing cards, and the link tables behind them
+CARD_TAXONOMY_MODELS = {Country} | {
+    Scholarship._meta.get_field(field_name).related_model for field_name in CARD_LABEL_FIELDS
+}
+CARD_THROUGH_MODELS = {
+    Scholarship._meta.get_field(field_name).remote_field.through for field_name in CARD_LABEL_FIELDS
+}
+
+
+def relations_changed(pks, refresh_cards):
+    """Rebuild the cards of scholarships whose taxonomies changed, if they show them, and touch them"""
+    pks = list(pks)
+    if not pks:
+        return
+    if refresh_cards:
+        ScholarshipCard.objects.refresh(pks)
+    touch_scholarships(pks)
+
+
+def refresh_on_m2m_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Refresh the scholarships whose taxonomy links were just added, removed or cleared"""
+    refresh_cards = sender in CARD_THROUGH_MODELS
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            relations_changed([instance.pk], refresh_cards)
+        return
+    # Changed from the taxonomy side: pk_set holds scholarship ids, except on
+    # clear, where the affected ids have to be collected before the rows go
+    if action == 'pre_clear':
+        instance._affected_scholarship_ids = list(instance.scholarships.values_list('pk', flat=True))
+    elif action == 'post_clear':
+        relations_changed(getattr(instance, '_affected_scholarship_ids', []), refresh_cards)
+    elif action in ('post_add', 'post_remove'):
+        relations_changed(pk_set, refresh_cards)
+
+
+def refresh_on_rename(sender, instance, created=False, raw=False, **kwargs):
+    """Refresh the scholarships showing a taxonomy name that changed"""
+    if created or raw:
+        return
+    relations_changed(instance.scholarships.values_list('pk', flat=True), sender in CARD_TAXONOMY_MODELS)
+
+
+def collect_affected_before_delete(sender, instance, **kwargs):
+    instance._affected_scholarship_ids = list(instance.scholarships.values_list('pk', flat=True))
+
+
+def refresh_after_delete(sender, instance, **kwargs):
+    """Drop a deleted taxonomy from the scholarships that carried it"""
+    relations_changed(getattr(instance, '_affected_scholarship_ids', []), sender in CARD_TAXONOMY_MODELS)
+
+
+# Deleting a country deletes its scholarships, which bumps the generation by itself
+post_save.connect(refresh_on_rename, sender=Country)
+for field_name in SCHOLARSHIP_M2M_FIELDS:
+    m2m = Scholarship._meta.get_field(field_name)
+    m2m_changed.connect(refresh_on_m2m_change, sender=m2m.remote_field.through)
+    post_save.connect(refresh_on_rename, sender=m2m.related_model)
+    pre_delete.connect(collect_affected_before_delete, sender=m2m.related_model)
+    post_delete.connect(refresh_after_delete, sender=m2m.related_model)
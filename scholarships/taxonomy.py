@@ -0,0 +1,133 @@
+"""
+Taxonomy lookups shared by the filter-options endpoint and ScholarshipFilter.
+
+Taxonomy tables are tiny and change rarely, so anything derived from them is
+cached under a version number that signals.py bumps whenever a taxonomy row is
+saved or deleted. Bumping the version orphans every derived cache entry at once.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.connection import ConnectionProxy
+from django.utils.text import slugify
+
+from .models import (
+    Level, ScholarshipCategory, FieldOfStudy,
+    FundType, SponsorType, LanguageRequirement, Country
+)
+from .serializers import (
+    LevelSerializer, ScholarshipCategorySerializer, FieldOfStudySerializer,
+    FundTypeSerializer, SponsorTypeSerializer, LanguageRequirementSerializer, CountrySerializer
+)
+from .versioning import VersionCounter
+
+# filter-options key -> (model, serializer)
+TAXONOMIES = {
+    'countries': (Country, CountrySerializer),
+    'levels': (Level, LevelSerializer),
+    'fields_of_study': (FieldOfStudy, FieldOfStudySerializer),
+    'fund_types': (FundType, FundTypeSerializer),
+    'categories': (ScholarshipCategory, ScholarshipCategorySerializer),
+    'sponsor_types': (SponsorType, SponsorTypeSerializer),
+    'language_requirements': (LanguageRequirement, LanguageRequirementSerializer),
+}
+
+TAXONOMY_MODELS = tuple(model for model, _ in TAXONOMIES.values())
+
+cache = ConnectionProxy(caches, settings.RESPONSE_CACHE_ALIAS)
+
+FILTER_OPTIONS_KEY = 'scholarships:filter-options:{version}'
+LOOKUP_KEY = 'scholarships:taxonomy-lookup:{label}:{version}'
+FILTER_OPTIONS_TIMEOUT = 60 * 60 * 24
+
+
+taxonomy_version = VersionCounter('scholarships:taxonomy-version')
+
+
+def get_taxonomy_version():
+    """Return the current taxonomy version"""
+    return taxonomy_version.get()
+
+
+def bump_taxonomy_version():
+    """Invalidate everything cached against the current taxonomy version"""
+    taxonomy_version.bump()
+
+
+def build_filter_options():
+    """Serialize every taxonomy table into the filter-options payload"""
+    return {
+        key: [
+            dict(row, slug=slugify(row['name']))
+            for row in serializer(model.objects.order_by('name'), many=True).data
+        ]
+        for key, (model, serializer) in TAXONOMIES.items()
+    }
+
+
+def get_filter_options():
+    """
+    Return (payload, etag) for the filter-options endpoint.
+    The payload is built once per taxonomy version and then served from the cache.
+    """
+    key = FILTER_OPTIONS_KEY.format(version=get_taxonomy_version())
+    cached = cache.get(key)
+    if cached is None:
+        payload = build_filter_options()
+        body = json.dumps(payload, cls=DjangoJSONEncoder, sort_keys=True)
+        etag = '"%s"' % hashlib.sha256(body.encode('utf-8')).hexdigest()[:32]
+        cached = {'payload': payload, 'etag': etag}
+        cache.set(key, cached, FILTER_OPTIONS_TIMEOUT)
+    return cached['payload'], cached['etag']
+
+
+def get_taxonomy_lookup(model):
+    """
+    Return an in-memory map of a taxonomy table:
+    ``ids`` (set of ids), ``keys`` (slug and lower-cased name -> id) and
+    ``names`` (list of (id, lower-cased name) for substring matching).
+    """
+    key = LOOKUP_KEY.format(label=model._meta.label_lower, version=get_taxonomy_version())
+    lookup = cache.get(key)
+    if lookup is None:
+        rows = list(model.objects.order_by('pk').values_list('pk', 'name'))
+        keys = {}
+        for pk, name in rows:
+            keys.setdefault(slugify(name), pk)
+            keys.setdefault(name.lower(), pk)
+        lookup = {
+            'ids': {pk for pk, _ in rows},
+            'keys': keys,
+            'names': [(pk, name.lower()) for pk, name in rows],
+        }
+        cache.set(key, lookup, FILTER_OPTIONS_TIMEOUT)
+    return lookup
+
+
+def resolve_taxonomy_ids(model, tokens, contains=False):
+    """
+    Resolve ids, slugs or names of ``model`` to ids.
+    Returns a list with one set of ids per token; a token that matches
+    nothing yields an empty set. With ``contains`` a token that is not an
+    id, slug or exact name falls back to case-insensitive substring
+    matching on the name, like the old icontains filters.
+    """
+    lookup = get_taxonomy_lookup(model)
+    resolved = []
+    for token in tokens:
+        if token.isdigit():
+            pk = int(token)
+            resolved.append({pk} if pk in lookup['ids'] else set())
+            continue
+        pk = lookup['keys'].get(token.lower(), lookup['keys'].get(slugify(token)))
+        if pk is not None:
+            resolved.append({pk})
+        elif contains:
+            needle = token.lower()
+            resolved.append({pk for pk, name in lookup['names'] if needle in name})
+        else:
+            resolved.append(set())
+    return resolved
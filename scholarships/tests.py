@@ -1,7 +1,26 @@
-from django.test import TestCase
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
 from rest_framework.test import APITestCase
 from rest_framework import status
-from .models import Scholarship
+from scholarships_api.test_runner import ClearCachesMixin
+from users.models import SavedScholarship, ScholarshipApplication
+from .models import (
+    Scholarship, Level, ScholarshipCategory, FieldOfStudy,
+    FundType, SponsorType, LanguageRequirement, Country, ScholarshipQuerySet, ScholarshipCard,
+    ArchivedScholarship,
+)
+from . import response_cache
 
 class ScholarshipAPITests(APITestCase):
     def setUp(self):
@@ -52,3 +71,785 @@ class ScholarshipAPITests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 1)
         self.assertEqual(response.data[0]['title'], "Scholarship B")
+
+
+# Query counts measure the uncached path
+@override_settings(SCHOLARSHIP_RESPONSE_CACHE_TIMEOUT=0)
+class ScholarshipQueryCountTests(APITestCase):
+    def setUp(self):
+        self.country, _ = Country.objects.get_or_create(name="Canada")
+        self.taxonomies = {
+            'levels': Level.objects.get_or_create(name="Undergraduate")[0],
+            'scholarship_category': ScholarshipCategory.objects.get_or_create(name="Merit-based")[0],
+            'field_of_study': FieldOfStudy.objects.get_or_create(name="Engineering")[0],
+            'fund_type': FundType.objects.get_or_create(name="Full Funding")[0],
+            'sponsor_type': SponsorType.objects.get_or_create(name="Government")[0],
+            'language_requirement': LanguageRequirement.objects.get_or_create(name="IELTS")[0],
+        }
+
+    def create_scholarships(self, count):
+        for i in range(count):
+            scholarship = Scholarship.objects.create(
+                title=f"Scholarship {i}",
+                description="Description",
+                country=self.country,
+                deadline="2030-12-31"
+            )
+            for field, value in self.taxonomies.items():
+                getattr(scholarship, field).add(value)
+
+    def test_list_query_count_is_independent_of_page_size(self):
+        # count and Max(updated_at) + page + country join + one prefetch per taxonomy
+        self.create_scholarships(2)
+        with self.assertNumQueries(8):
+            response = self.client.get('/api/scholarships/')
+        self.assertEqual(len(response.data['results']), 2)
+
+        self.create_scholarships(8)
+        with self.assertNumQueries(8):
+            response = self.client.get('/api/scholarships/')
+        self.assertEqual(len(response.data['results']), 10)
+
+    def test_retrieve_query_count(self):
+        self.create_scholarships(1)
+        scholarship = Scholarship.objects.get()
+        # updated_at for the validators, then the row, country join and one prefetch per taxonomy
+        with self.assertNumQueries(8):
+            response = self.client.get(f'/api/scholarships/{scholarship.slug}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['levels']), 1)
+
+
+class ScholarshipSearchTests(APITestCase):
+    def setUp(self):
+        country, _ = Country.objects.get_or_create(name="Canada")
+        self.engineering = Scholarship.objects.create(
+            title="Engineering Excellence Award",
+            description="<p>For outstanding students in civil engineering.</p>",
+            country=country,
+            deadline="2030-12-31"
+        )
+        self.medicine = Scholarship.objects.create(
+            title="Medical Research Grant",
+            description="<p>Supports research with an engineering component.</p>",
+            country=country,
+            deadline="2030-12-31"
+        )
+
+    def search(self, term):
+        response = self.client.get('/api/scholarships/', {'search': term})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item['slug'] for item in response.data['results']]
+
+    def test_search_ranks_title_matches_first(self):
+        self.assertEqual(self.search('engineering'), [self.engineering.slug, self.medicine.slug])
+
+    def test_search_does_not_match_markup(self):
+        self.assertEqual(self.search('p'), [])
+
+    def test_search_without_words_matches_nothing(self):
+        self.assertEqual(self.search('!!!'), [])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.medicine.title = "Medical Research Fellowship"
+        self.medicine.save()
+        self.assertEqual(self.search('fellowship'), [self.medicine.slug])
+        self.assertEqual(self.search('grant'), [])
+
+        self.medicine.delete()
+        self.assertEqual(self.search('research'), [])
+
+    def test_search_input_is_not_parsed_as_query_syntax(self):
+        self.assertEqual(self.search('engineer* -("'), [self.engineering.slug, self.medicine.slug])
+
+
+class FilterOptionsTests(ClearCachesMixin, APITestCase):
+    url = '/api/scholarships/filter-options/'
+
+    def setUp(self):
+        super().setUp()
+        SponsorType.objects.get_or_create(name="Government")
+        LanguageRequirement.objects.get_or_create(name="IELTS")
+
+    def test_payload_includes_every_taxonomy(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data), {
+            'countries', 'levels', 'fields_of_study', 'fund_types',
+            'categories', 'sponsor_types', 'language_requirements',
+        })
+        self.assertIn('Government', [s['name'] for s in response.data['sponsor_types']])
+        self.assertIn('max-age=300', response['Cache-Control'])
+
+    def test_repeat_and_conditional_requests_skip_the_database(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response['ETag'], etag)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_taxonomy_changes_invalidate_the_payload(self):
+        etag = self.client.get(self.url)['ETag']
+        Level.objects.create(name="Postdoctoral")
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertIn('Postdoctoral', [level['name'] for level in response.data['levels']])
+
+
+class TaxonomyFilterTests(ClearCachesMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.canada, _ = Country.objects.get_or_create(name="Canada")
+        self.japan, _ = Country.objects.get_or_create(name="Japan")
+        self.undergraduate, _ = Level.objects.get_or_create(name="Undergraduate")
+        self.masters, _ = Level.objects.get_or_create(name="Masters Degree")
+        self.both = Scholarship.objects.create(
+            title="Both Levels", description="-", country=self.canada, deadline="2030-12-31"
+        )
+        self.both.levels.add(self.undergraduate, self.masters)
+        self.masters_only = Scholarship.objects.create(
+            title="Masters Only", description="-", country=self.japan, deadline="2030-12-31"
+        )
+        self.masters_only.levels.add(self.masters)
+
+    def filter(self, **params):
+        response = self.client.get('/api/scholarships/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(item['title'] for item in response.data['results'])
+
+    def test_filter_by_id_slug_or_name(self):
+        expected = ["Both Levels", "Masters Only"]
+        self.assertEqual(self.filter(levels=str(self.masters.pk)), expected)
+        self.assertEqual(self.filter(levels='masters-degree'), expected)
+        self.assertEqual(self.filter(levels='Masters Degree'), expected)
+
+    def test_any_match_does_not_duplicate_rows(self):
+        levels = f'{self.undergraduate.pk},{self.masters.pk}'
+        self.assertEqual(self.filter(levels=levels), ["Both Levels", "Masters Only"])
+
+    def test_all_match_requires_every_value(self):
+        levels = f'{self.undergraduate.pk},masters-degree'
+        self.assertEqual(self.filter(levels_all=levels), ["Both Levels"])
+        self.assertEqual(self.filter(levels_all='undergraduate,unknown'), [])
+
+    def test_unknown_values_match_nothing(self):
+        self.assertEqual(self.filter(levels='unknown'), [])
+        self.assertEqual(self.filter(levels='999999'), [])
+
+    def test_country_filter(self):
+        self.assertEqual(self.filter(country='japan'), ["Masters Only"])
+        self.assertEqual(self.filter(country=f'{self.canada.pk},{self.japan.pk}'), ["Both Levels", "Masters Only"])
+
+    def test_name_contains_compatibility_mode(self):
+        self.assertEqual(self.filter(levels='master'), [])
+        self.assertEqual(self.filter(levels='master', name_match='contains'), ["Both Levels", "Masters Only"])
+
+
+class CursorPaginationTests(APITestCase):
+    def setUp(self):
+        country, _ = Country.objects.get_or_create(name="Canada")
+        # Five scholarships sharing two deadlines, so ties must be broken by id
+        for i in range(5):
+            Scholarship.objects.create(
+                title=f"Scholarship {i}",
+                description="-",
+                country=country,
+                deadline="2030-01-01" if i % 2 else "2030-06-01"
+            )
+        self.by_deadline = list(
+            Scholarship.objects.order_by('deadline', 'id').values_list('slug', flat=True)
+        )
+
+    def walk(self, url, key='next'):
+        slugs = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            slugs.extend(item['slug'] for item in response.data['results'])
+            url = response.data[key]
+        return slugs
+
+    def test_walks_deadline_ordering_without_gaps_or_repeats(self):
+        url = '/api/scholarships/?pagination=cursor&ordering=deadline&page_size=2'
+        self.assertEqual(self.walk(url), self.by_deadline)
+
+    def test_default_ordering_is_newest_first(self):
+        url = '/api/scholarships/?pagination=cursor&page_size=2'
+        newest = list(Scholarship.objects.order_by('-created_at', '-id').values_list('slug', flat=True))
+        self.assertEqual(self.walk(url), newest)
+
+    def test_unsupported_ordering_is_rejected(self):
+        for ordering in ('title', '-deadline', 'deadline,-id'):
+            response = self.client.get('/api/scholarships/', {'pagination': 'cursor', 'ordering': ordering})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('-created_at, deadline', response.data['ordering'][0])
+
+    def test_previous_links_walk_back(self):
+        url = '/api/scholarships/?pagination=cursor&ordering=deadline&page_size=2'
+        first = self.client.get(url)
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(
+            [item['slug'] for item in back.data['results']],
+            [item['slug'] for item in first.data['results']]
+        )
+        self.assertIsNone(back.data['previous'])
+
+    def test_page_size_is_capped_and_total_is_optional(self):
+        response = self.client.get('/api/scholarships/?pagination=cursor&page_size=1000&include_total=1')
+        self.assertEqual(len(response.data['results']), 5)
+        self.assertEqual(response.data['approximate_count'], 5)
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get('/api/scholarships/?pagination=cursor&cursor=garbage')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class SlugAllocationTests(TestCase):
+    def setUp(self):
+        self.country, _ = Country.objects.get_or_create(name="Canada")
+
+    def create(self, title, **kwargs):
+        return Scholarship.objects.create(
+            title=title, description="-", country=self.country, deadline="2030-12-31", **kwargs
+        )
+
+    def slug_queries(self, title):
+        with CaptureQueriesContext(connection) as queries:
+            scholarship = self.create(title)
+        lookups = [q for q in queries if q['sql'].startswith('SELECT') and '"slug" LIKE' in q['sql']]
+        return scholarship.slug, len(lookups)
+
+    def test_duplicate_titles_take_one_lookup_each(self):
+        self.assertEqual(self.slug_queries("Same Title"), ("same-title", 1))
+        for _ in range(5):
+            self.create("Same Title")
+        self.assertEqual(self.slug_queries("Same Title"), ("same-title-6", 1))
+
+    def test_similar_titles_do_not_share_suffixes(self):
+        self.create("Award")
+        self.create("Award Extra")
+        self.assertEqual(self.create("Award").slug, "award-1")
+
+    def test_concurrent_slug_clash_is_retried(self):
+        self.create("Race")
+        with mock.patch.object(ScholarshipQuerySet, 'next_slug', side_effect=['race', 'race-1']):
+            self.assertEqual(self.create("Race").slug, "race-1")
+
+    def test_assign_slugs_in_memory(self):
+        self.create("Bulk")
+        batch = [
+            Scholarship(title="Bulk", description="-", country=self.country, deadline="2030-12-31")
+            for _ in range(3)
+        ]
+        batch.append(Scholarship(title="Fresh", description="-", country=self.country, deadline="2030-12-31"))
+        with self.assertNumQueries(1):
+            Scholarship.objects.assign_slugs(batch)
+        self.assertEqual([s.slug for s in batch], ["bulk-1", "bulk-2", "bulk-3", "fresh"])
+
+
+class ImportScholarshipsTests(ClearCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.country, _ = Country.objects.get_or_create(name="Canada")
+        self.masters, _ = Level.objects.get_or_create(name="Masters")
+        self.phd, _ = Level.objects.get_or_create(name="PhD")
+
+    def write(self, suffix, content):
+        handle, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(handle, 'w') as f:
+            f.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def run_import(self, path, *args):
+        out, err = StringIO(), StringIO()
+        call_command('import_scholarships', path, *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_csv_import_upserts_on_slug(self):
+        self.run_import(self.write('.csv', (
+            "title,slug,country,deadline,levels\n"
+            "Old,kept,Canada,2030-01-01,PhD\n"
+        )))
+        existing = Scholarship.objects.get(slug="kept")
+        path = self.write('.csv', (
+            "title,slug,country,deadline,amount,levels\n"
+            "Updated,kept,canada,2031-01-01,500,Masters\n"
+            "Brand New,,Canada,2031-02-01,,masters|phd\n"
+            "Broken,,Atlantis,2031-02-01,,\n"
+        ))
+        out, err = self.run_import(path, '--batch-size', '2')
+
+        self.assertIn("1 created, 1 updated, 1 rejected", out)
+        self.assertIn("rows/sec", out)
+        self.assertIn("unknown country 'Atlantis'", err)
+        existing.refresh_from_db()
+        self.assertEqual((existing.title, existing.amount), ("Updated", 500))
+        self.assertEqual(list(existing.levels.all()), [self.masters])
+        new = Scholarship.objects.get(slug="brand-new")
+        self.assertEqual(set(new.levels.all()), {self.masters, self.phd})
+        search = self.client.get('/api/scholarships/', {'search': 'brand'})
+        self.assertEqual([s['slug'] for s in search.data['results']], ["brand-new"])
+
+    def test_reimporting_a_feed_without_slugs_updates_its_rows(self):
+        path = self.write('.csv', (
+            "title,provider,country,deadline,amount\n"
+            "Provider Award,Alpha,Canada,2031-01-01,100\n"
+            "Provider Award,Beta,Canada,2031-01-01,100\n"
+        ))
+        self.run_import(path)
+        path = self.write('.csv', (
+            "title,provider,country,deadline,amount\n"
+            "Provider Award,Alpha,Canada,2031-01-01,250\n"
+        ))
+        out, _ = self.run_import(path)
+
+        self.assertIn("0 created, 1 updated", out)
+        # The same title from another provider is a different scholarship
+        self.assertEqual(
+            list(Scholarship.objects.order_by('provider').values_list('provider', 'slug', 'amount')),
+            [("Alpha", "provider-award", 250), ("Beta", "provider-award-1", 100)],
+        )
+
+    def test_import_never_touches_scholarships_it_did_not_create(self):
+        admin = Scholarship.objects.create(
+            title="Scholarship", description="admin one", country=self.country, deadline="2030-01-01"
+        )
+        path = self.write('.csv', (
+            "title,slug,country,deadline\n"
+            "Scholarship,,Canada,2031-01-01\n"
+            "Стипендия,,Canada,2031-01-01\n"
+            "Taken,scholarship,Canada,2031-01-01\n"
+        ))
+        out, err = self.run_import(path)
+
+        self.assertIn("2 created, 0 updated, 1 rejected", out)
+        self.assertIn("slug 'scholarship' is already used", err)
+        admin.refresh_from_db()
+        self.assertEqual((admin.description, admin.deadline.isoformat()), ("admin one", "2030-01-01"))
+        self.assertEqual(
+            sorted(Scholarship.objects.exclude(pk=admin.pk).values_list('slug', flat=True)),
+            ["scholarship-1", "scholarship-2"],
+        )
+
+    def test_jsonl_creates_missing_taxonomies(self):
+        path = self.write('.jsonl', (
+            '{"title": "Json", "country": "Canada", "deadline": "2031-01-01", '
+            '"field_of_study": ["Marine Biology"], "fund_type": "Fully Funded"}\n'
+        ))
+        out, _ = self.run_import(path, '--create-missing')
+        self.assertIn("1 created", out)
+        scholarship = Scholarship.objects.get(slug="json")
+        self.assertEqual([f.name for f in scholarship.field_of_study.all()], ["Marine Biology"])
+        self.assertEqual([f.name for f in scholarship.fund_type.all()], ["Fully Funded"])
+
+    def test_dry_run_rolls_back(self):
+        path = self.write('.jsonl', (
+            '{"title": "Ghost", "country": "Canada", "deadline": "2031-01-01", "levels": ["Postdoc"]}\n'
+        ))
+        out, _ = self.run_import(path, '--dry-run', '--create-missing')
+        self.assertIn("Dry run", out)
+        self.assertFalse(Scholarship.objects.filter(title="Ghost").exists())
+        self.assertFalse(Level.objects.filter(name="Postdoc").exists())
+
+
+# Query counts measure the uncached path
+@override_settings(SCHOLARSHIP_RESPONSE_CACHE_TIMEOUT=0)
+class ScholarshipCardTests(ClearCachesMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.country, _ = Country.objects.get_or_create(name="Canada")
+        self.level, _ = Level.objects.get_or_create(name="Masters")
+        self.scholarship = Scholarship.objects.create(
+            title="Card", description="<p>" + "long " * 500 + "</p>",
+            country=self.country, deadline="2030-12-31",
+        )
+        self.scholarship.levels.add(self.level)
+
+    def test_card_follows_saves_and_taxonomy_changes(self):
+        card = ScholarshipCard.objects.get(pk=self.scholarship.pk)
+        self.assertEqual((card.title, card.country_name), ("Card", "Canada"))
+        self.assertEqual(card.labels['levels'], ["Masters"])
+
+        self.scholarship.title = "Renamed"
+        self.scholarship.save()
+        self.level.name = "Master's"
+        self.level.save()
+        fund_type, _ = FundType.objects.get_or_create(name="Fully Funded")
+        fund_type.scholarships.add(self.scholarship)
+
+        card.refresh_from_db()
+        self.assertEqual(card.title, "Renamed")
+        self.assertEqual(card.labels['levels'], ["Master's"])
+        self.assertEqual(card.labels['fund_type'], ["Fully Funded"])
+
+        self.scholarship.levels.clear()
+        fund_type.delete()
+        card.refresh_from_db()
+        self.assertEqual((card.labels['levels'], card.labels['fund_type']), ([], []))
+
+    def test_card_view_rebuilds_missing_cards(self):
+        ScholarshipCard.objects.all().delete()
+        response = self.client.get('/api/scholarships/', {'view': 'card'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([c['title'] for c in response.data['results']], ["Card"])
+        self.assertTrue(ScholarshipCard.objects.filter(pk=self.scholarship.pk).exists())
+
+    def test_card_view_lists_cards_in_one_query_per_page(self):
+        for i in range(5):
+            Scholarship.objects.create(
+                title=f"Extra {i}", description="-", country=self.country, deadline="2030-12-31"
+            )
+        self.client.get('/api/scholarships/', {'view': 'card', 'levels': 'masters'})
+        # With the taxonomy lookup cached: COUNT for the paginator, then one SELECT joining the cards
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/scholarships/', {'view': 'card', 'levels': 'masters'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0], {
+            'id': self.scholarship.pk, 'title': "Card", 'slug': "card", 'provider': "Unknown Provider",
+            'amount': "0.00", 'deadline': "2030-12-31", 'is_featured': False,
+            'country_name': "Canada",
+            'labels': {'levels': ["Masters"], 'field_of_study': [], 'fund_type': []},
+            'is_saved': False,
+        })
+        self.assertNotIn('description', response.data['results'][0])
+
+
+# Query counts measure the uncached path
+@override_settings(SCHOLARSHIP_RESPONSE_CACHE_TIMEOUT=0)
+class SparseFieldsetTests(ClearCachesMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        country, _ = Country.objects.get_or_create(name="Canada")
+        level, _ = Level.objects.get_or_create(name="Masters")
+        self.scholarship = Scholarship.objects.create(
+            title="Sparse", description="<p>long</p>", country=country, deadline="2030-12-31"
+        )
+        self.scholarship.levels.add(level)
+
+    def test_fields_trim_output_columns_and_prefetches(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/scholarships/', {'fields': 'title,country_name'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [{'title': "Sparse", 'country_name': "Canada"}])
+        # COUNT plus one SELECT joining only the country, with no prefetches
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn('"description"', queries[1]['sql'])
+
+    def test_omit_keeps_everything_else(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/scholarships/{self.scholarship.slug}/', {'omit': 'description'})
+        self.assertNotIn('description', response.data)
+        self.assertEqual([level['name'] for level in response.data['levels']], ["Masters"])
+        self.assertFalse(any('"description"' in q['sql'] for q in queries))
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get('/api/scholarships/', {'fields': 'title,nope'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('fields', response.data)
+
+    def test_card_view_applies_card_fields(self):
+        response = self.client.get('/api/scholarships/', {'view': 'card', 'fields': 'title,slug'})
+        self.assertEqual(response.data['results'], [{'title': "Sparse", 'slug': self.scholarship.slug}])
+        response = self.client.get('/api/scholarships/', {'view': 'card', 'omit': 'labels,is_saved'})
+        self.assertNotIn('labels', response.data['results'][0])
+        self.assertIn('country_name', response.data['results'][0])
+        # description is a full scholarship field, not a card field
+        response = self.client.get('/api/scholarships/', {'view': 'card', 'fields': 'description'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ResponseCacheTests(ClearCachesMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.country, _ = Country.objects.get_or_create(name="Canada")
+        self.level, _ = Level.objects.get_or_create(name="Masters")
+        self.scholarship = Scholarship.objects.create(
+            title="Cached", description="-", country=self.country, deadline="2030-12-31"
+        )
+        self.detail_url = f'/api/scholarships/{self.scholarship.slug}/'
+
+    def test_repeat_requests_are_served_from_the_cache(self):
+        first = self.client.get('/api/scholarships/', {'ordering': 'deadline', 'search': '', 'page': 1})
+        self.assertEqual(first['X-Cache'], 'MISS')
+        # Same parameters in another order, without the empty one
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/scholarships/?page=1&ordering=deadline')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+        self.assertEqual(self.client.get(self.detail_url)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(self.detail_url)['X-Cache'], 'HIT')
+        self.assertEqual(response_cache.get_metrics(), {'hit': 2, 'miss': 2, 'bypass': 0, 'hit_ratio': 0.5})
+
+    def test_conditional_requests_get_304(self):
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response['Last-Modified'], http_date(self.scholarship.updated_at.timestamp()))
+
+        with self.assertNumQueries(0):
+            not_modified = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        not_modified = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        stale = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH='"elsewhere"')
+        self.assertEqual(stale.status_code, status.HTTP_200_OK)
+
+    def test_saves_and_m2m_changes_invalidate_cached_responses(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        self.client.get('/api/scholarships/')
+
+        self.scholarship.levels.add(self.level)
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual([level['name'] for level in response.data['levels']], ["Masters"])
+
+        self.scholarship.title = "Renamed"
+        self.scholarship.save()
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['title'], "Renamed")
+
+        self.scholarship.delete()
+        self.assertEqual(self.client.get('/api/scholarships/').data['results'], [])
+
+    def test_authenticated_requests_bypass_the_cache(self):
+        user = get_user_model().objects.create_user(email='reader@example.com', password='pass12345')
+        self.client.force_authenticate(user)
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('X-Cache', response)
+        self.assertIn('Authorization', response['Vary'])
+        self.assertEqual(response_cache.get_metrics()['bypass'], 1)
+
+        out = StringIO()
+        call_command('response_cache_stats', '--reset', stdout=out)
+        self.assertIn('bypassed=1 hit_ratio=n/a', out.getvalue())
+        self.assertEqual(response_cache.get_metrics()['bypass'], 0)
+
+
+@override_settings(SCHOLARSHIP_RESPONSE_CACHE_TIMEOUT=0)
+class ConditionalGetTests(ClearCachesMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        country, _ = Country.objects.get_or_create(name="Canada")
+        self.level, _ = Level.objects.get_or_create(name="Masters")
+        self.scholarship = Scholarship.objects.create(
+            title="Conditional", description="-", country=country, deadline="2030-12-31"
+        )
+        self.detail_url = f'/api/scholarships/{self.scholarship.slug}/'
+
+    def test_unchanged_detail_is_answered_from_updated_at_alone(self):
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response['Last-Modified'], http_date(self.scholarship.updated_at.timestamp()))
+        with self.assertNumQueries(1):
+            not_modified = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        not_modified = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        legacy = self.client.get(f'/api/scholarships/{self.scholarship.pk}/')
+        self.assertEqual(legacy.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get('/api/scholarships/missing/').status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_validators_follow_the_filtered_set(self):
+        response = self.client.get('/api/scholarships/', {'levels': 'masters'})
+        self.assertEqual(response.data['count'], 0)
+        with self.assertNumQueries(1):
+            not_modified = self.client.get(
+                '/api/scholarships/', {'levels': 'masters'}, HTTP_IF_NONE_MATCH=response['ETag']
+            )
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # Linking a taxonomy touches updated_at, so the scholarship now counts as changed
+        before = self.scholarship.updated_at
+        self.scholarship.levels.add(self.level)
+        self.scholarship.refresh_from_db()
+        self.assertGreater(self.scholarship.updated_at, before)
+        changed = self.client.get('/api/scholarships/', {'levels': 'masters'}, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertEqual(changed.data['count'], 1)
+
+    def test_cursor_validators_do_not_count(self):
+        older = Scholarship.objects.create(
+            title="Older", description="-", country=self.scholarship.country, deadline="2030-12-31"
+        )
+        Scholarship.objects.filter(pk=older.pk).update(updated_at=older.updated_at - timedelta(days=1))
+        params = {'pagination': 'cursor', 'page_size': 5}
+        response = self.client.get('/api/scholarships/', params)
+        with CaptureQueriesContext(connection) as queries:
+            not_modified = self.client.get('/api/scholarships/', params, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('COUNT(', queries[0]['sql'].upper())
+
+        # Deleting the older row leaves Max(updated_at) alone, but still changes the ETag
+        older.delete()
+        changed = self.client.get('/api/scholarships/', params, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+
+    def test_renamed_taxonomy_touches_its_scholarships(self):
+        self.scholarship.levels.add(self.level)
+        self.scholarship.refresh_from_db()
+        before = self.scholarship.updated_at
+        self.level.name = "Master's"
+        self.level.save()
+        self.scholarship.refresh_from_db()
+        self.assertGreater(self.scholarship.updated_at, before)
+
+    def test_authenticated_etag_covers_saved_state(self):
+        user = get_user_model().objects.create_user(email='conditional@example.com', password='pass12345')
+        self.client.force_authenticate(user)
+        response = self.client.get(self.detail_url)
+        self.assertNotIn('Last-Modified', response)
+        self.assertEqual(
+            self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=response['ETag']).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/user/saved-scholarships/batch/', {'save': [self.scholarship.pk]}, format='json')
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['is_saved'])
+
+
+class FeedTests(ClearCachesMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.canada, _ = Country.objects.get_or_create(name="Canada")
+        self.japan, _ = Country.objects.get_or_create(name="Japan")
+        today = timezone.localdate()
+        self.expired = self.create("Expired", today - timedelta(days=1), is_featured=True)
+        self.tomorrow = self.create("Tomorrow", today + timedelta(days=1))
+        self.next_month = self.create("Next Month", today + timedelta(days=20), is_featured=True)
+        self.next_year = self.create("Next Year", today + timedelta(days=365), is_featured=True,
+                                     country=self.japan)
+
+    def create(self, title, deadline, is_featured=False, country=None):
+        return Scholarship.objects.create(
+            title=title, description="-", country=country or self.canada,
+            deadline=deadline, is_featured=is_featured,
+        )
+
+    def feed(self, name, **params):
+        response = self.client.get(f'/api/scholarships/feeds/{name}/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [card['title'] for card in response.data['results']]
+
+    def test_feeds_are_ordered_and_skip_expired_scholarships(self):
+        self.assertEqual(self.feed('featured'), ["Next Month", "Next Year"])
+        self.assertEqual(self.feed('closing-7'), ["Tomorrow"])
+        self.assertEqual(self.feed('closing-30'), ["Tomorrow", "Next Month"])
+        self.assertEqual(self.feed('newest'), ["Next Year", "Next Month", "Tomorrow"])
+        self.assertEqual(self.feed('country-japan'), ["Next Year"])
+        self.assertEqual(self.feed(f'country-{self.canada.pk}', limit=1), ["Tomorrow"])
+
+    def test_unknown_feeds_are_404(self):
+        for name in ('trending', 'country-atlantis'):
+            response = self.client.get(f'/api/scholarships/feeds/{name}/')
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cached_feed_costs_one_card_query_and_follows_writes(self):
+        self.feed('featured')
+        with self.assertNumQueries(1):
+            self.assertEqual(self.feed('featured'), ["Next Month", "Next Year"])
+
+        self.tomorrow.is_featured = True
+        self.tomorrow.save()
+        self.assertEqual(self.feed('featured'), ["Tomorrow", "Next Month", "Next Year"])
+
+    def test_feeds_rebuild_missing_cards(self):
+        # As after a raw loaddata save, which skips the card signal
+        ScholarshipCard.objects.filter(scholarship=self.next_month).delete()
+        self.assertEqual(self.feed('featured'), ["Next Month", "Next Year"])
+        self.assertTrue(ScholarshipCard.objects.filter(scholarship=self.next_month).exists())
+
+    def test_refresh_command_builds_every_feed(self):
+        out = StringIO()
+        call_command('refresh_feeds', stdout=out)
+        # Four global feeds plus one per country with open scholarships
+        self.assertIn('Rebuilt 6 feeds', out.getvalue())
+        # The country lookup on its first use, then the cards
+        with self.assertNumQueries(2):
+            self.assertEqual(self.feed('country-canada'), ["Tomorrow", "Next Month"])
+
+
+class ActiveScholarshipTests(ClearCachesMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.country, _ = Country.objects.get_or_create(name="Canada")
+        today = timezone.localdate()
+        self.open = self.create("Open", today)
+        self.closed = self.create("Closed", today - timedelta(days=10))
+        self.ancient = self.create("Ancient", today - timedelta(days=400))
+
+    def create(self, title, deadline):
+        return Scholarship.objects.create(
+            title=title, description="-", country=self.country, deadline=deadline
+        )
+
+    def titles(self, **params):
+        response = self.client.get('/api/scholarships/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(item['title'] for item in response.data['results'])
+
+    def test_listings_default_to_active_scholarships(self):
+        self.assertEqual((self.open.is_active, self.closed.is_active), (True, False))
+        self.assertEqual(self.titles(), ["Open"])
+        self.assertEqual(self.titles(view='card'), ["Open"])
+        self.assertEqual(self.titles(include_expired=1), ["Ancient", "Closed", "Open"])
+        # Expired scholarships keep their detail pages
+        response = self.client.get(f'/api/scholarships/{self.closed.slug}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_active_checks_the_deadline_as_well_as_the_flag(self):
+        # A row that expired since the last nightly run is still flagged active
+        Scholarship.objects.filter(pk=self.closed.pk).update(is_active=True)
+        self.assertEqual(list(Scholarship.active.values_list('title', flat=True)), ["Open"])
+
+    def test_archive_command_moves_long_closed_rows(self):
+        level, _ = Level.objects.get_or_create(name="Masters")
+        self.ancient.levels.add(level)
+        Scholarship.objects.filter(pk=self.closed.pk).update(is_active=True)
+
+        out = StringIO()
+        call_command('archive_scholarships', '--dry-run', stdout=out)
+        self.assertIn('Would archive 1 scholarships', out.getvalue())
+        self.assertTrue(Scholarship.objects.filter(pk=self.ancient.pk).exists())
+
+        call_command('archive_scholarships', stdout=out)
+        self.assertIn('Deactivated 1 and reactivated 0 scholarships; archived 1', out.getvalue())
+        self.assertFalse(Scholarship.objects.filter(pk=self.ancient.pk).exists())
+        self.assertFalse(Scholarship.objects.get(pk=self.closed.pk).is_active)
+        archived = ArchivedScholarship.objects.get(original_id=self.ancient.pk)
+        self.assertEqual((archived.title, archived.country_name), ("Ancient", "Canada"))
+        self.assertEqual(archived.taxonomies['levels'], ["Masters"])
+
+    def test_archive_keeps_scholarships_users_applied_to_or_saved(self):
+        user = get_user_model().objects.create_user(email='archive@example.com', password='pass12345')
+        applied = Scholarship.objects.create(
+            title="Applied", description="-", country=self.ancient.country, deadline=self.ancient.deadline
+        )
+        application = ScholarshipApplication.objects.create(user=user, scholarship=applied, status='approved')
+        SavedScholarship.objects.create(user=user, scholarship=self.ancient)
+
+        out = StringIO()
+        call_command('archive_scholarships', stdout=out)
+        self.assertIn('archived 0', out.getvalue())
+        self.assertTrue(ScholarshipApplication.objects.filter(pk=application.pk).exists())
+        self.assertEqual(Scholarship.objects.filter(pk__in=[applied.pk, self.ancient.pk]).count(), 2)
+
+        SavedScholarship.objects.all().delete()
+        call_command('archive_scholarships', stdout=out)
+        self.assertIn('archived 1', out.getvalue())
+        self.assertTrue(ScholarshipApplication.objects.filter(pk=application.pk).exists())
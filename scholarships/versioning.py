@@ -0,0 +1,34 @@
+"""
+Cache-held version counters.
+
+Derived cache entries embed the current value of a counter in their keys, so
+bumping the counter orphans all of them at once and the orphans simply age
+out. Counters live in the responses cache next to the entries they version.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.connection import ConnectionProxy
+
+
+class VersionCounter:
+    def __init__(self, key, alias=None):
+        self.key = key
+        self.cache = ConnectionProxy(caches, alias or settings.RESPONSE_CACHE_ALIAS)
+
+    def get(self):
+        """Return the current value, starting a new one if the cache lost it"""
+        value = self.cache.get(self.key)
+        if value is None:
+            # Seed from the clock so a flushed cache never reuses an old value
+            value = int(time.time() * 1000)
+            if not self.cache.add(self.key, value, timeout=None):
+                value = self.cache.get(self.key, value)
+        return value
+
+    def bump(self):
+        try:
+            self.cache.incr(self.key)
+        except ValueError:
+            self.get()
@@ -1,60 +1,239 @@
 from django.shortcuts import render
 from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
-from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
 from django_filters.rest_framework import DjangoFilterBackend
+from django.db.models import Count, Max
 from django.shortcuts import get_object_or_404
-from .models import (
-    Scholarship, Level, ScholarshipCategory, FieldOfStudy, 
-    FundType, SponsorType, Country
-)
-from .serializers import (
-    ScholarshipSerializer, LevelSerializer, ScholarshipCategorySerializer,
-    FieldOfStudySerializer, FundTypeSerializer, SponsorTypeSerializer, CountrySerializer
-)
-from .filters import ScholarshipFilter
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, parse_etags
+from users.saved_ids import get_saved_ids
+from users.throttling import AnonRateThrottle
+from .models import Scholarship, ScholarshipCard
+from .serializers import ScholarshipSerializer, ScholarshipCardSerializer
+from .filters import ScholarshipFilter, ScholarshipSearchFilter
+from .mixins import SparseFieldsetMixin
+from .pagination import ScholarshipCursorPagination, ScholarshipPageNumberPagination
+from .taxonomy import get_filter_options
+from .feeds import FEED_SIZE, get_feed_cards, get_feed_ids
+from . import response_cache
 
 class ScholarshipDetailThrottle(AnonRateThrottle):
     """Stricter rate limiting for detail views to prevent enumeration attacks"""
+    scope = 'scholarship_detail'  # Separate history from the general anon throttle
     rate = '30/hour'  # 30 requests per hour for anonymous users
 
-class ScholarshipViewSet(viewsets.ModelViewSet):
+class ScholarshipViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Scholarship.objects.all()
     serializer_class = ScholarshipSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, ScholarshipSearchFilter, filters.OrderingFilter]
     filterset_class = ScholarshipFilter
     search_fields = ['title', 'description']
     ordering_fields = ['created_at', 'deadline']
     lookup_field = 'slug'
+    filter_options_max_age = 300
+    # Detail lookups and cursor pagination read these even when not rendered
+    sparse_always_fields = ('pk', 'slug', 'created_at', 'deadline')
+    pagination_class = ScholarshipPageNumberPagination
+    # Opt-in keyset pagination with ?pagination=cursor
+    cursor_pagination_class = ScholarshipCursorPagination
+
+    @property
+    def paginator(self):
+        if (
+            not hasattr(self, '_paginator')
+            and self.request is not None
+            and self.request.query_params.get('pagination') == 'cursor'
+        ):
+            self._paginator = self.cursor_pagination_class()
+        return super().paginator
+
+    @property
+    def card_view(self):
+        """``?view=card`` lists the denormalized ScholarshipCard projection"""
+        return (
+            self.action == 'list'
+            and self.request is not None
+            and self.request.query_params.get('view') == 'card'
+        )
+
+    @property
+    def include_expired(self):
+        return (
+            self.request is not None
+            and self.request.query_params.get('include_expired', '').lower() in ('1', 'true', 'yes')
+        )
+
+    def base_queryset(self):
+        """Listings show active scholarships unless ``?include_expired=1``; lookups see every row"""
+        if self.action == 'list' and not self.include_expired:
+            return Scholarship.active.all()
+        return Scholarship.objects.all()
+
+    def get_queryset(self):
+        if self.card_view:
+            # Filtering and ordering still run on Scholarship, but only the card
+            # columns are selected through a primary-key join
+            card_fields = [f'card__{f.name}' for f in ScholarshipCard._meta.concrete_fields]
+            return (
+                self.base_queryset()
+                .select_related('card')
+                .only('id', 'created_at', 'deadline', *card_fields)
+            )
+        return self.sparse_queryset(self.base_queryset().with_related())
+
+    def get_serializer_class(self):
+        # Card listings and feeds render cards, so ?fields= and ?omit= name card fields
+        if self.card_view or self.action == 'feed':
+            return ScholarshipCardSerializer
+        return super().get_serializer_class()
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        # One cache read flags is_saved on every item of the page
+        context['saved_ids'] = get_saved_ids(self.request.user) if self.request else frozenset()
+        return context
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(request, self.render_list, self.list_validators)
+
+    def render_list(self):
+        if not self.card_view:
+            return super().list(self.request)
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        scholarships = page if page is not None else queryset
+        # Raw (loaddata) saves and bulk inserts skip the card signal; build those cards now
+        missing = [s.pk for s in scholarships if not hasattr(s, 'card')]
+        rebuilt = {card.pk: card for card in ScholarshipCard.objects.refresh(missing)} if missing else {}
+        serializer = self.get_serializer(
+            [rebuilt[s.pk] if s.pk in rebuilt else s.card for s in scholarships], many=True
+        )
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
+    def list_validators(self):
+        """(last modified, row count) of the filtered scholarships, in one aggregate query"""
+        queryset = self.filter_queryset(self.base_queryset())
+        if isinstance(self.paginator, self.cursor_pagination_class):
+            # Keyset pages never count. The cursor and page size are part of the
+            # ETag through the query string, and the generation catches deletions.
+            last_modified = queryset.aggregate(last_modified=Max('updated_at'))['last_modified']
+            return last_modified, response_cache.get_generation()
+        stats = queryset.aggregate(last_modified=Max('updated_at'), count=Count('pk'))
+        # Page number pagination reuses the count instead of running its own
+        self.row_count = stats['count']
+        return stats['last_modified'], stats['count']
 
     def get_throttles(self):
         if self.action == 'retrieve':
             return [ScholarshipDetailThrottle()]
         return super().get_throttles()
 
-    def retrieve(self, request, *args, **kwargs):
-        slug = kwargs.get('slug')
+    def lookup_filter(self):
+        slug = self.kwargs.get(self.lookup_field)
         # Support legacy numeric ID lookups for backward compatibility
         if slug and slug.isdigit():
-            scholarship = get_object_or_404(Scholarship, pk=slug)
-        else:
-            scholarship = get_object_or_404(Scholarship, slug=slug)
+            return {'pk': slug}
+        return {'slug': slug}
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(request, self.render_detail, self.detail_validators)
+
+    def render_detail(self):
+        scholarship = get_object_or_404(self.get_queryset(), **self.lookup_filter())
         serializer = self.get_serializer(scholarship)
         return Response(serializer.data)
 
+    def detail_validators(self):
+        """(last modified, pk) of the requested scholarship, or None when there is none"""
+        return Scholarship.objects.filter(**self.lookup_filter()).values_list('updated_at', 'pk').first()
+
+    def conditional_response(self, request, render_response, validators):
+        """
+        Answer If-None-Match and If-Modified-Since with 304 before anything
+        is serialized, and serve anonymous GETs from the response cache.
+        ``validators`` is read before ``render_response`` so a scholarship saved in
+        between makes the response look older, never newer.
+        """
+        key = entry = outcome = None
+        if response_cache.is_enabled():
+            if response_cache.is_cacheable(request):
+                key = response_cache.response_key(request)
+                entry = response_cache.get_entry(key)
+                outcome = response_cache.MISS if entry is None else response_cache.HIT
+            else:
+                outcome = response_cache.BYPASS
+            response_cache.record(outcome)
+
+        if entry is not None:
+            etag, last_modified = entry['etag'], entry['last_modified']
+        else:
+            current = validators()
+            if current is None:
+                # Let render_response() raise the 404
+                return render_response()
+            last_modified, *parts = current
+            if request.user.is_authenticated:
+                # is_saved can change without updated_at moving, so only the ETag,
+                # which covers the user's saved ids, can vouch for the body
+                parts.append(','.join(sorted(map(str, get_saved_ids(request.user)))))
+                last_modified = None
+            etag = response_cache.make_etag(request, last_modified, *parts)
+            last_modified = last_modified.timestamp() if last_modified else None
+
+        if response_cache.is_not_modified(request, etag, last_modified):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        elif entry is not None:
+            response = Response(entry['data'])
+        else:
+            response = render_response()
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            if key is not None:
+                response_cache.set_entry(key, response.data, etag, last_modified)
+
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        if outcome in (response_cache.HIT, response_cache.MISS):
+            response['X-Cache'] = outcome.upper()
+        # Authenticated clients get a personalised body for the same URL
+        patch_vary_headers(response, ('Authorization',))
+        return response
+
+    @action(detail=False, methods=['get'], url_path=r'feeds/(?P<feed>[\w-]+)')
+    def feed(self, request, feed=None):
+        """
+        Cards of a precomputed homepage feed: featured, closing-7, closing-30,
+        newest or country-<id, slug or name>. ``?limit=`` caps the length.
+        """
+        ids = get_feed_ids(feed)
+        if ids is None:
+            raise NotFound(f'Unknown feed {feed!r}')
+        try:
+            limit = min(max(int(request.query_params['limit']), 1), FEED_SIZE)
+        except (KeyError, ValueError):
+            limit = api_settings.PAGE_SIZE
+        serializer = self.get_serializer(get_feed_cards(ids[:limit]), many=True)
+        return Response({'feed': feed, 'results': serializer.data})
+
     @action(detail=False, methods=['get'], url_path='filter-options')
     def filter_options(self, request):
-        """Return all available filter options"""
-        data = {
-            'countries': CountrySerializer(Country.objects.all(), many=True).data,
-            'levels': LevelSerializer(Level.objects.all(), many=True).data,
-            'fields_of_study': FieldOfStudySerializer(FieldOfStudy.objects.all(), many=True).data,
-            'fund_types': FundTypeSerializer(FundType.objects.all(), many=True).data,
-            'categories': ScholarshipCategorySerializer(ScholarshipCategory.objects.all(), many=True).data,
-        }
-        return Response(data)
+        """Return all available filter options, cached until a taxonomy changes"""
+        data, etag = get_filter_options()
+        etags = parse_etags(request.headers.get('If-None-Match', ''))
+        if etag in etags or '*' in etags:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(data)
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=self.filter_options_max_age)
+        return response
 
 # Create your views here.
@@ -148,9 +148,9 @@ REST_FRAMEWORK = {
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle',
-        'rest_framework.throttling.ScopedRateThrottle',
+        'users.throttling.AnonRateThrottle',
+        'users.throttling.UserRateThrottle',
+        'users.throttling.ScopedRateThrottle',
     ],    'DEFAULT_THROTTLE_RATES': {
         'anon': os.getenv('THROTTLE_RATE_ANON', '1000/hour'),  # Increased for development
         'user': os.getenv('THROTTLE_RATE_USER', '10000/day'),  # Increased for development
@@ -235,6 +235,70 @@ else:
     }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# CACHE_BACKEND picks where cache entries live:
+#   file   - on-disk cache under CACHE_DIR, shared by every gunicorn worker on the host (default)
+#   redis  - Redis server at REDIS_URL, shared across hosts (requires the redis package)
+#   locmem - per-process memory; the test runner (scholarships_api.test_runner) always uses it
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'file').lower()
+CACHE_DIR = Path(os.getenv('CACHE_DIR', BASE_DIR / '.cache'))
+REDIS_URL = os.getenv('REDIS_URL', 'redis://127.0.0.1:6379/0')
+
+# Named aliases: rate limit counters and cached API responses are kept apart from
+# general data so either can be flushed without touching the other
+THROTTLE_CACHE_ALIAS = 'throttle'
+RESPONSE_CACHE_ALIAS = 'responses'
+
+# The file backend lists the alias directory on every set() to decide whether to
+# cull, and throttles set() on every request they check, so each throttled request
+# costs a directory listing proportional to the live counters. Once MAX_ENTRIES is
+# reached, 1/CULL_FREQUENCY of the files are deleted at random, whatever they hold.
+# Busy or multi-host deploys should use redis instead.
+FILE_CACHE_OPTIONS = {
+    'default': {'MAX_ENTRIES': 10000},
+    # Counters expire with their rate window; cull rarely and only a tenth at a
+    # time so a full directory does not reset many clients' limits at once
+    THROTTLE_CACHE_ALIAS: {'MAX_ENTRIES': 50000, 'CULL_FREQUENCY': 10},
+    # Responses stored under older generations linger until their timeout, so
+    # this alias fills up quickly; halve it when full. A culled generation or
+    # taxonomy counter is reseeded from the clock and only drops cached responses.
+    RESPONSE_CACHE_ALIAS: {'MAX_ENTRIES': 20000, 'CULL_FREQUENCY': 2},
+}
+
+
+def _cache_config(alias):
+    if CACHE_BACKEND == 'redis':
+        return {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': alias,
+        }
+    if CACHE_BACKEND == 'locmem':
+        return {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': alias,
+        }
+    return {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': str(CACHE_DIR / alias),
+        'OPTIONS': FILE_CACHE_OPTIONS[alias],
+    }
+
+
+CACHES = {
+    alias: _cache_config(alias)
+    for alias in ('default', THROTTLE_CACHE_ALIAS, RESPONSE_CACHE_ALIAS)
+}
+
+TEST_RUNNER = 'scholarships_api.test_runner.LocMemCacheTestRunner'
+
+# Seconds an anonymous scholarship list or detail response stays cached; 0 turns the cache off
+SCHOLARSHIP_RESPONSE_CACHE_TIMEOUT = int(os.getenv('SCHOLARSHIP_RESPONSE_CACHE_TIMEOUT', 600))
+# Seconds a recommendation feature matrix keeps serving after scholarships changed
+RECOMMENDATION_MATRIX_MAX_AGE = int(os.getenv('RECOMMENDATION_MATRIX_MAX_AGE', 60))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -366,6 +430,34 @@ DEFAULT_FROM_EMAIL = f'ScholarScanner <{os.environ.get("AWS_SES_FROM_EMAIL", "no
 # OTP Configuration
 OTP_EXPIRE_MINUTES = 10  # OTP expires in 10 minutes
 OTP_LENGTH = 6  # 6-digit OTP
+# Where codes live (users/otp.py):
+#   database - EmailVerification rows (default); purge them with `manage.py purge_otps`
+#   cache    - hashed codes in the OTP_CACHE_ALIAS cache, expiring on their own
+# The cache store needs a cache shared by every worker, i.e. file or redis, not locmem.
+# Pair it with EMAIL_QUEUE_BACKEND=redis: the database queue still inserts an
+# OutboundEmail row per code (`manage.py check` warns about this, users.W001)
+OTP_STORE = os.getenv('OTP_STORE', 'database').lower()
+OTP_CACHE_ALIAS = 'default'
+OTP_MAX_ATTEMPTS = int(os.getenv('OTP_MAX_ATTEMPTS', 5))  # Wrong guesses before a cached code is burned
+
+# Outbound email queue (users/email_queue.py), drained by `manage.py process_email_queue`
+#   database - OutboundEmail table (default)
+#   redis    - lists at REDIS_URL (requires the redis package)
+EMAIL_QUEUE_BACKEND = os.getenv('EMAIL_QUEUE_BACKEND', 'database').lower()
+EMAIL_QUEUE_MAX_ATTEMPTS = int(os.getenv('EMAIL_QUEUE_MAX_ATTEMPTS', 5))
+EMAIL_QUEUE_RETRY_BASE_SECONDS = int(os.getenv('EMAIL_QUEUE_RETRY_BASE_SECONDS', 30))
+# Messages per second each worker process may hand to a provider (None = unlimited)
+EMAIL_PROVIDER_RATE_LIMITS = {
+    'ses': 14,
+    'gmail': 1,
+    'smtp': 10,
+    'console': None,
+}
+
+# Scholarship search
+# Dotted path to a scholarships.search backend class; empty picks one from the database vendor
+# (PostgreSQL tsvector, SQLite FTS5, icontains elsewhere)
+SCHOLARSHIP_SEARCH_BACKEND = os.getenv('SCHOLARSHIP_SEARCH_BACKEND', '')
 
 # CKEditor Configuration
 CKEDITOR_BASEPATH = "/static/ckeditor/ckeditor/"
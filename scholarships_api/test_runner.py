@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class LocMemCacheTestRunner(DiscoverRunner):
+    """Run the tests against per-process memory caches, whatever CACHE_BACKEND says"""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._cache_override = override_settings(CACHES={
+            alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': alias}
+            for alias in settings.CACHES
+        })
+        self._cache_override.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._cache_override.disable()
+        super().teardown_test_environment(**kwargs)
+
+
+class ClearCachesMixin:
+    """Start every test with empty caches, so cached responses and counters never leak between tests"""
+
+    def setUp(self):
+        super().setUp()
+        for cache in caches.all():
+            cache.clear()
@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.translation import gettext_lazy as _
 
-from .models import User, UserProfile, SavedScholarship, ScholarshipApplication
+from .models import User, UserProfile, SavedScholarship, ScholarshipApplication, OutboundEmail, DeadlineReminder
 
 
 class UserProfileInline(admin.StackedInline):
@@ -47,3 +47,19 @@ class ScholarshipApplicationAdmin(admin.ModelAdmin):
     list_filter = ('status', 'date_applied')
     search_fields = ('user__email', 'scholarship__title', 'notes')
     date_hierarchy = 'date_applied'
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ('to_email', 'kind', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status', 'kind', 'provider')
+    search_fields = ('to_email', 'last_error')
+    readonly_fields = ('created_at', 'sent_at', 'locked_at')
+
+
+@admin.register(DeadlineReminder)
+class DeadlineReminderAdmin(admin.ModelAdmin):
+    list_display = ('user', 'scholarship', 'window', 'sent_at')
+    list_filter = ('window',)
+    search_fields = ('user__email', 'scholarship__title')
+    raw_id_fields = ('user', 'scholarship')
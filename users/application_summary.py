@@ -0,0 +1,95 @@
+"""
+Aggregates behind the application tracking dashboard.
+
+The summary is computed with one GROUP BY over the user's applications plus
+one query for the latest updates, and cached per user for the day. signals.py
+drops the entry whenever one of the user's applications is written.
+"""
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from .models import ScholarshipApplication
+
+SUMMARY_KEY = 'users:application-summary:{user_id}:{day}'
+# Bounds how stale the totals get when a scholarship's amount or deadline changes
+SUMMARY_TIMEOUT = 60 * 15
+UPCOMING_DEADLINE_DAYS = 30
+RECENT_UPDATES = 5
+# Applications whose scholarship deadline still matters
+OPEN_STATUSES = ('pending', 'submitted', 'under_review')
+
+
+def summary_key(user_id):
+    # The day is part of the key because "upcoming" moves with the calendar
+    return SUMMARY_KEY.format(user_id=user_id, day=timezone.localdate().isoformat())
+
+
+def build_application_summary(user_id):
+    today = timezone.localdate()
+    applications = ScholarshipApplication.objects.filter(user_id=user_id)
+    rows = (
+        applications.order_by()
+        .values('status')
+        .annotate(
+            count=Count('id'),
+            total_amount=Sum('scholarship__amount'),
+            upcoming=Count('id', filter=Q(
+                status__in=OPEN_STATUSES,
+                scholarship__deadline__gte=today,
+                scholarship__deadline__lte=today + timedelta(days=UPCOMING_DEADLINE_DAYS),
+            )),
+        )
+    )
+    by_status = {
+        status: {'count': 0, 'total_amount': '0.00'}
+        for status, _ in ScholarshipApplication.STATUS_CHOICES
+    }
+    total = upcoming = 0
+    total_amount = 0
+    for row in rows:
+        amount = row['total_amount'] or 0
+        by_status[row['status']] = {'count': row['count'], 'total_amount': f'{amount:.2f}'}
+        total += row['count']
+        total_amount += amount
+        upcoming += row['upcoming']
+
+    recent = (
+        applications.select_related('scholarship')
+        .order_by('-last_updated', '-id')[:RECENT_UPDATES]
+    )
+    return {
+        'total': total,
+        'total_amount': f'{total_amount:.2f}',
+        'by_status': by_status,
+        'upcoming_deadlines': upcoming,
+        'upcoming_window_days': UPCOMING_DEADLINE_DAYS,
+        'recent_updates': [
+            {
+                'id': application.pk,
+                'scholarship': application.scholarship_id,
+                'scholarship_title': application.scholarship.title,
+                'deadline': application.scholarship.deadline,
+                'status': application.status,
+                'last_updated': application.last_updated,
+            }
+            for application in recent
+        ],
+    }
+
+
+def get_application_summary(user):
+    key = summary_key(user.pk)
+    summary = cache.get(key)
+    if summary is None:
+        summary = build_application_summary(user.pk)
+        cache.set(key, summary, SUMMARY_TIMEOUT)
+    return summary
+
+
+def invalidate_application_summary(user_id):
+    """Drop the user's cached summary once the current transaction commits"""
+    transaction.on_commit(lambda: cache.delete(summary_key(user_id)))
@@ -8,3 +8,4 @@ class UsersConfig(AppConfig):
     def ready(self):
         # Import signals to ensure they're connected
         import users.signals
+        import users.checks
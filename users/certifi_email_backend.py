@@ -1,23 +1,18 @@
-import ssl
 import smtplib
-import certifi
 from django.conf import settings
 from django.core.mail.backends.smtp import EmailBackend
 
+from .email_connections import get_ssl_context
+
 
 class CertifiEmailBackend(EmailBackend):
     """SMTP backend with certifi CA bundle. Disables cert verification in DEBUG mode
     to handle corporate proxies or antivirus SSL interception on Windows."""
 
     def _build_ssl_context(self):
-        if getattr(settings, 'DEBUG', False):
-            # Dev only: skip verification to avoid proxy/AV SSL interception issues
-            context = ssl.create_default_context()
-            context.check_hostname = False
-            context.verify_mode = ssl.CERT_NONE
-        else:
-            context = ssl.create_default_context(cafile=certifi.where())
-        return context
+        # Dev only: skip verification to avoid proxy/AV SSL interception issues.
+        # The context is built once per process and shared by every connection.
+        return get_ssl_context(verify=not getattr(settings, 'DEBUG', False))
 
     def open(self):
         if self.connection:
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+
+@register()
+def check_otp_store_pairing(app_configs, **kwargs):
+    """The cache OTP store only keeps OTP traffic off the database if the email queue does too"""
+    if settings.OTP_STORE == 'cache' and settings.EMAIL_QUEUE_BACKEND == 'database':
+        return [Warning(
+            'OTP_STORE=cache still writes an OutboundEmail row for every code sent, '
+            'because EMAIL_QUEUE_BACKEND=database.',
+            hint='Set EMAIL_QUEUE_BACKEND=redis so issuing codes never touches the database.',
+            id='users.W001',
+        )]
+    return []
@@ -0,0 +1,194 @@
+"""
+Deadline reminder digests for saved scholarships.
+
+Saved scholarships whose deadline falls inside a reminder window (7 and 1
+days by default) are streamed in user order, grouped into one digest per
+user and sent in batches over the pooled email connection, throttled by the
+provider rate limits. A DeadlineReminder marker per (user, scholarship,
+window) is claimed before sending and stamped once the digest went out, so
+reruns and overlapping runs never send a reminder twice. Only one batch of
+users is held in memory at a time.
+"""
+import logging
+import uuid
+from dataclasses import dataclass, field
+from datetime import timedelta
+from itertools import groupby
+
+from django.conf import settings
+from django.db.models import Case, Exists, OuterRef, PositiveSmallIntegerField, Value, When
+from django.utils import timezone
+
+from .email_connections import pool
+from .email_queue import RateLimiter, current_provider
+from .email_service import build_deadline_digest
+from .models import DeadlineReminder, SavedScholarship
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOWS = (7, 1)
+
+ROW_FIELDS = (
+    'user_id', 'user__email', 'user__full_name', 'scholarship_id', 'scholarship__title',
+    'scholarship__slug', 'scholarship__provider', 'scholarship__deadline', 'window',
+)
+
+
+def days_left_label(days):
+    if days == 0:
+        return 'closes today'
+    if days == 1:
+        return 'closes tomorrow'
+    return f'in {days} days'
+
+
+@dataclass
+class Digest:
+    user_id: int
+    email: str
+    full_name: str
+    # (scholarship_id, window, reminder dict for the template)
+    reminders: list = field(default_factory=list)
+
+
+@dataclass
+class ReminderStats:
+    digests: int = 0
+    reminders: int = 0
+    failed: int = 0
+    skipped: int = 0
+
+
+class DeadlineReminderMailer:
+    # Markers claimed but never stamped belong to a run that died mid-send
+    claim_timeout = timedelta(hours=1)
+
+    def __init__(self, windows=DEFAULT_WINDOWS, batch_size=500, chunk_size=2000,
+                 dry_run=False, today=None, rate_limits=None):
+        self.windows = sorted(set(windows))
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        self.today = today or timezone.localdate()
+        if rate_limits is None:
+            rate_limits = settings.EMAIL_PROVIDER_RATE_LIMITS
+        self.rate_limiter = RateLimiter(rate_limits)
+        self.provider = current_provider()
+
+    def due_rows(self):
+        """Saved scholarships inside a window whose reminder for that window was not sent yet"""
+        # The narrowest window a deadline falls in, e.g. 1 for tomorrow, 7 for next week
+        window = Case(
+            *[When(scholarship__deadline__lte=self.today + timedelta(days=days), then=Value(days))
+              for days in self.windows],
+            output_field=PositiveSmallIntegerField(),
+        )
+        already_sent = DeadlineReminder.objects.filter(
+            user=OuterRef('user_id'), scholarship=OuterRef('scholarship_id'), window=OuterRef('window')
+        )
+        return (
+            SavedScholarship.objects
+            .filter(
+                user__is_active=True,
+                scholarship__deadline__gte=self.today,
+                scholarship__deadline__lte=self.today + timedelta(days=self.windows[-1]),
+            )
+            .annotate(window=window)
+            .filter(~Exists(already_sent))
+            .order_by('user_id', 'scholarship__deadline', 'scholarship_id')
+            .values_list(*ROW_FIELDS)
+            .iterator(chunk_size=self.chunk_size)
+        )
+
+    def digests(self):
+        for user_id, rows in groupby(self.due_rows(), key=lambda row: row[0]):
+            digest = None
+            for _, email, full_name, scholarship_id, title, slug, provider, deadline, window in rows:
+                if digest is None:
+                    digest = Digest(user_id, email, full_name)
+                digest.reminders.append((scholarship_id, window, {
+                    'title': title,
+                    'slug': slug,
+                    'provider': provider,
+                    'deadline': deadline.strftime('%d %b %Y'),
+                    'days_left': days_left_label((deadline - self.today).days),
+                }))
+            yield digest
+
+    def batches(self):
+        batch = []
+        for digest in self.digests():
+            batch.append(digest)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def claim(self, batch):
+        """Insert this run's markers and drop the reminders another run claimed first"""
+        token = uuid.uuid4().hex
+        DeadlineReminder.objects.bulk_create(
+            [
+                DeadlineReminder(user_id=digest.user_id, scholarship_id=scholarship_id,
+                                 window=window, claim_token=token)
+                for digest in batch
+                for scholarship_id, window, _ in digest.reminders
+            ],
+            ignore_conflicts=True,
+        )
+        owned = set(
+            DeadlineReminder.objects.filter(claim_token=token)
+            .values_list('user_id', 'scholarship_id', 'window')
+        )
+        skipped = 0
+        for digest in batch:
+            mine = [r for r in digest.reminders if (digest.user_id, r[0], r[1]) in owned]
+            skipped += len(digest.reminders) - len(mine)
+            digest.reminders = mine
+        return token, skipped
+
+    def send_batch(self, batch, stats):
+        token, skipped = self.claim(batch)
+        stats.skipped += skipped
+        sent_users, failed_users = [], []
+        for digest in batch:
+            if not digest.reminders:
+                continue
+            message = build_deadline_digest(
+                digest.email, digest.full_name, [reminder for _, _, reminder in digest.reminders]
+            )
+            self.rate_limiter.wait(self.provider)
+            try:
+                pool.send_messages([message])
+            except Exception as e:
+                logger.error(f"Failed to send deadline reminders to {digest.email}: {e}")
+                failed_users.append(digest.user_id)
+                stats.failed += 1
+            else:
+                sent_users.append(digest.user_id)
+                stats.digests += 1
+                stats.reminders += len(digest.reminders)
+
+        mine = DeadlineReminder.objects.filter(claim_token=token)
+        if sent_users:
+            mine.filter(user_id__in=sent_users).update(sent_at=timezone.now())
+        if failed_users:
+            # Release the markers so the next run tries these users again
+            mine.filter(user_id__in=failed_users).delete()
+
+    def run(self):
+        stats = ReminderStats()
+        if not self.dry_run:
+            DeadlineReminder.objects.filter(
+                sent_at__isnull=True, created_at__lt=timezone.now() - self.claim_timeout
+            ).delete()
+            # Markers of closed scholarships can never match a due row again
+            DeadlineReminder.objects.filter(scholarship__deadline__lt=self.today).delete()
+        for batch in self.batches():
+            if self.dry_run:
+                stats.digests += len(batch)
+                stats.reminders += sum(len(digest.reminders) for digest in batch)
+                continue
+            self.send_batch(batch, stats)
+        return stats
@@ -0,0 +1,148 @@
+"""
+Process-wide email connections.
+
+Building a boto3 client, an SSL context or an authenticated SMTP session
+costs far more than sending one message over it, so these are created once
+and reused: the SSL context and SES clients are cached per process, and each
+thread keeps its SMTP connection open between sends. A connection idle for
+long is health-checked with NOOP before reuse and dropped after
+``idle_timeout`` seconds.
+"""
+import logging
+import smtplib
+import ssl
+import threading
+import time
+from functools import lru_cache
+
+import certifi
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+
+try:
+    import boto3
+    AWS_SES_AVAILABLE = True
+except ImportError:
+    AWS_SES_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def get_ssl_context(verify=True):
+    """Shared SSL context; ``verify=False`` skips certificate checks (development only)"""
+    if not verify:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        return context
+    return ssl.create_default_context(cafile=certifi.where())
+
+
+_ses_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _ses_client(access_key, secret_key, region):
+    return boto3.client(
+        'ses',
+        aws_access_key_id=access_key,
+        aws_secret_access_key=secret_key,
+        region_name=region,
+    )
+
+
+def get_ses_client(access_key, secret_key, region):
+    """Return the process' SES client for these credentials; botocore pools its HTTPS connections"""
+    # Creating clients is not thread-safe in boto3, using them is
+    with _ses_lock:
+        return _ses_client(access_key, secret_key, region)
+
+
+class SMTPConnectionPool:
+    """One long-lived email backend connection per thread"""
+
+    def __init__(self, idle_timeout=60, health_check_after=5):
+        self.idle_timeout = idle_timeout
+        self.health_check_after = health_check_after
+        self.local = threading.local()
+
+    @staticmethod
+    def settings_key():
+        # A connection is only reused while the email settings it was opened with hold
+        return tuple(
+            getattr(settings, name, None)
+            for name in ('EMAIL_BACKEND', 'EMAIL_HOST', 'EMAIL_PORT', 'EMAIL_HOST_USER',
+                         'EMAIL_USE_TLS', 'EMAIL_USE_SSL')
+        )
+
+    @staticmethod
+    def is_healthy(backend):
+        if not hasattr(backend, 'connection'):
+            # Console, locmem and file backends have nothing to keep alive
+            return True
+        if backend.connection is None:
+            return False
+        try:
+            return backend.connection.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    @staticmethod
+    def close(backend):
+        try:
+            backend.close()
+        except Exception as e:
+            logger.debug(f"Ignoring error while closing email connection: {e}")
+
+    def connection(self):
+        """Return this thread's open backend, reconnecting when it is stale or broken"""
+        entry = getattr(self.local, 'entry', None)
+        key = self.settings_key()
+        now = time.monotonic()
+        if entry is not None:
+            backend, opened_with, last_used = entry
+            idle = now - last_used
+            if (
+                opened_with != key
+                or idle > self.idle_timeout
+                or (idle > self.health_check_after and not self.is_healthy(backend))
+            ):
+                self.close(backend)
+                entry = None
+        if entry is None:
+            backend = get_connection(fail_silently=False)
+            backend.open()
+        self.local.entry = (backend, key, now)
+        return backend
+
+    def discard(self):
+        entry = getattr(self.local, 'entry', None)
+        if entry is not None:
+            self.close(entry[0])
+            self.local.entry = None
+
+    def send_messages(self, messages):
+        """Send every message over this thread's connection; returns how many were sent"""
+        backend = self.connection()
+        try:
+            sent = backend.send_messages(messages)
+        except (smtplib.SMTPServerDisconnected, ConnectionError):
+            # The server dropped the connection since the last health check
+            self.discard()
+            backend = self.connection()
+            sent = backend.send_messages(messages)
+        self.local.entry = (backend, self.settings_key(), time.monotonic())
+        return sent
+
+
+pool = SMTPConnectionPool()
+
+
+def send_email(subject, plain_message, html_message, to_email, from_email=None):
+    """Send one HTML email with a plain-text alternative over the pooled connection"""
+    message = EmailMultiAlternatives(
+        subject, plain_message, from_email or settings.DEFAULT_FROM_EMAIL, [to_email]
+    )
+    message.attach_alternative(html_message, 'text/html')
+    return pool.send_messages([message]) == 1
@@ -0,0 +1,314 @@
+"""
+Outbound email queue.
+
+Views enqueue emails and return straight away; the process_email_queue
+command delivers them with retries, backoff and per-provider rate limits.
+The OutboundEmail table is the default backend and needs nothing extra.
+EMAIL_QUEUE_BACKEND=redis keeps the jobs in Redis at REDIS_URL instead
+(requires the redis package). Payloads carry OTP and password reset codes in
+plain text, so both backends drop them once a job is sent or given up on.
+"""
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+from . import email_service
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+EMAIL_OTP = 'otp'
+EMAIL_WELCOME = 'welcome'
+EMAIL_PASSWORD_RESET = 'password_reset'
+
+
+class EmailDeliveryError(Exception):
+    pass
+
+
+def _send_otp(to_email, payload):
+    return email_service.send_verification_email(to_email, payload['otp_code'])
+
+
+def _send_welcome(to_email, payload):
+    return email_service.send_welcome_email_django(to_email, payload.get('full_name'))
+
+
+def _send_password_reset(to_email, payload):
+    return email_service.send_password_reset_email(to_email, payload['otp_code'])
+
+
+# kind -> callable(to_email, payload) returning True once the provider accepted the message
+SENDERS = {
+    EMAIL_OTP: _send_otp,
+    EMAIL_WELCOME: _send_welcome,
+    EMAIL_PASSWORD_RESET: _send_password_reset,
+}
+
+
+def current_provider():
+    """Name of the provider the configured email backend talks to, for rate limiting"""
+    backend = settings.EMAIL_BACKEND
+    if not backend.endswith(('smtp.EmailBackend', 'CertifiEmailBackend')):
+        return 'console'
+    host = getattr(settings, 'EMAIL_HOST', '')
+    if host.endswith('amazonaws.com'):
+        return 'ses'
+    if host.endswith('gmail.com'):
+        return 'gmail'
+    return 'smtp'
+
+
+@dataclass
+class EmailJob:
+    kind: str
+    to_email: str
+    payload: dict = field(default_factory=dict)
+    attempts: int = 0
+    # Backend handle: the OutboundEmail pk, or the raw Redis entry
+    ref: object = None
+
+
+class DatabaseEmailQueue:
+    """Jobs are OutboundEmail rows, claimed in batches with a conditional UPDATE"""
+
+    # A row left in "sending" this long belongs to a worker that died
+    lock_timeout = 60 * 10
+
+    def enqueue(self, kind, to_email, payload):
+        # Written in the caller's transaction, so the job exists exactly when its OTP does
+        return OutboundEmail.objects.create(kind=kind, to_email=to_email, payload=payload)
+
+    def claim(self, limit):
+        now = timezone.now()
+        OutboundEmail.objects.filter(
+            status='sending', locked_at__lt=now - timedelta(seconds=self.lock_timeout)
+        ).update(status='queued')
+
+        due = OutboundEmail.objects.filter(status='queued', next_attempt_at__lte=now)
+        candidates = list(due.order_by('next_attempt_at').values_list('pk', flat=True)[:limit])
+        if not candidates:
+            return []
+        # Rows another worker claimed in the meantime no longer match status='queued'
+        token = uuid.uuid4().hex
+        OutboundEmail.objects.filter(pk__in=candidates, status='queued').update(
+            status='sending', locked_at=now, claim_token=token
+        )
+        return [
+            EmailJob(row.kind, row.to_email, row.payload, row.attempts, ref=row.pk)
+            for row in OutboundEmail.objects.filter(claim_token=token, status='sending')
+        ]
+
+    def ack(self, job, provider):
+        OutboundEmail.objects.filter(pk=job.ref).update(
+            status='sent', sent_at=timezone.now(), provider=provider,
+            attempts=job.attempts + 1, last_error='', payload={},
+        )
+
+    def retry(self, job, error, delay):
+        OutboundEmail.objects.filter(pk=job.ref).update(
+            status='queued', attempts=job.attempts + 1, last_error=error,
+            next_attempt_at=timezone.now() + timedelta(seconds=delay),
+        )
+
+    def fail(self, job, error):
+        OutboundEmail.objects.filter(pk=job.ref).update(
+            status='failed', attempts=job.attempts + 1, last_error=error, payload={},
+        )
+
+
+@lru_cache(maxsize=None)
+def _redis_client(url):
+    return redis.Redis.from_url(url)
+
+
+class RedisEmailQueue:
+    """
+    Jobs are JSON entries in Redis: a ready list, a delayed sorted set for
+    retries and a processing sorted set (scored by claim time) so entries of a
+    worker that died are handed out again.
+    """
+    ready_key = 'email-queue:ready'
+    delayed_key = 'email-queue:delayed'
+    processing_key = 'email-queue:processing'
+    failed_key = 'email-queue:failed'
+    lock_timeout = 60 * 10
+
+    def __init__(self, url=None):
+        if not REDIS_AVAILABLE:
+            raise RuntimeError('EMAIL_QUEUE_BACKEND=redis requires the redis package')
+        self.client = _redis_client(url or settings.REDIS_URL)
+
+    def enqueue(self, kind, to_email, payload):
+        entry = json.dumps({
+            'id': uuid.uuid4().hex, 'kind': kind, 'to_email': to_email,
+            'payload': payload, 'attempts': 0,
+        })
+        # Only publish once the OTP the email refers to is committed
+        transaction.on_commit(lambda: self.client.lpush(self.ready_key, entry))
+        return entry
+
+    def _move(self, source, members):
+        for member in members:
+            # Whoever removes the entry first owns the move
+            if self.client.zrem(source, member):
+                self.client.lpush(self.ready_key, member)
+
+    def claim(self, limit):
+        now = time.time()
+        self._move(self.delayed_key, self.client.zrangebyscore(self.delayed_key, 0, now))
+        self._move(
+            self.processing_key,
+            self.client.zrangebyscore(self.processing_key, 0, now - self.lock_timeout),
+        )
+        jobs = []
+        for _ in range(limit):
+            raw = self.client.rpop(self.ready_key)
+            if raw is None:
+                break
+            self.client.zadd(self.processing_key, {raw: now})
+            data = json.loads(raw)
+            jobs.append(EmailJob(data['kind'], data['to_email'], data['payload'], data['attempts'], ref=raw))
+        return jobs
+
+    def ack(self, job, provider):
+        self.client.zrem(self.processing_key, job.ref)
+
+    def retry(self, job, error, delay):
+        data = json.loads(job.ref)
+        data.update(attempts=job.attempts + 1, last_error=error)
+        pipe = self.client.pipeline()
+        pipe.zrem(self.processing_key, job.ref)
+        pipe.zadd(self.delayed_key, {json.dumps(data): time.time() + delay})
+        pipe.execute()
+
+    def fail(self, job, error):
+        data = json.loads(job.ref)
+        data.update(attempts=job.attempts + 1, last_error=error, payload={})
+        pipe = self.client.pipeline()
+        pipe.zrem(self.processing_key, job.ref)
+        pipe.lpush(self.failed_key, json.dumps(data))
+        pipe.execute()
+
+
+QUEUE_BACKENDS = {
+    'database': DatabaseEmailQueue,
+    'redis': RedisEmailQueue,
+}
+
+
+def get_email_queue():
+    backend = getattr(settings, 'EMAIL_QUEUE_BACKEND', 'database')
+    try:
+        return QUEUE_BACKENDS[backend]()
+    except KeyError:
+        raise ValueError(f'Unknown EMAIL_QUEUE_BACKEND {backend!r}')
+
+
+def enqueue_email(kind, to_email, **payload):
+    """Queue an email of ``kind`` for ``to_email``; the worker renders it from ``payload``"""
+    if kind not in SENDERS:
+        raise ValueError(f'Unknown email kind {kind!r}')
+    return get_email_queue().enqueue(kind, to_email, payload)
+
+
+class RateLimiter:
+    """Token bucket per provider, shared by the worker's delivery threads"""
+
+    def __init__(self, rates):
+        self.rates = {provider: rate for provider, rate in rates.items() if rate}
+        self.lock = threading.Lock()
+        self.buckets = {}
+
+    def wait(self, provider):
+        rate = self.rates.get(provider)
+        if not rate:
+            return
+        capacity = max(rate, 1)
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                tokens, updated = self.buckets.get(provider, (capacity, now))
+                tokens = min(capacity, tokens + (now - updated) * rate)
+                if tokens >= 1:
+                    self.buckets[provider] = (tokens - 1, now)
+                    return
+                self.buckets[provider] = (tokens, now)
+                delay = (1 - tokens) / rate
+            time.sleep(delay)
+
+
+class EmailQueueWorker:
+    """
+    Claims due jobs and delivers them on a thread pool. Only the network
+    sends run on the threads; all queue bookkeeping stays on the calling
+    thread, so the worker needs a single database connection.
+    """
+
+    def __init__(self, queue=None, concurrency=4, batch_size=50, max_attempts=None,
+                 retry_base=None, max_retry_delay=60 * 60, rate_limits=None):
+        self.queue = queue or get_email_queue()
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts or settings.EMAIL_QUEUE_MAX_ATTEMPTS
+        self.retry_base = retry_base or settings.EMAIL_QUEUE_RETRY_BASE_SECONDS
+        self.max_retry_delay = max_retry_delay
+        if rate_limits is None:
+            rate_limits = settings.EMAIL_PROVIDER_RATE_LIMITS
+        self.rate_limiter = RateLimiter(rate_limits)
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='email')
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+    def retry_delay(self, attempts):
+        """Exponential backoff with jitter: base, 2 x base, 4 x base, ... capped"""
+        delay = min(self.max_retry_delay, self.retry_base * 2 ** (attempts - 1))
+        return delay * random.uniform(0.8, 1.2)
+
+    def send(self, job, provider):
+        self.rate_limiter.wait(provider)
+        if not SENDERS[job.kind](job.to_email, job.payload):
+            raise EmailDeliveryError('The email backend reported a failed send')
+
+    def run_once(self):
+        """Deliver one batch of due jobs; returns (sent, retried, failed)"""
+        jobs = self.queue.claim(self.batch_size)
+        provider = current_provider()
+        futures = [(job, self.executor.submit(self.send, job, provider)) for job in jobs]
+        sent = retried = failed = 0
+        for job, future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                error = f'{e.__class__.__name__}: {e}'
+                if job.attempts + 1 >= self.max_attempts:
+                    logger.error(f"Giving up on {job.kind} email to {job.to_email}: {error}")
+                    self.queue.fail(job, error)
+                    failed += 1
+                else:
+                    delay = self.retry_delay(job.attempts + 1)
+                    logger.warning(f"Retrying {job.kind} email to {job.to_email} in {delay:.0f}s: {error}")
+                    self.queue.retry(job, error, delay)
+                    retried += 1
+            else:
+                self.queue.ack(job, provider)
+                sent += 1
+        return sent, retried, failed
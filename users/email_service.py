@@ -1,18 +1,16 @@
-from django.core.mail import send_mail
 from django.conf import settings
-from django.template.loader import render_to_string
-from django.utils.html import strip_tags
+from django.core.mail import EmailMultiAlternatives
 import os
 import logging
 
-# AWS SES imports
-try:
-    import boto3
+from .email_connections import AWS_SES_AVAILABLE, get_ses_client, send_email
+
+# AWS SES errors; the SES client itself is built in email_connections
+if AWS_SES_AVAILABLE:
     from botocore.exceptions import ClientError, NoCredentialsError
-    AWS_SES_AVAILABLE = True
-except ImportError:
-    AWS_SES_AVAILABLE = False
+else:
     logging.warning("boto3 not installed. Falling back to Django's email backend.")
+from .email_templates import render_email
 
 logger = logging.getLogger(__name__)
 
@@ -34,21 +32,12 @@ def send_otp_email_aws_ses(email, otp_code):
         return send_otp_email(email, otp_code)
     
     try:
-        # Create SES client
-        ses_client = boto3.client(
-            'ses',
-            aws_access_key_id=aws_access_key,
-            aws_secret_access_key=aws_secret_key,
-            region_name=aws_region
-        )
+        # Reuse the process-wide SES client
+        ses_client = get_ses_client(aws_access_key, aws_secret_key, aws_region)
         
         from_email = getattr(settings, 'AWS_SES_FROM_EMAIL', 'noreply@scholarscanner.com')
         
-        # HTML content
-        html_content = get_otp_html_template(otp_code)
-        
-        # Plain text content
-        plain_content = get_otp_plain_template(otp_code)
+        html_content, plain_content = render_email('otp', otp_code=otp_code)
         
         # Send email
         response = ses_client.send_email(
@@ -92,298 +81,20 @@ def send_otp_email_aws_ses(email, otp_code):
         return send_otp_email(email, otp_code)
 
 
-def get_otp_html_template(otp_code):
-    """Get HTML template for OTP email"""
-    return f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="utf-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Email Verification - ScholarScanner</title>
-        <style>
-            body {{
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                line-height: 1.6;
-                color: #333;
-                max-width: 600px;
-                margin: 0 auto;
-                padding: 20px;
-                background-color: #f7fafc;
-            }}
-            .container {{
-                background-color: #ffffff;
-                border-radius: 12px;
-                overflow: hidden;
-                box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-            }}
-            .header {{
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                padding: 40px 20px;
-                text-align: center;
-            }}
-            .header h1 {{
-                margin: 0;
-                font-size: 28px;
-                font-weight: 700;
-            }}
-            .header p {{
-                margin: 10px 0 0;
-                opacity: 0.9;
-                font-size: 16px;
-            }}
-            .content {{
-                padding: 40px;
-            }}
-            .content h2 {{
-                color: #2d3748;
-                margin-top: 0;
-                font-size: 24px;
-            }}
-            .otp-container {{
-                background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-                border-radius: 12px;
-                padding: 30px;
-                text-align: center;
-                margin: 30px 0;
-            }}
-            .otp-label {{
-                color: white;
-                font-size: 16px;
-                margin-bottom: 15px;
-                font-weight: 500;
-            }}
-            .otp-code {{
-                font-size: 36px;
-                font-weight: 800;
-                color: white;
-                letter-spacing: 8px;
-                margin: 15px 0;
-                text-shadow: 0 2px 4px rgba(0,0,0,0.3);
-            }}
-            .otp-expiry {{
-                color: rgba(255,255,255,0.9);
-                font-size: 14px;
-                margin-top: 15px;
-            }}
-            .security-note {{
-                background-color: #fed7d7;
-                border-left: 4px solid #f56565;
-                padding: 20px;
-                margin: 30px 0;
-                border-radius: 6px;
-            }}
-            .security-note strong {{
-                color: #c53030;
-            }}
-            .footer {{
-                background-color: #f7fafc;
-                padding: 30px;
-                text-align: center;
-                color: #718096;
-                font-size: 14px;
-                border-top: 1px solid #e2e8f0;
-            }}
-            .logo {{
-                font-size: 24px;
-                margin-bottom: 10px;
-            }}
-            @media (max-width: 600px) {{
-                .content {{
-                    padding: 20px;
-                }}
-                .otp-code {{
-                    font-size: 28px;
-                    letter-spacing: 4px;
-                }}
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <div class="logo">🎓</div>
-                <h1>ScholarScanner</h1>
-                <p>Email Verification Required</p>
-            </div>
-            
-            <div class="content">
-                <h2>Welcome to ScholarScanner!</h2>
-                <p>Thank you for joining our community! To complete your registration and start exploring amazing scholarship opportunities, please verify your email address.</p>
-                
-                <div class="otp-container">
-                    <div class="otp-label">Your verification code is:</div>
-                    <div class="otp-code">{otp_code}</div>
-                    <div class="otp-expiry">⏰ This code expires in 10 minutes</div>
-                </div>
-                
-                <p>Enter this 6-digit code on the verification page to activate your account and unlock access to thousands of scholarship opportunities.</p>
-                
-                <div class="security-note">
-                    <strong>🔒 Security Notice:</strong> This is an automated security email. If you didn't request this verification, please ignore this email and do not share this code with anyone.
-                </div>
-                
-                <p>Need help? Contact our support team at support@scholarshipportal.com</p>
-            </div>
-            
-            <div class="footer">
-                <p><strong>ScholarScanner</strong></p>
-                <p>Making education accessible for everyone</p>
-                <p>© 2025 ScholarScanner. All rights reserved.</p>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
-
-
-def get_otp_plain_template(otp_code):
-    """Get plain text template for OTP email"""
-    return f"""
-🎓 SCHOLARSHIP PORTAL - Email Verification
-
-Welcome to ScholarScanner!
-
-Thank you for joining our community! To complete your registration and start exploring scholarship opportunities, please verify your email address.
-
-Your verification code is: {otp_code}
-
-⏰ This code expires in 10 minutes.
-
-Enter this 6-digit code on the verification page to activate your account.
-
-🔒 Security Notice: If you didn't request this verification, please ignore this email and do not share this code with anyone.
-
-Need help? Contact us at support@scholarshipportal.com
-
-Best regards,
-ScholarScanner Team
-
----
-© 2025 ScholarScanner. All rights reserved.
-    """
-
-
 def send_otp_email(email, otp_code):
     """Send OTP verification email to user (fallback method using Django's email backend)"""
     
     subject = 'Verify your email - ScholarScanner'
     
-    # Create HTML email content
-    html_message = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="utf-8">
-        <title>Email Verification - ScholarScanner</title>
-        <style>
-            body {{
-                font-family: Arial, sans-serif;
-                line-height: 1.6;
-                color: #333;
-                max-width: 600px;
-                margin: 0 auto;
-                padding: 20px;
-            }}
-            .header {{
-                background-color: #2563eb;
-                color: white;
-                padding: 20px;
-                text-align: center;
-                border-radius: 8px 8px 0 0;
-            }}
-            .content {{
-                background-color: #f8fafc;
-                padding: 30px;
-                border-radius: 0 0 8px 8px;
-                border: 1px solid #e2e8f0;
-            }}
-            .otp-box {{
-                background-color: #fff;
-                border: 2px solid #2563eb;
-                border-radius: 8px;
-                padding: 20px;
-                text-align: center;
-                margin: 20px 0;
-            }}
-            .otp-code {{
-                font-size: 32px;
-                font-weight: bold;
-                color: #2563eb;
-                letter-spacing: 8px;
-                margin: 10px 0;
-            }}
-            .footer {{
-                text-align: center;
-                margin-top: 20px;
-                color: #64748b;
-                font-size: 14px;
-            }}
-            .warning {{
-                background-color: #fef3c7;
-                border-left: 4px solid #f59e0b;
-                padding: 15px;
-                margin: 20px 0;
-                border-radius: 4px;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <h1>🎓 ScholarScanner</h1>
-            <p>Email Verification Required</p>
-        </div>
-        
-        <div class="content">
-            <h2>Welcome to ScholarScanner!</h2>
-            <p>Thank you for registering with us. To complete your account setup, please verify your email address using the OTP code below:</p>
-            
-            <div class="otp-box">
-                <p>Your verification code is:</p>
-                <div class="otp-code">{otp_code}</div>
-                <p style="margin: 0; color: #64748b; font-size: 14px;">This code expires in 10 minutes</p>
-            </div>
-            
-            <p>Enter this code on the verification page to activate your account and start exploring scholarship opportunities.</p>
-            
-            <div class="warning">
-                <strong>Security Note:</strong> If you didn't request this verification, please ignore this email. Never share this code with anyone.
-            </div>
-        </div>
-        
-        <div class="footer">
-            <p>This is an automated message from ScholarScanner.</p>
-            <p>© 2025 ScholarScanner. All rights reserved.</p>
-        </div>
-    </body>
-    </html>
-    """
-    
-    # Create plain text version
-    plain_message = f"""
-    Welcome to ScholarScanner!
-    
-    Thank you for registering with us. To complete your account setup, please verify your email address.
-    
-    Your verification code is: {otp_code}
-    
-    This code expires in 10 minutes. Enter this code on the verification page to activate your account.
-    
-    If you didn't request this verification, please ignore this email.
-    
-    Best regards,
-    ScholarScanner Team
-    """
+    html_message, plain_message = render_email('otp', otp_code=otp_code)
     
     try:
-        send_mail(
-            subject=subject,
-            message=plain_message,
+        send_email(
+            subject,
+            plain_message,
+            html_message,
+            email,
             from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[email],
-            html_message=html_message,
-            fail_silently=False,
         )
         return True
     except Exception as e:
@@ -419,21 +130,12 @@ def send_welcome_email_aws_ses(email, full_name):
         return send_welcome_email_django(email, full_name)
     
     try:
-        # Create SES client
-        ses_client = boto3.client(
-            'ses',
-            aws_access_key_id=aws_access_key,
-            aws_secret_access_key=aws_secret_key,
-            region_name=aws_region
-        )
+        # Reuse the process-wide SES client
+        ses_client = get_ses_client(aws_access_key, aws_secret_key, aws_region)
         
         from_email = getattr(settings, 'AWS_SES_FROM_EMAIL', 'noreply@scholarshipportal.com')
         
-        # HTML content
-        html_content = get_welcome_html_template(full_name)
-        
-        # Plain text content
-        plain_content = get_welcome_plain_template(full_name)
+        html_content, plain_content = render_email('welcome', name=full_name or 'there')
         
         # Send email
         response = ses_client.send_email(
@@ -477,176 +179,6 @@ def send_welcome_email_aws_ses(email, full_name):
         return send_welcome_email_django(email, full_name)
 
 
-def get_welcome_html_template(full_name):
-    """Get HTML template for welcome email"""
-    return f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="utf-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Welcome to ScholarScanner</title>
-        <style>
-            body {{
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                line-height: 1.6;
-                color: #333;
-                max-width: 600px;
-                margin: 0 auto;
-                padding: 20px;
-                background-color: #f7fafc;
-            }}
-            .container {{
-                background-color: #ffffff;
-                border-radius: 12px;
-                overflow: hidden;
-                box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-            }}
-            .header {{
-                background: linear-gradient(135deg, #48bb78 0%, #38a169 100%);
-                color: white;
-                padding: 40px 20px;
-                text-align: center;
-            }}
-            .header h1 {{
-                margin: 0;
-                font-size: 28px;
-                font-weight: 700;
-            }}
-            .content {{
-                padding: 40px;
-            }}
-            .welcome-message {{
-                font-size: 18px;
-                color: #2d3748;
-                margin-bottom: 20px;
-            }}
-            .feature-list {{
-                background-color: #f7fafc;
-                border-radius: 8px;
-                padding: 20px;
-                margin: 20px 0;
-            }}
-            .feature-item {{
-                display: flex;
-                align-items: center;
-                margin: 10px 0;
-                color: #4a5568;
-            }}
-            .feature-icon {{
-                margin-right: 10px;
-                font-size: 16px;
-            }}
-            .cta-button {{
-                display: inline-block;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                padding: 15px 30px;
-                text-decoration: none;
-                border-radius: 8px;
-                font-weight: 600;
-                margin: 20px 0;
-                text-align: center;
-            }}
-            .footer {{
-                background-color: #f7fafc;
-                padding: 30px;
-                text-align: center;
-                color: #718096;
-                font-size: 14px;
-                border-top: 1px solid #e2e8f0;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <div style="font-size: 36px; margin-bottom: 10px;">🎓</div>
-                <h1>Welcome to ScholarScanner!</h1>
-                <p>Your journey to educational excellence begins here</p>
-            </div>
-            
-            <div class="content">
-                <div class="welcome-message">
-                    <strong>Hi {full_name or 'there'}!</strong>
-                </div>
-                
-                <p>Congratulations! Your account has been successfully created and verified. You're now part of a community dedicated to making education accessible for everyone.</p>
-                
-                <div class="feature-list">
-                    <h3 style="margin-top: 0; color: #2d3748;">What you can do now:</h3>
-                    <div class="feature-item">
-                        <span class="feature-icon">🔍</span>
-                        <span>Search and discover thousands of scholarship opportunities</span>
-                    </div>
-                    <div class="feature-item">
-                        <span class="feature-icon">❤️</span>
-                        <span>Save scholarships that match your interests</span>
-                    </div>
-                    <div class="feature-item">
-                        <span class="feature-icon">📝</span>
-                        <span>Apply for scholarships directly through our platform</span>
-                    </div>
-                    <div class="feature-item">
-                        <span class="feature-icon">👤</span>
-                        <span>Complete your profile for personalized recommendations</span>
-                    </div>                    <div class="feature-item">
-                        <span class="feature-icon">📊</span>
-                        <span>Track your application progress</span>
-                    </div>
-                </div>
-                
-                <div style="text-align: center;">
-                    <a href="{settings.FRONTEND_URL}/scholarships/search" class="cta-button">
-                        🚀 Start Exploring Scholarships
-                    </a>
-                </div>
-                
-                <p>If you have any questions or need assistance, our support team is here to help at <a href="mailto:support@scholarshipportal.com">support@scholarshipportal.com</a>.</p>
-                
-                <p>Best of luck with your scholarship journey!</p>
-            </div>
-            
-            <div class="footer">
-                <p><strong>ScholarScanner</strong></p>
-                <p>Making education accessible for everyone</p>
-                <p>© 2025 ScholarScanner. All rights reserved.</p>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
-
-
-def get_welcome_plain_template(full_name):
-    """Get plain text template for welcome email"""
-    return f"""
-🎓 WELCOME TO SCHOLARSHIP PORTAL!
-
-Hi {full_name or 'there'}!
-
-Congratulations! Your account has been successfully created and verified. You're now part of a community dedicated to making education accessible for everyone.
-
-What you can do now:
-🔍 Search and discover thousands of scholarship opportunities
-❤️ Save scholarships that match your interests  
-📝 Apply for scholarships directly through our platform
-👤 Complete your profile for personalized recommendations
-📊 Track your application progress
-
-Start exploring scholarships: {settings.FRONTEND_URL}/scholarships/search
-
-If you have any questions or need assistance, our support team is here to help at support@scholarshipportal.com.
-
-Best of luck with your scholarship journey!
-
-ScholarScanner Team
-
----
-© 2025 ScholarScanner. All rights reserved.
-    """
-
-
 def send_welcome_email_django(user_or_email, full_name=None):
     """Send welcome email using Django's email backend (fallback method)"""
     
@@ -662,135 +194,15 @@ def send_welcome_email_django(user_or_email, full_name=None):
     
     subject = 'Welcome to ScholarScanner! 🎓'
     
-    # Create HTML email content
-    html_message = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="utf-8">
-        <title>Welcome to ScholarScanner</title>
-        <style>
-            body {{
-                font-family: Arial, sans-serif;
-                line-height: 1.6;
-                color: #333;
-                max-width: 600px;
-                margin: 0 auto;
-                padding: 20px;
-            }}
-            .header {{
-                background-color: #48bb78;
-                color: white;
-                padding: 20px;
-                text-align: center;
-                border-radius: 8px 8px 0 0;
-            }}
-            .content {{
-                background-color: #f8fafc;
-                padding: 30px;
-                border-radius: 0 0 8px 8px;
-                border: 1px solid #e2e8f0;
-            }}
-            .feature-list {{
-                background-color: #fff;
-                border-radius: 8px;
-                padding: 20px;
-                margin: 20px 0;
-            }}
-            .feature-item {{
-                margin: 10px 0;
-                color: #4a5568;
-            }}
-            .cta-button {{
-                display: inline-block;
-                background-color: #667eea;
-                color: white;
-                padding: 15px 30px;
-                text-decoration: none;
-                border-radius: 8px;
-                font-weight: 600;
-                margin: 20px 0;
-            }}
-            .footer {{
-                text-align: center;
-                margin-top: 20px;
-                color: #64748b;
-                font-size: 14px;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <h1>🎓 Welcome to ScholarScanner!</h1>
-            <p>Your journey to educational excellence begins here</p>
-        </div>
-        
-        <div class="content">
-            <h2>Hi {name}!</h2>
-            
-            <p>Congratulations! Your account has been successfully created and verified. You're now part of a community dedicated to making education accessible for everyone.</p>
-            
-            <div class="feature-list">
-                <h3>What you can do now:</h3>
-                <div class="feature-item">🔍 Search and discover thousands of scholarship opportunities</div>
-                <div class="feature-item">❤️ Save scholarships that match your interests</div>
-                <div class="feature-item">📝 Apply for scholarships directly through our platform</div>
-                <div class="feature-item">👤 Complete your profile for personalized recommendations</div>
-                <div class="feature-item">📊 Track your application progress</div>
-            </div>
-            
-            <div style="text-align: center;">
-                <a href="http://localhost:3000/scholarships/search" class="cta-button">
-                    🚀 Start Exploring Scholarships
-                </a>
-            </div>
-            
-            <p>If you have any questions or need assistance, our support team is here to help at <a href="mailto:support@scholarshipportal.com">support@scholarshipportal.com</a>.</p>
-            
-            <p>Best of luck with your scholarship journey!</p>
-        </div>
-        
-        <div class="footer">
-            <p><strong>ScholarScanner</strong></p>
-            <p>Making education accessible for everyone</p>
-            <p>© 2025 ScholarScanner. All rights reserved.</p>
-        </div>
-    </body>
-    </html>
-    """
-    
-    # Create plain text version
-    plain_message = f"""
-    Welcome to ScholarScanner!
-    
-    Hi {name}!
-    
-    Congratulations! Your account has been successfully created and verified. You're now part of a community dedicated to making education accessible for everyone.
-    
-    What you can do now:
-    🔍 Search and discover thousands of scholarship opportunities
-    ❤️ Save scholarships that match your interests  
-    📝 Apply for scholarships directly through our platform
-    👤 Complete your profile for personalized recommendations
-    📊 Track your application progress
-    
-    Start exploring scholarships: http://localhost:3000/scholarships/search
-    
-    If you have any questions or need assistance, our support team is here to help at support@scholarshipportal.com.
-    
-    Best of luck with your scholarship journey!
-    
-    ScholarScanner Team
-    """
+    html_message, plain_message = render_email('welcome', name=name)
     
     try:
-        send_mail(
-            subject=subject,
-            message=plain_message,
+        send_email(
+            subject,
+            plain_message,
+            html_message,
+            email,
             from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[email],
-            html_message=html_message,
-            fail_silently=False,
         )
         return True
     except Exception as e:
@@ -826,21 +238,12 @@ def send_password_reset_email_aws_ses(email, otp_code):
         return send_password_reset_email(email, otp_code)
     
     try:
-        # Create SES client
-        ses_client = boto3.client(
-            'ses',
-            aws_access_key_id=aws_access_key,
-            aws_secret_access_key=aws_secret_key,
-            region_name=aws_region
-        )
+        # Reuse the process-wide SES client
+        ses_client = get_ses_client(aws_access_key, aws_secret_key, aws_region)
         
         from_email = getattr(settings, 'AWS_SES_FROM_EMAIL', 'noreply@scholarscanner.com')
         
-        # HTML content
-        html_content = get_password_reset_html_template(otp_code)
-        
-        # Plain text content
-        plain_content = get_password_reset_plain_template(otp_code)
+        html_content, plain_content = render_email('password_reset', otp_code=otp_code)
         
         # Send email
         response = ses_client.send_email(
@@ -872,18 +275,16 @@ def send_password_reset_email(email, otp_code):
     
     try:
         subject = '🔐 Password Reset - ScholarScanner'
-        html_message = get_password_reset_html_template(otp_code)
-        plain_message = get_password_reset_plain_template(otp_code)
+        html_message, plain_message = render_email('password_reset', otp_code=otp_code)
         from_email = getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@scholarshipportal.com')
         
         # Send email
-        send_mail(
-            subject=subject,
-            message=plain_message,
+        send_email(
+            subject,
+            plain_message,
+            html_message,
+            email,
             from_email=from_email,
-            recipient_list=[email],
-            html_message=html_message,
-            fail_silently=False,
         )
         
         logger.info(f"Password reset email sent successfully via Django backend to {email}")
@@ -894,151 +295,27 @@ def send_password_reset_email(email, otp_code):
         return False
 
 
-def get_password_reset_html_template(otp_code):
-    """Generate HTML template for password reset email"""
-    return f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Password Reset - ScholarScanner</title>
-        <style>
-            body {{
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                line-height: 1.6;
-                color: #333;
-                max-width: 600px;
-                margin: 0 auto;
-                padding: 20px;
-                background-color: #f8fafc;
-            }}
-            .container {{
-                background-color: #ffffff;
-                border-radius: 12px;
-                padding: 40px;
-                box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-                border: 1px solid #e2e8f0;
-            }}
-            .header {{
-                text-align: center;
-                margin-bottom: 30px;
-                padding-bottom: 20px;
-                border-bottom: 3px solid #2563eb;
-            }}
-            .header h1 {{
-                color: #2563eb;
-                margin: 0 0 10px 0;
-                font-size: 28px;
-                font-weight: bold;
-            }}
-            .header p {{
-                color: #64748b;
-                margin: 0;
-                font-size: 16px;
-            }}
-            .content {{
-                margin-bottom: 30px;
-            }}
-            .content h2 {{
-                color: #1e293b;
-                margin-bottom: 20px;
-                font-size: 24px;
-            }}
-            .content p {{
-                margin-bottom: 15px;
-                font-size: 16px;
-                color: #475569;
-            }}
-            .otp-box {{
-                background-color: #fff;
-                border: 2px solid #dc2626;
-                border-radius: 8px;
-                padding: 20px;
-                text-align: center;
-                margin: 20px 0;
-            }}
-            .otp-code {{
-                font-size: 32px;
-                font-weight: bold;
-                color: #dc2626;
-                letter-spacing: 8px;
-                margin: 10px 0;
-            }}
-            .footer {{
-                text-align: center;
-                margin-top: 20px;
-                color: #64748b;
-                font-size: 14px;
-            }}
-            .warning {{
-                background-color: #fef3c7;
-                border-left: 4px solid #f59e0b;
-                padding: 15px;
-                margin: 20px 0;
-                border-radius: 4px;
-            }}
-            .warning p {{
-                margin: 0;
-                color: #92400e;
-                font-weight: 500;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>🔐 ScholarScanner</h1>
-                <p>Password Reset Request</p>
-            </div>
-            
-            <div class="content">
-                <h2>Reset Your Password</h2>
-                <p>We received a request to reset your password. If you did not request this, please ignore this email.</p>
-                
-                <div class="otp-box">
-                    <p>Your password reset code is:</p>
-                    <div class="otp-code">{otp_code}</div>
-                    <p style="margin: 0; color: #64748b; font-size: 14px;">This code expires in 10 minutes</p>
-                </div>
-                
-                <p>Enter this code on the password reset page to create a new password for your account.</p>
-                
-                <div class="warning">
-                    <p>⚠️ If you did not request this password reset, please secure your account immediately by changing your password.</p>
-                </div>
-            </div>
-            
-            <div class="footer">
-                <p>This email was sent from ScholarScanner.</p>
-                <p>If you have questions, please contact our support team.</p>
-            </div>
-        </div>
-    </body>
-    </html>
+def build_deadline_digest(email, full_name, reminders):
     """
-
-
-def get_password_reset_plain_template(otp_code):
-    """Generate plain text template for password reset email"""
-    return f"""
-🔐 SCHOLARSHIP PORTAL - PASSWORD RESET
-
-Reset Your Password
-
-We received a request to reset your password. If you did not request this, please ignore this email.
-
-Your password reset code is: {otp_code}
-
-This code expires in 10 minutes.
-
-Enter this code on the password reset page to create a new password for your account.
-
-⚠️ IMPORTANT: If you did not request this password reset, please secure your account immediately by changing your password.
-
-This email was sent from ScholarScanner.
-If you have questions, please contact our support team.
+    Build the digest email for saved scholarships whose deadline is close.
+    ``reminders`` are dicts with title, slug, provider, deadline and days_left.
     """
+    items = [render_email('deadline_item', **reminder) for reminder in reminders]
+    if len(reminders) == 1:
+        subject = f"⏰ Deadline approaching: {reminders[0]['title']}"
+        summary = 'A scholarship you saved closes soon.'
+    else:
+        subject = f"⏰ {len(reminders)} saved scholarships close soon"
+        summary = f'{len(reminders)} scholarships you saved close soon.'
+    html_message, plain_message = render_email(
+        'deadline_digest',
+        name=full_name or 'there',
+        summary=summary,
+        reminders=(''.join(html for html, _ in items), '\n\n'.join(text.strip() for _, text in items)),
+    )
+    message = EmailMultiAlternatives(subject, plain_message, settings.DEFAULT_FROM_EMAIL, [email])
+    message.attach_alternative(html_message, 'text/html')
+    return message
 
 
 # Alias for backward compatibility and ease of use
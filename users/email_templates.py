@@ -0,0 +1,257 @@
+"""
+Transactional email templates.
+
+Each template in users/templates/emails is compiled once per process: the
+rules of its <style> block are inlined into style attributes (many mail
+clients drop <style>), a plain-text alternative is derived from the same
+markup, and both are split into static chunks around their ``${field}``
+placeholders. Rendering an email then only joins those chunks with the
+escaped field values.
+"""
+import html
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from html.parser import HTMLParser
+from pathlib import Path
+
+from django.conf import settings
+
+TEMPLATE_DIR = Path(__file__).resolve().parent / 'templates' / 'emails'
+
+PLACEHOLDER = re.compile(r'\$\{(\w+)\}')
+
+VOID_TAGS = {'area', 'base', 'br', 'col', 'hr', 'img', 'input', 'link', 'meta', 'source', 'wbr'}
+BLOCK_TAGS = {'div', 'p', 'h1', 'h2', 'h3', 'h4', 'li', 'tr', 'table', 'br', 'hr'}
+
+
+def parse_css(css):
+    """
+    Split a stylesheet into inlinable rules and the at-rules that must stay
+    in a <style> block. Rules are (specificity, order, selector parts, declarations).
+    """
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    rules, kept = [], []
+    position = 0
+    while True:
+        start = css.find('{', position)
+        if start == -1:
+            break
+        prelude = css[position:start].strip()
+        if prelude.startswith('@'):
+            # Media queries keep their nested braces and are left to the client
+            depth, end = 1, start + 1
+            while depth:
+                depth += {'{': 1, '}': -1}.get(css[end], 0)
+                end += 1
+            kept.append(f'{prelude} {css[start:end]}')
+            position = end
+            continue
+        end = css.index('}', start)
+        declarations = '; '.join(
+            ' '.join(part.split()) for part in css[start + 1:end].split(';') if part.strip()
+        )
+        for selector in prelude.split(','):
+            parts = [_parse_compound(token) for token in selector.split()]
+            specificity = (sum(len(c) for _, c in parts), sum(1 for t, _ in parts if t))
+            rules.append((specificity, len(rules), parts, declarations))
+        position = end + 1
+    rules.sort(key=lambda rule: rule[:2])
+    return rules, kept
+
+
+def _parse_compound(token):
+    tag, *classes = token.split('.')
+    return tag.lower(), frozenset(classes)
+
+
+def _matches(compound, element):
+    tag, classes = compound
+    return (not tag or tag == element[0]) and classes <= element[1]
+
+
+def _selector_matches(parts, stack):
+    """Descendant selectors only: the last part is the element, the rest its ancestors in order"""
+    if not _matches(parts[-1], stack[-1]):
+        return False
+    remaining = parts[:-1]
+    for ancestor in reversed(stack[:-1]):
+        if not remaining:
+            break
+        if _matches(remaining[-1], ancestor):
+            remaining = remaining[:-1]
+    return not remaining
+
+
+def _escape_attribute(value):
+    # Only what a double-quoted attribute needs, so font names keep their quotes
+    return html.escape(value, quote=False).replace('"', '&quot;')
+
+
+class _CSSInliner(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.out = []
+        self.stack = []
+        self.rules = []
+        self.kept = []
+        self.in_style = False
+
+    def handle_decl(self, decl):
+        self.out.append(f'<!{decl}>')
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'style':
+            self.in_style = True
+            return
+        attrs = dict(attrs)
+        element = (tag, frozenset((attrs.get('class') or '').split()))
+        stack = self.stack + [element]
+        declarations = [d for _, _, parts, d in self.rules if _selector_matches(parts, stack)]
+        if attrs.get('style'):
+            # Inline styles already in the markup win over the stylesheet
+            declarations.append(attrs['style'].strip().rstrip(';'))
+        if declarations:
+            attrs['style'] = '; '.join(declarations)
+        rendered = ''.join(
+            f' {name}' if value is None else f' {name}="{_escape_attribute(value)}"'
+            for name, value in attrs.items()
+        )
+        self.out.append(f'<{tag}{rendered}>')
+        if tag not in VOID_TAGS:
+            self.stack.append(element)
+
+    def handle_endtag(self, tag):
+        if tag == 'style':
+            self.in_style = False
+            if self.kept:
+                self.out.append(f'<style>{" ".join(self.kept)}</style>')
+            return
+        if tag in VOID_TAGS:
+            return
+        if self.stack and self.stack[-1][0] == tag:
+            self.stack.pop()
+        self.out.append(f'</{tag}>')
+
+    def handle_data(self, data):
+        if self.in_style:
+            self.rules, self.kept = parse_css(data)
+        else:
+            self.out.append(data)
+
+    def handle_entityref(self, name):
+        self.out.append(f'&{name};')
+
+    def handle_charref(self, name):
+        self.out.append(f'&#{name};')
+
+    def handle_comment(self, data):
+        pass
+
+
+class _TextExtractor(HTMLParser):
+    """Plain-text rendering of the body: one line per block, links followed by their URL"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.lines = ['']
+        self.skip = 0
+        self.links = []
+
+    def newline(self, blank=False):
+        if self.lines[-1].strip():
+            self.lines.append('')
+        if blank and len(self.lines) > 1 and self.lines[-2].strip():
+            self.lines.append('')
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ('head', 'style', 'title'):
+            self.skip += 1
+        elif tag in BLOCK_TAGS:
+            self.newline(blank=tag in ('p', 'h1', 'h2', 'h3'))
+        elif tag == 'a':
+            self.links.append(dict(attrs).get('href', ''))
+
+    def handle_endtag(self, tag):
+        if tag in ('head', 'style', 'title'):
+            self.skip -= 1
+        elif tag in BLOCK_TAGS:
+            self.newline(blank=tag in ('p', 'h1', 'h2', 'h3'))
+        elif tag == 'a' and self.links:
+            href = self.links.pop()
+            if href.startswith('mailto:'):
+                return
+            if href and href not in self.lines[-1]:
+                self.lines[-1] = f'{self.lines[-1].rstrip()}: {href}'
+
+    def handle_data(self, data):
+        # Whitespace is collapsed per line at the end, so inline text keeps its spacing
+        if not self.skip:
+            self.lines[-1] += data
+
+    def text(self):
+        lines = [' '.join(line.split()) for line in self.lines]
+        return re.sub(r'\n{3,}', '\n\n', '\n'.join(lines)).strip() + '\n'
+
+
+def _split(source):
+    """Static chunks with a placeholder wherever a field goes, and the (slot, field) pairs to fill"""
+    parts = PLACEHOLDER.split(source)
+    slots = tuple((index, parts[index]) for index in range(1, len(parts), 2))
+    return tuple(parts), slots
+
+
+def _fill(compiled, values):
+    parts, slots = compiled
+    out = list(parts)
+    for index, field in slots:
+        out[index] = values[field]
+    return ''.join(out)
+
+
+@dataclass(frozen=True)
+class EmailTemplate:
+    name: str
+    html: tuple
+    text: tuple
+    fields: frozenset
+
+    @classmethod
+    def compile(cls, name, source):
+        inliner = _CSSInliner()
+        inliner.feed(source)
+        inliner.close()
+        extractor = _TextExtractor()
+        extractor.feed(source)
+        extractor.close()
+        html_parts, text_parts = _split(''.join(inliner.out)), _split(extractor.text())
+        fields = frozenset(field for _, field in html_parts[1] + text_parts[1])
+        return cls(name, html_parts, text_parts, fields)
+
+    def render(self, /, **context):
+        """Return (html, text) with the fields filled in; plain values are escaped for the HTML part"""
+        missing = self.fields - context.keys()
+        if missing:
+            raise KeyError(f'Email template {self.name!r} needs {", ".join(sorted(missing))}')
+        escaped, values = {}, {}
+        for field in self.fields:
+            value = context[field]
+            if isinstance(value, tuple):
+                # An (html, text) pair rendered by another template goes in as-is
+                escaped[field], values[field] = value
+            else:
+                values[field] = str(value)
+                escaped[field] = html.escape(values[field])
+        return _fill(self.html, escaped), _fill(self.text, values)
+
+
+@lru_cache(maxsize=None)
+def get_template(name):
+    """Load and compile users/templates/emails/<name>.html once per process"""
+    return EmailTemplate.compile(name, (TEMPLATE_DIR / f'{name}.html').read_text(encoding='utf-8'))
+
+
+def render_email(template_name, /, **context):
+    """Render a template to (html, text); ``frontend_url`` defaults to settings.FRONTEND_URL"""
+    context.setdefault('frontend_url', getattr(settings, 'FRONTEND_URL', ''))
+    return get_template(template_name).render(**context)
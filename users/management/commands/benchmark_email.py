@@ -0,0 +1,106 @@
+import statistics
+import time
+
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from users.email_connections import AWS_SES_AVAILABLE, SMTPConnectionPool, _ses_client, get_ses_client
+from users.smtp_stub import StubSMTPServer
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare per-message email latency of a new connection per send against the '
+        'pooled and batched connections, using a local SMTP stand-in'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=200)
+        parser.add_argument(
+            '--latency', type=float, default=2.0,
+            help='Milliseconds the stub server waits before each reply, to mimic a network round trip',
+        )
+        parser.add_argument('--batch-size', type=int, default=50)
+
+    def handle(self, *args, **options):
+        count = options['messages']
+        with StubSMTPServer(latency=options['latency'] / 1000) as smtp:
+            with override_settings(
+                EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+                EMAIL_HOST=smtp.host, EMAIL_PORT=smtp.port,
+                EMAIL_USE_TLS=False, EMAIL_USE_SSL=False,
+                EMAIL_HOST_USER='', EMAIL_HOST_PASSWORD='',
+            ):
+                self.report('connection per message', self.per_message(count), smtp)
+                self.report('pooled connection', self.pooled(count), smtp)
+                self.report('pooled, batched', self.batched(count, options['batch_size']), smtp)
+
+        if AWS_SES_AVAILABLE:
+            self.stdout.write('')
+            self.report('boto3.client per send', self.ses_clients(count, cached=False))
+            self.report('cached SES client', self.ses_clients(count, cached=True))
+
+    @staticmethod
+    def message(i):
+        message = EmailMultiAlternatives(
+            f'Benchmark {i}', 'Your code is 123456', 'bench@example.com', [f'user{i}@example.com']
+        )
+        message.attach_alternative('<p>Your code is <b>123456</b></p>', 'text/html')
+        return message
+
+    def per_message(self, count):
+        """The old behaviour: every send opens, authenticates and closes its own connection"""
+        timings = []
+        for i in range(count):
+            start = time.perf_counter()
+            get_connection().send_messages([self.message(i)])
+            timings.append(time.perf_counter() - start)
+        return timings
+
+    def pooled(self, count):
+        pool = SMTPConnectionPool()
+        timings = []
+        for i in range(count):
+            start = time.perf_counter()
+            pool.send_messages([self.message(i)])
+            timings.append(time.perf_counter() - start)
+        pool.discard()
+        return timings
+
+    def batched(self, count, batch_size):
+        pool = SMTPConnectionPool()
+        timings = []
+        for offset in range(0, count, batch_size):
+            batch = [self.message(i) for i in range(offset, min(offset + batch_size, count))]
+            start = time.perf_counter()
+            pool.send_messages(batch)
+            # Spread the batch time over its messages
+            timings.extend([(time.perf_counter() - start) / len(batch)] * len(batch))
+        pool.discard()
+        return timings
+
+    def ses_clients(self, count, cached):
+        """Client construction only; nothing is sent to AWS"""
+        _ses_client.cache_clear()
+        timings = []
+        for _ in range(count):
+            start = time.perf_counter()
+            if cached:
+                get_ses_client('benchmark', 'benchmark', 'eu-north-1')
+            else:
+                _ses_client.__wrapped__('benchmark', 'benchmark', 'eu-north-1')
+            timings.append(time.perf_counter() - start)
+        _ses_client.cache_clear()
+        return timings
+
+    def report(self, label, timings, smtp=None):
+        timings = sorted(timings)
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        line = (
+            f'{label:>24}: mean {statistics.mean(timings) * 1000:7.2f} ms | '
+            f'p50 {statistics.median(timings) * 1000:7.2f} ms | p95 {p95 * 1000:7.2f} ms'
+        )
+        if smtp is not None:
+            line += f' | {smtp.connections} connections so far'
+        self.stdout.write(line)
@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Reset rate limiting counters, e.g. after hitting 429 errors during development'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--alias', default=settings.THROTTLE_CACHE_ALIAS,
+            help='Cache alias to clear (default: the throttle cache)',
+        )
+
+    def handle(self, *args, **options):
+        alias = options['alias']
+        cache = caches[alias]
+        removed = self.clear(cache)
+        if removed is None:
+            self.stdout.write(self.style.SUCCESS(f"Cleared the '{alias}' cache"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Removed {removed} keys from the '{alias}' cache"))
+
+    def clear(self, cache):
+        """
+        Clear a single cache alias. Redis aliases share one database and
+        RedisCache.clear() flushes all of it, so only this alias' keys are
+        deleted there; every other backend keeps aliases apart already.
+        """
+        get_client = getattr(getattr(cache, '_cache', None), 'get_client', None)
+        if get_client is None:
+            cache.clear()
+            return None
+
+        client = get_client(write=True)
+        removed = 0
+        batch = []
+        for key in client.scan_iter(match=cache.make_key('*')):
+            batch.append(key)
+            if len(batch) >= 500:
+                removed += client.delete(*batch)
+                batch = []
+        if batch:
+            removed += client.delete(*batch)
+        return removed
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from users.email_queue import EmailQueueWorker
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued OTP, welcome and password reset emails'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=4, help='Parallel sends')
+        parser.add_argument('--batch-size', type=int, default=50, help='Jobs claimed per poll')
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds to wait when the queue is empty')
+        parser.add_argument('--once', action='store_true', help='Exit once no job is due instead of polling')
+
+    def handle(self, *args, **options):
+        worker = EmailQueueWorker(concurrency=options['concurrency'], batch_size=options['batch_size'])
+        totals = [0, 0, 0]
+        try:
+            while True:
+                close_old_connections()
+                counts = worker.run_once()
+                totals = [total + count for total, count in zip(totals, counts)]
+                if any(counts):
+                    if options['verbosity'] > 1:
+                        self.stdout.write('Sent %d, retrying %d, failed %d' % counts)
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            worker.close()
+        self.stdout.write(self.style.SUCCESS('Sent %d, retrying %d, failed %d' % tuple(totals)))
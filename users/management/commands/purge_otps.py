@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from users.otp import purge_expired_otps
+
+
+class Command(BaseCommand):
+    help = 'Delete expired email verification and password reset codes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows deleted per statement')
+        parser.add_argument('--pause', type=float, default=0.0, help='Seconds to sleep between batches')
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_otps(batch_size=options['batch_size'], pause=options['pause'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired OTPs'))
@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from users.deadline_reminders import DEFAULT_WINDOWS, DeadlineReminderMailer
+
+
+class Command(BaseCommand):
+    help = 'Email each user one digest of the saved scholarships whose deadline is coming up'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--windows', default=','.join(str(days) for days in DEFAULT_WINDOWS),
+            help='Comma-separated days before the deadline to remind at (default: %(default)s)',
+        )
+        parser.add_argument('--batch-size', type=int, default=500, help='Users claimed and sent per batch')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Rows fetched per database round trip')
+        parser.add_argument('--dry-run', action='store_true', help='Count the digests without sending or recording them')
+
+    def handle(self, *args, **options):
+        try:
+            windows = [int(days) for days in options['windows'].split(',') if days.strip()]
+        except ValueError:
+            raise CommandError('--windows must be a comma-separated list of day counts')
+        if not windows or min(windows) < 0:
+            raise CommandError('--windows must list at least one non-negative day count')
+
+        mailer = DeadlineReminderMailer(
+            windows=windows,
+            batch_size=options['batch_size'],
+            chunk_size=options['chunk_size'],
+            dry_run=options['dry_run'],
+        )
+        start = time.monotonic()
+        stats = mailer.run()
+        elapsed = time.monotonic() - start
+
+        verb = 'Would send' if options['dry_run'] else 'Sent'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {stats.digests} digests covering {stats.reminders} reminders in {elapsed:.1f}s '
+            f'({stats.failed} failed, {stats.skipped} already claimed by another run)'
+        ))
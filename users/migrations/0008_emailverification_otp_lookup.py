@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-17 00:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_deadlinereminder'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emailverification',
+            index=models.Index(fields=['email', 'verification_type', 'is_used', 'created_at'], name='otp_lookup'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.1 on 2026-10-17 01:10
+
+from django.db import migrations
+
+
+def clear_delivered_payloads(apps, schema_editor):
+    # Sent and failed jobs no longer need their OTP or reset codes
+    OutboundEmail = apps.get_model('users', 'OutboundEmail')
+    OutboundEmail.objects.filter(status__in=['sent', 'failed']).update(payload={})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_emailverification_otp_lookup'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_delivered_payloads, migrations.RunPython.noop),
+    ]
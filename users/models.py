@@ -135,6 +135,10 @@ class EmailVerification(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Every OTP check, consume and regenerate filters on these, newest first
+            models.Index(fields=['email', 'verification_type', 'is_used', 'created_at'], name='otp_lookup'),
+        ]
     
     def __str__(self):
         return f"OTP for {self.email} - {self.otp_code}"
@@ -170,3 +174,65 @@ class EmailVerification(models.Model):
             otp_code=otp_code, 
             verification_type=verification_type
         )
+
+
+class OutboundEmail(models.Model):
+    """Email waiting to be delivered by the process_email_queue worker"""
+
+    KIND_CHOICES = [
+        ('otp', 'Verification OTP'),
+        ('welcome', 'Welcome'),
+        ('password_reset', 'Password Reset'),
+    ]
+
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    to_email = models.EmailField()
+    # Template variables, e.g. {"otp_code": "123456"} or {"full_name": "Ada"};
+    # emptied once the email is sent or has failed for good
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    # Set by the worker that claimed the row, so a batch can be claimed with one UPDATE
+    claim_token = models.CharField(max_length=32, blank=True)
+    last_error = models.TextField(blank=True)
+    provider = models.CharField(max_length=20, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['next_attempt_at']
+        indexes = [
+            # The worker polls for due rows of one status
+            models.Index(fields=['status', 'next_attempt_at'], name='outbound_email_due'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} to {self.to_email} ({self.status})"
+
+
+class DeadlineReminder(models.Model):
+    """Marks a saved scholarship's deadline reminder as sent, so it never goes out twice"""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='deadline_reminders')
+    scholarship = models.ForeignKey('scholarships.Scholarship', on_delete=models.CASCADE, related_name='+')
+    # Days-before-deadline window the reminder was sent for, e.g. 7 or 1
+    window = models.PositiveSmallIntegerField()
+    # Set by the run that claimed the marker; the reminder is sent once sent_at is filled in
+    claim_token = models.CharField(max_length=32, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ('user', 'scholarship', 'window')
+
+    def __str__(self):
+        return f"{self.window}-day reminder for {self.user_id} / {self.scholarship_id}"
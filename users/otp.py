@@ -0,0 +1,234 @@
+"""
+One-time password storage and checks.
+
+Views talk to the module functions below, which delegate to the store named
+by OTP_STORE:
+
+  database - EmailVerification rows. Every lookup filters on the otp_lookup
+             index (email, verification_type, is_used, created_at), and
+             consuming a code is one conditional UPDATE, so of two requests
+             racing with the same code exactly one sees a changed row.
+  cache    - HMAC-hashed codes in the OTP_CACHE_ALIAS cache with the OTP
+             lifetime as their TTL, so nothing needs purging and OTP traffic
+             never reaches the database. Failed attempts are counted per
+             email and burn the code after OTP_MAX_ATTEMPTS. Consuming is the
+             cache's atomic delete.
+"""
+import hashlib
+import hmac
+import secrets
+import string
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from .models import EmailVerification
+
+EMAIL_VERIFICATION = 'email_verification'
+PASSWORD_RESET = 'password_reset'
+
+OTP_VALID = 'valid'
+OTP_EXPIRED = 'expired'
+OTP_INVALID = 'invalid'
+
+
+def otp_lifetime():
+    return timedelta(minutes=getattr(settings, 'OTP_EXPIRE_MINUTES', 10))
+
+
+def expiry_cutoff():
+    """OTPs created before this moment have expired"""
+    return timezone.now() - otp_lifetime()
+
+
+class DatabaseOTPStore:
+    """Codes are EmailVerification rows"""
+
+    def issue(self, email, verification_type):
+        return EmailVerification.generate_otp(email, verification_type).otp_code
+
+    def issued_at(self, email, verification_type):
+        """When the code currently waiting to be used was sent, or None"""
+        return (
+            EmailVerification.objects
+            .filter(email=email, verification_type=verification_type, is_used=False,
+                    created_at__gte=expiry_cutoff())
+            .order_by('-created_at')
+            .values_list('created_at', flat=True)
+            .first()
+        )
+
+    def _unused(self, email, otp_code, verification_type):
+        return EmailVerification.objects.filter(
+            email=email,
+            verification_type=verification_type,
+            is_used=False,
+            otp_code=otp_code,
+            is_verified=False,
+        )
+
+    def check(self, email, otp_code, verification_type):
+        created_at = (
+            self._unused(email, otp_code, verification_type)
+            .order_by('-created_at')
+            .values_list('created_at', flat=True)
+            .first()
+        )
+        if created_at is None:
+            return OTP_INVALID
+        return OTP_VALID if created_at >= expiry_cutoff() else OTP_EXPIRED
+
+    def consume(self, email, otp_code, verification_type):
+        return bool(
+            self._unused(email, otp_code, verification_type)
+            .filter(created_at__gte=expiry_cutoff())
+            .update(is_used=True, is_verified=True)
+        )
+
+    def purge_expired(self, batch_size=1000, pause=0.0):
+        """Delete expired rows a batch at a time, so no single statement holds long locks"""
+        expired = EmailVerification.objects.filter(created_at__lt=expiry_cutoff()).order_by()
+        deleted = 0
+        while True:
+            batch = list(expired.values_list('pk', flat=True)[:batch_size])
+            if not batch:
+                return deleted
+            deleted += EmailVerification.objects.filter(pk__in=batch).delete()[0]
+            if pause:
+                time.sleep(pause)
+
+
+class CacheOTPStore:
+    """
+    Per (type, email) the cache holds a pointer to the current code and the
+    failed-attempt count; the code itself lives under a key derived from its
+    HMAC, so checking it is one lookup and only one consumer can delete it.
+    Codes are not part of the registration transaction: a code consumed by a
+    registration that then fails has to be requested again.
+    """
+
+    def __init__(self, alias=None):
+        self.cache = caches[alias or settings.OTP_CACHE_ALIAS]
+        self.max_attempts = settings.OTP_MAX_ATTEMPTS
+
+    def _digest(self, *parts):
+        message = ':'.join(parts).encode('utf-8')
+        return hmac.new(settings.SECRET_KEY.encode('utf-8'), message, hashlib.sha256).hexdigest()
+
+    def _keys(self, email, verification_type):
+        subject = self._digest('subject', verification_type, email)
+        return f'otp:current:{subject}', f'otp:attempts:{subject}'
+
+    def _code_key(self, email, otp_code, verification_type):
+        return f'otp:code:{self._digest("code", verification_type, email, otp_code)}'
+
+    def issue(self, email, verification_type):
+        length = getattr(settings, 'OTP_LENGTH', 6)
+        otp_code = ''.join(secrets.choice(string.digits) for _ in range(length))
+        current_key, attempts_key = self._keys(email, verification_type)
+        previous = self.cache.get(current_key)
+        if previous:
+            self.cache.delete(previous['code_key'])
+
+        ttl = int(otp_lifetime().total_seconds())
+        code_key = self._code_key(email, otp_code, verification_type)
+        created_at = time.time()
+        self.cache.set(code_key, created_at, ttl)
+        # The pointer outlives the code so an expired code can be told apart from a wrong one
+        self.cache.set(current_key, {'code_key': code_key, 'created_at': created_at}, ttl * 2)
+        self.cache.delete(attempts_key)
+        return otp_code
+
+    def issued_at(self, email, verification_type):
+        current = self.cache.get(self._keys(email, verification_type)[0])
+        if not current:
+            return None
+        created_at = self.cache.get(current['code_key'])
+        if created_at is None:
+            return None
+        return datetime.fromtimestamp(created_at, tz=dt_timezone.utc)
+
+    def _failed(self, email, verification_type):
+        """Count a wrong guess; too many of them burn the current code"""
+        current_key, attempts_key = self._keys(email, verification_type)
+        self.cache.add(attempts_key, 0, int(otp_lifetime().total_seconds()))
+        try:
+            attempts = self.cache.incr(attempts_key)
+        except ValueError:
+            # Expired between add() and incr()
+            return
+        if attempts >= self.max_attempts:
+            current = self.cache.get(current_key)
+            if current:
+                self.cache.delete(current['code_key'])
+
+    def _locked(self, email, verification_type):
+        return (self.cache.get(self._keys(email, verification_type)[1]) or 0) >= self.max_attempts
+
+    def check(self, email, otp_code, verification_type):
+        if self._locked(email, verification_type):
+            return OTP_INVALID
+        code_key = self._code_key(email, otp_code, verification_type)
+        if self.cache.get(code_key) is not None:
+            return OTP_VALID
+        current = self.cache.get(self._keys(email, verification_type)[0])
+        if current and current['code_key'] == code_key:
+            # The right code, but its entry has run out
+            return OTP_EXPIRED
+        self._failed(email, verification_type)
+        return OTP_INVALID
+
+    def consume(self, email, otp_code, verification_type):
+        if self._locked(email, verification_type):
+            return False
+        if self.cache.delete(self._code_key(email, otp_code, verification_type)):
+            # A used code reads as invalid from now on, not as expired
+            self.cache.delete(self._keys(email, verification_type)[0])
+            return True
+        self._failed(email, verification_type)
+        return False
+
+    def purge_expired(self, batch_size=1000, pause=0.0):
+        # Entries expire on their own
+        return 0
+
+
+OTP_STORES = {
+    'database': DatabaseOTPStore,
+    'cache': CacheOTPStore,
+}
+
+
+def get_otp_store():
+    name = getattr(settings, 'OTP_STORE', 'database')
+    try:
+        return OTP_STORES[name]()
+    except KeyError:
+        raise ValueError(f'Unknown OTP_STORE {name!r}')
+
+
+def issue_otp(email, verification_type=EMAIL_VERIFICATION):
+    """Create a new code for ``email``, replacing any earlier one of the same type"""
+    return get_otp_store().issue(email, verification_type)
+
+
+def otp_issued_at(email, verification_type=EMAIL_VERIFICATION):
+    """When the code still waiting to be used was created, or None"""
+    return get_otp_store().issued_at(email, verification_type)
+
+
+def check_otp(email, otp_code, verification_type=EMAIL_VERIFICATION):
+    """Whether the code is OTP_VALID, OTP_EXPIRED or OTP_INVALID, without using it up"""
+    return get_otp_store().check(email, otp_code, verification_type)
+
+
+def consume_otp(email, otp_code, verification_type=EMAIL_VERIFICATION):
+    """Mark a valid, unexpired code as used; returns False when there was none to use"""
+    return get_otp_store().consume(email, otp_code, verification_type)
+
+
+def purge_expired_otps(batch_size=1000, pause=0.0):
+    return get_otp_store().purge_expired(batch_size=batch_size, pause=pause)
@@ -0,0 +1,263 @@
+"""
+Scholarship recommendations from a user's profile and history.
+
+Every scholarship is a row of a sparse 0/1 feature matrix over taxonomy ids
+(country plus each many-to-many taxonomy), stored by column: for each
+(field, taxonomy id) the rows that carry it. The matrix is built once per
+scholarship generation, shared between workers through the responses cache
+and kept in process memory, reused for up to RECOMMENDATION_MATRIX_MAX_AGE
+seconds after a write changed the generation.
+
+A user's weights are the taxonomy distribution of their saved (x1) and
+applied (x2) scholarships, normalized per field and scaled by FIELD_WEIGHTS,
+plus a boost for the levels that follow their UserProfile.education. A
+scholarship scores the sum of the weights of its features plus a bonus that
+grows as its deadline gets closer. Only open scholarships sharing a feature
+with the user are ranked; users without any signal get the ones closing
+soonest. Scoring adds each weighted column into a score vector with NumPy
+(listed in requirements.txt); the pure Python fallback only exists for
+environments without it and is about a hundred times slower at 100k rows.
+
+Results are cached per user for the day and dropped by signals.py when the
+user's profile, saved scholarships or applications change.
+"""
+import heapq
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db import transaction
+from django.utils import timezone
+from django.utils.connection import ConnectionProxy
+
+from scholarships.models import Level, Scholarship, SCHOLARSHIP_M2M_FIELDS
+from scholarships.response_cache import get_generation
+
+from .models import ScholarshipApplication, UserProfile
+from .saved_ids import get_saved_ids
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+shared_cache = ConnectionProxy(caches, settings.RESPONSE_CACHE_ALIAS)
+
+MATRIX_KEY = 'users:recommendation-matrix:{generation}'
+MATRIX_TIMEOUT = 60 * 60 * 6
+RECOMMENDATIONS_KEY = 'users:recommendations:{user_id}'
+RECOMMENDATIONS_TIMEOUT = 60 * 60
+RECOMMENDATION_LIMIT = 50
+
+HISTORY_WEIGHTS = {'saved': 1.0, 'applied': 2.0}
+FIELD_WEIGHTS = {
+    'levels': 3.0,
+    'field_of_study': 3.0,
+    'country': 2.0,
+    'scholarship_category': 1.0,
+    'fund_type': 1.0,
+    'sponsor_type': 0.5,
+    'language_requirement': 0.5,
+}
+# UserProfile.education -> words in the names of the levels to study next
+EDUCATION_LEVELS = {
+    'high_school': ('undergraduate', 'bachelor'),
+    'bachelors': ('master', 'postgraduate'),
+    'masters': ('phd', 'doctor'),
+    'phd': ('postdoc', 'research'),
+}
+EDUCATION_WEIGHT = 3.0
+# Deadline bonus: DEADLINE_WEIGHT today, half of it DEADLINE_SCALE days out
+DEADLINE_WEIGHT = 1.0
+DEADLINE_SCALE = 30
+
+
+class FeatureMatrix:
+    """Scholarships x (field, taxonomy id), kept by column for scoring and by row for histories"""
+
+    def __init__(self, generation, ids, deadlines, row_features, level_names):
+        self.generation = generation
+        self.built_at = time.monotonic()
+        self.ids = ids
+        self.rows = {pk: row for row, pk in enumerate(ids)}
+        self.deadlines = deadlines
+        self.row_features = row_features
+        self.level_names = level_names
+        columns = {}
+        for row, features in enumerate(row_features):
+            for feature in features:
+                columns.setdefault(feature, []).append(row)
+        self.columns = columns
+        if np is not None:
+            self.ids = np.array(ids, dtype=np.int64)
+            self.deadlines = np.array(deadlines, dtype=np.int64)
+            self.columns = {feature: np.array(rows, dtype=np.int64) for feature, rows in columns.items()}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # The row lookup is cheaper to rebuild than to unpickle
+        del state['rows'], state['built_at']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.built_at = time.monotonic()
+        self.rows = {int(pk): row for row, pk in enumerate(self.ids)}
+
+    def __len__(self):
+        return len(self.row_features)
+
+    @classmethod
+    def build(cls, generation):
+        ids, deadlines, row_features, rows = [], [], [], {}
+        scholarships = Scholarship.objects.order_by('pk').values_list('pk', 'deadline', 'country_id')
+        for pk, deadline, country_id in scholarships.iterator(chunk_size=5000):
+            rows[pk] = len(ids)
+            ids.append(pk)
+            deadlines.append(deadline.toordinal())
+            row_features.append([('country', country_id)])
+        for field in SCHOLARSHIP_M2M_FIELDS:
+            m2m = Scholarship._meta.get_field(field)
+            links = m2m.remote_field.through.objects.values_list(
+                f'{m2m.m2m_field_name()}_id', f'{m2m.m2m_reverse_field_name()}_id'
+            )
+            for scholarship_id, taxonomy_id in links.iterator(chunk_size=5000):
+                row = rows.get(scholarship_id)
+                if row is not None:
+                    row_features[row].append((field, taxonomy_id))
+        level_names = {pk: name.lower() for pk, name in Level.objects.values_list('pk', 'name')}
+        return cls(generation, ids, deadlines, [tuple(f) for f in row_features], level_names)
+
+    def education_features(self, education):
+        words = EDUCATION_LEVELS.get(education, ())
+        return [
+            ('levels', pk) for pk, name in self.level_names.items()
+            if any(word in name for word in words)
+        ]
+
+    def rank(self, weights, today, exclude_ids=(), limit=RECOMMENDATION_LIMIT):
+        """Ids of the ``limit`` best open scholarships for ``weights``, best first"""
+        exclude_rows = [self.rows[pk] for pk in exclude_ids if pk in self.rows]
+        if np is not None:
+            return self._rank_numpy(weights, today.toordinal(), exclude_rows, limit)
+        return self._rank_python(weights, today.toordinal(), set(exclude_rows), limit)
+
+    def _rank_numpy(self, weights, today, exclude_rows, limit):
+        scores = np.zeros(len(self))
+        for feature, weight in weights.items():
+            rows = self.columns.get(feature)
+            if rows is not None:
+                scores[rows] += weight
+        days = self.deadlines - today
+        eligible = days >= 0
+        eligible[exclude_rows] = False
+        candidates = eligible & (scores > 0)
+        if not candidates.any():
+            candidates = eligible
+        rows = np.flatnonzero(candidates)
+        totals = scores[rows] + DEADLINE_WEIGHT * DEADLINE_SCALE / (DEADLINE_SCALE + days[rows])
+        if len(rows) > limit:
+            # Keep everything tied with the limit-th best, so the tie-break below decides
+            threshold = np.partition(totals, len(totals) - limit)[len(totals) - limit]
+            best = totals >= threshold
+            rows, totals = rows[best], totals[best]
+        # Highest score first, then the earlier deadline, then the lower id
+        order = np.lexsort((self.ids[rows], days[rows], -totals))[:limit]
+        return self.ids[rows[order]].tolist()
+
+    def _rank_python(self, weights, today, exclude_rows, limit):
+        deadlines, ids = self.deadlines, self.ids
+        scores = {}
+        for feature, weight in weights.items():
+            for row in self.columns.get(feature, ()):
+                scores[row] = scores.get(row, 0.0) + weight
+        candidates = {
+            row: score for row, score in scores.items()
+            if deadlines[row] >= today and row not in exclude_rows
+        }
+        if not candidates:
+            candidates = {
+                row: scores.get(row, 0.0) for row in range(len(self))
+                if deadlines[row] >= today and row not in exclude_rows
+            }
+        ranked = heapq.nsmallest(limit, (
+            (-(score + DEADLINE_WEIGHT * DEADLINE_SCALE / (DEADLINE_SCALE + deadlines[row] - today)),
+             deadlines[row], ids[row])
+            for row, score in candidates.items()
+        ))
+        return [int(pk) for _, _, pk in ranked]
+
+
+_matrix = None
+
+
+def get_matrix():
+    """The feature matrix of the current scholarship generation, or a recent enough older one"""
+    global _matrix
+    generation = get_generation()
+    if _matrix is not None and (
+        _matrix.generation == generation
+        or time.monotonic() - _matrix.built_at < settings.RECOMMENDATION_MATRIX_MAX_AGE
+    ):
+        return _matrix
+    key = MATRIX_KEY.format(generation=generation)
+    matrix = shared_cache.get(key)
+    if matrix is None:
+        matrix = FeatureMatrix.build(generation)
+        shared_cache.set(key, matrix, MATRIX_TIMEOUT)
+    _matrix = matrix
+    return matrix
+
+
+def user_weights(matrix, history, education):
+    """
+    Feature weights from ``history`` ({scholarship id: weight}): each field's
+    weighted taxonomy distribution scaled by FIELD_WEIGHTS, plus the levels
+    after ``education``
+    """
+    feature_totals, field_totals = {}, {}
+    for pk, weight in history.items():
+        row = matrix.rows.get(pk)
+        if row is None:
+            continue
+        for feature in matrix.row_features[row]:
+            feature_totals[feature] = feature_totals.get(feature, 0.0) + weight
+            field_totals[feature[0]] = field_totals.get(feature[0], 0.0) + weight
+    weights = {
+        feature: FIELD_WEIGHTS.get(feature[0], 1.0) * total / field_totals[feature[0]]
+        for feature, total in feature_totals.items()
+    }
+    for feature in matrix.education_features(education):
+        weights[feature] = weights.get(feature, 0.0) + EDUCATION_WEIGHT
+    return weights
+
+
+def build_recommendations(user, matrix, today):
+    history = dict.fromkeys(get_saved_ids(user), HISTORY_WEIGHTS['saved'])
+    applied = ScholarshipApplication.objects.filter(user=user).values_list('scholarship_id', flat=True)
+    for pk in applied:
+        history[pk] = history.get(pk, 0.0) + HISTORY_WEIGHTS['applied']
+    education = UserProfile.objects.filter(user=user).values_list('education', flat=True).first()
+    weights = user_weights(matrix, history, education)
+    return matrix.rank(weights, today, exclude_ids=history)
+
+
+def get_recommendations(user):
+    """Ids of up to RECOMMENDATION_LIMIT open scholarships for ``user``, best first"""
+    matrix = get_matrix()
+    today = timezone.localdate().isoformat()
+    key = RECOMMENDATIONS_KEY.format(user_id=user.pk)
+    entry = cache.get(key)
+    if entry is None or entry['generation'] != matrix.generation or entry['day'] != today:
+        entry = {
+            'generation': matrix.generation,
+            'day': today,
+            'ids': build_recommendations(user, matrix, timezone.localdate()),
+        }
+        cache.set(key, entry, RECOMMENDATIONS_TIMEOUT)
+    return entry['ids']
+
+
+def invalidate_recommendations(user_id):
+    """Drop the user's cached recommendations once the transaction commits"""
+    transaction.on_commit(lambda: cache.delete(RECOMMENDATIONS_KEY.format(user_id=user_id)))
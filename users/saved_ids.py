@@ -0,0 +1,45 @@
+"""
+Per-user cache of saved scholarship ids.
+
+Listings use it to flag ``is_saved`` on every item with a single cache read.
+SavedScholarshipViewSet writes through after each change and signals.py drops
+the entry whenever saved rows disappear some other way, e.g. when a
+scholarship is deleted.
+"""
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import SavedScholarship
+
+SAVED_IDS_KEY = 'users:saved-scholarship-ids:{user_id}'
+SAVED_IDS_TIMEOUT = 60 * 60 * 24
+
+
+def load_saved_ids(user_id):
+    return frozenset(
+        SavedScholarship.objects.filter(user_id=user_id).values_list('scholarship_id', flat=True)
+    )
+
+
+def get_saved_ids(user):
+    """Return the ids of the scholarships ``user`` has saved, empty for anonymous users"""
+    if not user or not user.is_authenticated:
+        return frozenset()
+    key = SAVED_IDS_KEY.format(user_id=user.pk)
+    saved_ids = cache.get(key)
+    if saved_ids is None:
+        saved_ids = load_saved_ids(user.pk)
+        cache.set(key, saved_ids, SAVED_IDS_TIMEOUT)
+    return saved_ids
+
+
+def refresh_saved_ids(user_id):
+    """Write the user's current saved ids through to the cache once the transaction commits"""
+    def refresh():
+        cache.set(SAVED_IDS_KEY.format(user_id=user_id), load_saved_ids(user_id), SAVED_IDS_TIMEOUT)
+    transaction.on_commit(refresh)
+
+
+def invalidate_saved_ids(user_id):
+    """Drop the cached ids so the next read reloads them"""
+    transaction.on_commit(lambda: cache.delete(SAVED_IDS_KEY.format(user_id=user_id)))
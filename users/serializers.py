@@ -1,9 +1,12 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
+from django.db import transaction
 from rest_framework.validators import UniqueValidator
+from scholarships.mixins import SparseFieldsSerializerMixin
 
-from .models import UserProfile, SavedScholarship, ScholarshipApplication, EmailVerification
+from .models import UserProfile, SavedScholarship, ScholarshipApplication
+from .otp import EMAIL_VERIFICATION, consume_otp
 
 User = get_user_model()
 
@@ -92,26 +95,9 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         if len(otp_code) != 6:
             raise serializers.ValidationError({"otp_code": "OTP must be exactly 6 digits."})
         
-        # Store the OTP code in attrs for the create method
+        # Store the OTP code in attrs for the create method, which consumes it
         attrs['otp_code'] = otp_code
         
-        # Verify OTP validity
-        email = attrs['email']
-        
-        try:
-            otp_obj = EmailVerification.objects.filter(
-                email=email,
-                otp_code=otp_code,
-                is_used=False,
-                is_verified=False
-            ).latest('created_at')
-            
-            if not otp_obj.is_valid():
-                raise serializers.ValidationError({"otp_code": "Invalid or expired OTP code."})
-                
-        except EmailVerification.DoesNotExist:
-            raise serializers.ValidationError({"otp_code": "Invalid OTP code."})
-        
         return attrs
     
     def create(self, validated_data):
@@ -119,20 +105,15 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         otp_code = validated_data.pop('otp_code')
         validated_data.pop('password2')
         
-        # Mark OTP as used and verified
-        otp_obj = EmailVerification.objects.filter(
-            email=validated_data['email'],
-            otp_code=otp_code,
-            is_used=False
-        ).latest('created_at')
-        otp_obj.is_used = True
-        otp_obj.is_verified = True
-        otp_obj.save()
-        
-        # Create user with verified email
-        user = User.objects.create_user(**validated_data)
-        user.is_active = True  # Account is verified
-        user.save()
+        with transaction.atomic():
+            # Checks and uses up the OTP in one UPDATE; rolled back if the user can't be created
+            if not consume_otp(validated_data['email'], otp_code, EMAIL_VERIFICATION):
+                raise serializers.ValidationError({"otp_code": "Invalid or expired OTP code."})
+            
+            # Create user with verified email
+            user = User.objects.create_user(**validated_data)
+            user.is_active = True  # Account is verified
+            user.save()
         
         return user
 
@@ -150,7 +131,7 @@ class ChangePasswordSerializer(serializers.Serializer):
         return attrs
 
 
-class SavedScholarshipSerializer(serializers.ModelSerializer):
+class SavedScholarshipSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer for saved scholarships"""
     
     scholarship_title = serializers.CharField(source='scholarship.title', read_only=True)
@@ -169,7 +150,7 @@ class SavedScholarshipSerializer(serializers.ModelSerializer):
     def get_scholarship_details(self, obj):
         """Return the full scholarship details"""
         from scholarships.serializers import ScholarshipSerializer
-        return ScholarshipSerializer(obj.scholarship).data
+        return ScholarshipSerializer(obj.scholarship, context={'saved_ids': {obj.scholarship_id}}).data
 
     class Meta:
         model = SavedScholarship
@@ -179,9 +160,28 @@ class SavedScholarshipSerializer(serializers.ModelSerializer):
             'scholarship_details'
         ]
         read_only_fields = ['user', 'date_saved']
+        # ORM paths read by method fields, for ?fields= / ?omit=
+        sparse_field_paths = {'scholarship_details': ['scholarship']}
+
+
+class SavedScholarshipBatchSerializer(serializers.Serializer):
+    """Serializer for saving and unsaving several scholarships at once"""
+    save = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, default=list, max_length=100
+    )
+    unsave = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, default=list, max_length=100
+    )
+
+    def validate(self, attrs):
+        if not attrs['save'] and not attrs['unsave']:
+            raise serializers.ValidationError("Provide scholarship ids to save or unsave.")
+        if set(attrs['save']) & set(attrs['unsave']):
+            raise serializers.ValidationError("A scholarship cannot be saved and unsaved at once.")
+        return attrs
 
 
-class ScholarshipApplicationSerializer(serializers.ModelSerializer):
+class ScholarshipApplicationSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer for scholarship applications"""
     
     scholarship_title = serializers.CharField(source='scholarship.title', read_only=True)
@@ -231,23 +231,5 @@ class PasswordResetConfirmSerializer(serializers.Serializer):
         if attrs['new_password'] != attrs['new_password2']:
             raise serializers.ValidationError({"new_password": "Password fields didn't match."})
         
-        # Verify OTP validity for password reset
-        email = attrs['email']
-        otp_code = attrs['otp_code']
-        
-        try:
-            otp_obj = EmailVerification.objects.filter(
-                email=email,
-                otp_code=otp_code,
-                verification_type='password_reset',
-                is_used=False,
-                is_verified=False
-            ).latest('created_at')
-            
-            if not otp_obj.is_valid():
-                raise serializers.ValidationError({"otp_code": "Invalid or expired OTP code."})
-                
-        except EmailVerification.DoesNotExist:
-            raise serializers.ValidationError({"otp_code": "Invalid OTP code."})
-        
+        # The OTP itself is checked and consumed by the view when the password is saved
         return attrs
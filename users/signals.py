@@ -1,8 +1,11 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 
-from .models import UserProfile
+from .models import UserProfile, SavedScholarship, ScholarshipApplication
+from .saved_ids import invalidate_saved_ids
+from .application_summary import invalidate_application_summary
+from .recommendations import invalidate_recommendations
 
 User = get_user_model()
 
@@ -12,5 +15,29 @@ def create_user_profile(sender, instance, created, **kwargs):
     if created:
         UserProfile.objects.get_or_create(user=instance)
 
+
+@receiver(post_save, sender=SavedScholarship)
+@receiver(post_delete, sender=SavedScholarship)
+def drop_cached_saved_ids(sender, instance, **kwargs):
+    """Keep cached saved ids honest when rows change outside the API, e.g. cascades"""
+    invalidate_saved_ids(instance.user_id)
+
+
+@receiver(post_save, sender=ScholarshipApplication)
+@receiver(post_delete, sender=ScholarshipApplication)
+def drop_cached_application_summary(sender, instance, **kwargs):
+    """Recompute the dashboard totals after any application write"""
+    invalidate_application_summary(instance.user_id)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_save, sender=SavedScholarship)
+@receiver(post_delete, sender=SavedScholarship)
+@receiver(post_save, sender=ScholarshipApplication)
+@receiver(post_delete, sender=ScholarshipApplication)
+def drop_cached_recommendations(sender, instance, **kwargs):
+    """Recommendations follow the profile and the saved and applied scholarships"""
+    invalidate_recommendations(instance.user_id)
+
 # Note: We've removed the SocialAccount signal handler as we're not using allauth's
 # social account functionality directly due to cryptography package issues
@@ -0,0 +1,86 @@
+"""
+Minimal SMTP server for tests and email benchmarks.
+
+It speaks just enough of the protocol for smtplib (EHLO/HELO, MAIL, RCPT,
+DATA, RSET, NOOP, QUIT), keeps every accepted message in memory and can be
+told to reject the next few messages with a temporary failure.
+"""
+import socketserver
+import threading
+import time
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode('ascii'))
+
+    def handle(self):
+        server = self.server.stub
+        server.connections += 1
+        self.reply('220 stub ESMTP ready')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('utf-8', 'replace').strip()
+            verb = command[:4].upper()
+            if server.latency:
+                time.sleep(server.latency)
+            if verb == 'EHLO':
+                self.reply('250-stub')
+                self.reply('250 SIZE 10485760')
+            elif verb in ('HELO', 'MAIL', 'RCPT', 'RSET', 'NOOP'):
+                self.reply('250 OK')
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                data = []
+                for raw in self.rfile:
+                    if raw in (b'.\r\n', b'.\n'):
+                        break
+                    data.append(raw)
+                with server.lock:
+                    if server.fail_next > 0:
+                        server.fail_next -= 1
+                        self.reply('451 Temporary failure, try again later')
+                        continue
+                    server.messages.append(b''.join(data).decode('utf-8', 'replace'))
+                self.reply('250 Queued')
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+
+class _ThreadingServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class StubSMTPServer:
+    """Run with ``with StubSMTPServer() as smtp:`` and point EMAIL_PORT at ``smtp.port``"""
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0):
+        self.host = host
+        self.latency = latency
+        self.messages = []
+        self.connections = 0
+        self.fail_next = 0
+        self.lock = threading.Lock()
+        self._server = _ThreadingServer((host, port), _SMTPHandler)
+        self._server.stub = self
+        self.port = self._server.server_address[1]
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -1,3 +1,607 @@
-from django.test import TestCase
+import random
+import socket
+from datetime import timedelta
+from io import StringIO
+from unittest import skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.core.mail import EmailMultiAlternatives
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from scholarships.models import Scholarship, Country, Level, FundType
+from scholarships_api.test_runner import ClearCachesMixin
+from .checks import check_otp_store_pairing
+from .deadline_reminders import DeadlineReminderMailer
+from .email_connections import SMTPConnectionPool, send_email
+from .email_queue import EmailQueueWorker, enqueue_email, EMAIL_WELCOME
+from .email_templates import get_template, render_email
+from .models import (
+    SavedScholarship, ScholarshipApplication, OutboundEmail, EmailVerification, DeadlineReminder,
+)
+from .otp import OTP_INVALID, PASSWORD_RESET, check_otp, consume_otp, issue_otp
+from .recommendations import FeatureMatrix, np
+from .saved_ids import SAVED_IDS_KEY, get_saved_ids
+from .smtp_stub import StubSMTPServer
+from .throttling import AnonRateThrottle
+
+User = get_user_model()
+
+
+class SharedThrottleCacheTests(ClearCachesMixin, TestCase):
+    def test_throttle_history_is_kept_in_the_throttle_alias(self):
+        request = APIRequestFactory().get('/', REMOTE_ADDR='10.0.0.1')
+        request.user = AnonymousUser()
+        throttle = AnonRateThrottle()
+        self.assertTrue(throttle.allow_request(request, None))
+
+        key = throttle.get_cache_key(request, None)
+        self.assertEqual(len(caches[settings.THROTTLE_CACHE_ALIAS].get(key)), 1)
+        self.assertIsNone(caches['default'].get(key))
+
+
+class SparseFieldsetTests(ClearCachesMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(email='student@example.com', password='pass12345')
+        self.client.force_authenticate(self.user)
+        country, _ = Country.objects.get_or_create(name="Canada")
+        self.scholarship = Scholarship.objects.create(
+            title="Saved", description="<p>long</p>", country=country, deadline="2030-12-31"
+        )
+        SavedScholarship.objects.create(user=self.user, scholarship=self.scholarship)
+        ScholarshipApplication.objects.create(user=self.user, scholarship=self.scholarship, notes="draft")
+
+    def test_saved_scholarships_fields(self):
+        response = self.client.get('/api/user/saved-scholarships/', {'fields': 'id,scholarship,date_saved'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'scholarship', 'date_saved'})
+
+    def test_applications_omit(self):
+        response = self.client.get('/api/user/applications/', {'omit': 'notes,user'})
+        result = response.data['results'][0]
+        self.assertNotIn('notes', result)
+        self.assertEqual(result['scholarship_title'], "Saved")
+
+
+class SavedScholarshipQueryCountTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='saver@example.com', password='pass12345')
+        self.client.force_authenticate(self.user)
+        self.country, _ = Country.objects.get_or_create(name="Canada")
+        self.level, _ = Level.objects.get_or_create(name="Masters")
+        self.fund_type, _ = FundType.objects.get_or_create(name="Fully Funded")
+
+    def save_scholarships(self, count):
+        for i in range(count):
+            scholarship = Scholarship.objects.create(
+                title=f"Saved {i}", description="-", country=self.country, deadline="2030-12-31"
+            )
+            scholarship.levels.add(self.level)
+            scholarship.fund_type.add(self.fund_type)
+            SavedScholarship.objects.create(user=self.user, scholarship=scholarship)
+
+    def test_list_query_count_does_not_grow(self):
+        # COUNT, saved rows joined with scholarship and country, one prefetch per taxonomy
+        self.save_scholarships(2)
+        with self.assertNumQueries(8):
+            response = self.client.get('/api/user/saved-scholarships/')
+        self.assertEqual(response.data['count'], 2)
+
+        self.save_scholarships(8)
+        with self.assertNumQueries(8):
+            response = self.client.get('/api/user/saved-scholarships/')
+        details = response.data['results'][0]['scholarship_details']
+        self.assertEqual(details['country_name'], "Canada")
+        self.assertEqual([level['name'] for level in details['levels']], ["Masters"])
+
+
+class SavedScholarshipBatchTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='batch@example.com', password='pass12345')
+        self.client.force_authenticate(self.user)
+        country, _ = Country.objects.get_or_create(name="Canada")
+        self.ids = [
+            Scholarship.objects.create(
+                title=f"Batch {i}", description="-", country=country, deadline="2030-12-31"
+            ).pk
+            for i in range(3)
+        ]
+        SavedScholarship.objects.create(user=self.user, scholarship_id=self.ids[0])
+
+    def test_batch_save_and_unsave(self):
+        missing = max(self.ids) + 100
+        response = self.client.post('/api/user/saved-scholarships/batch/', {
+            'save': [self.ids[1], self.ids[2], self.ids[1], missing],
+            'unsave': [self.ids[0]],
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['saved'], sorted(self.ids[1:]))
+        self.assertEqual(response.data['not_found'], [missing])
+        saved = SavedScholarship.objects.filter(user=self.user).values_list('scholarship_id', flat=True)
+        self.assertEqual(sorted(saved), sorted(self.ids[1:]))
+
+        # Saving again is idempotent
+        response = self.client.post(
+            '/api/user/saved-scholarships/batch/', {'save': self.ids[1:]}, format='json'
+        )
+        self.assertEqual(SavedScholarship.objects.filter(user=self.user).count(), 2)
+
+    def test_batch_rejects_conflicting_ids(self):
+        response = self.client.post('/api/user/saved-scholarships/batch/', {
+            'save': [self.ids[0]], 'unsave': [self.ids[0]],
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_membership(self):
+        ids = ','.join(str(pk) for pk in self.ids)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/user/saved-scholarships/membership/', {'ids': ids})
+        self.assertEqual(response.data, {'saved': [self.ids[0]], 'bitmap': '100'})
+        response = self.client.get('/api/user/saved-scholarships/membership/', {'ids': 'a,b'})
+        self.assertEqual(response.status_code, 400)
+
+
+class SavedIdsCacheTests(ClearCachesMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(email='cached@example.com', password='pass12345')
+        self.client.force_authenticate(self.user)
+        country, _ = Country.objects.get_or_create(name="Canada")
+        self.first, self.second = [
+            Scholarship.objects.create(title=title, description="-", country=country, deadline="2030-12-31")
+            for title in ("First", "Second")
+        ]
+
+    def cached_ids(self):
+        return caches['default'].get(SAVED_IDS_KEY.format(user_id=self.user.pk))
+
+    def test_writes_go_through_to_the_cache(self):
+        self.assertEqual(get_saved_ids(self.user), frozenset())
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/user/saved-scholarships/', {'scholarship': self.first.pk})
+        self.assertEqual(self.cached_ids(), {self.first.pk})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f"/api/user/saved-scholarships/{response.data['id']}/")
+        self.assertEqual(self.cached_ids(), frozenset())
+
+    def test_scholarship_deletion_drops_the_entry(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/user/saved-scholarships/batch/', {'save': [self.first.pk]}, format='json')
+        self.assertEqual(self.cached_ids(), {self.first.pk})
+        with self.captureOnCommitCallbacks(execute=True):
+            self.first.delete()
+        self.assertIsNone(self.cached_ids())
+        self.assertEqual(get_saved_ids(self.user), frozenset())
+
+    def test_listing_flags_saved_items_from_the_cache(self):
+        SavedScholarship.objects.create(user=self.user, scholarship=self.second)
+        get_saved_ids(self.user)
+        response = self.client.get('/api/scholarships/', {'fields': 'slug,is_saved'})
+        self.assertEqual(
+            {item['slug']: item['is_saved'] for item in response.data['results']},
+            {'first': False, 'second': True},
+        )
+        with self.assertNumQueries(0):
+            get_saved_ids(self.user)
+
+
+class ApplicationSummaryTests(ClearCachesMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(email='dashboard@example.com', password='pass12345')
+        self.client.force_authenticate(self.user)
+        country, _ = Country.objects.get_or_create(name="Canada")
+        soon = timezone.localdate() + timedelta(days=10)
+        later = timezone.localdate() + timedelta(days=90)
+        for title, amount, deadline, status in [
+            ("A", 1000, soon, 'pending'),
+            ("B", 2500, later, 'pending'),
+            ("C", 500, soon, 'approved'),
+        ]:
+            scholarship = Scholarship.objects.create(
+                title=title, description="-", country=country, deadline=deadline, amount=amount
+            )
+            ScholarshipApplication.objects.create(user=self.user, scholarship=scholarship, status=status)
+
+    def test_summary_aggregates_and_caches(self):
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/user/applications/summary/')
+        data = response.data
+        self.assertEqual((data['total'], data['total_amount']), (3, '4000.00'))
+        self.assertEqual(data['by_status']['pending'], {'count': 2, 'total_amount': '3500.00'})
+        self.assertEqual(data['by_status']['rejected'], {'count': 0, 'total_amount': '0.00'})
+        # Approved applications no longer count towards upcoming deadlines
+        self.assertEqual(data['upcoming_deadlines'], 1)
+        self.assertEqual(len(data['recent_updates']), 3)
+
+        with self.assertNumQueries(0):
+            self.client.get('/api/user/applications/summary/')
+
+    def test_application_writes_invalidate_the_summary(self):
+        self.client.get('/api/user/applications/summary/')
+        application = ScholarshipApplication.objects.filter(user=self.user, status='approved').get()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/user/applications/{application.pk}/', {'status': 'rejected'})
+        response = self.client.get('/api/user/applications/summary/')
+        self.assertEqual(response.data['by_status']['rejected']['count'], 1)
+        self.assertEqual(response.data['recent_updates'][0]['status'], 'rejected')
+
+    def test_list_does_not_query_per_row(self):
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/user/applications/')
+        self.assertEqual(response.data['count'], 3)
+
+
+class EmailQueueTests(ClearCachesMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.smtp = StubSMTPServer().start()
+        self.addCleanup(self.smtp.stop)
+        settings_override = override_settings(
+            EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+            EMAIL_HOST='127.0.0.1', EMAIL_PORT=self.smtp.port,
+            EMAIL_USE_TLS=False, EMAIL_HOST_USER='', EMAIL_HOST_PASSWORD='',
+            EMAIL_PROVIDER_RATE_LIMITS={},
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def run_worker(self):
+        worker = EmailQueueWorker(concurrency=2, retry_base=1)
+        self.addCleanup(worker.close)
+        return worker.run_once()
+
+    def test_views_enqueue_and_the_worker_delivers(self):
+        response = self.client.post('/api/user/auth/send-verification-email/', {'email': 'new@example.com'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.smtp.messages, [])
+        job = OutboundEmail.objects.get()
+        self.assertEqual((job.kind, job.status), ('otp', 'queued'))
+
+        self.assertEqual(self.run_worker(), (1, 0, 0))
+        otp = EmailVerification.objects.get(email='new@example.com').otp_code
+        self.assertEqual(len(self.smtp.messages), 1)
+        self.assertIn(otp, self.smtp.messages[0])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.provider), ('sent', 1, 'smtp'))
+        # The code is not kept once delivered
+        self.assertEqual(job.payload, {})
+
+    def test_temporary_failures_are_retried_with_backoff(self):
+        enqueue_email(EMAIL_WELCOME, 'retry@example.com', full_name='Ada')
+        self.smtp.fail_next = 1
+        self.assertEqual(self.run_worker(), (0, 1, 0))
+        job = OutboundEmail.objects.get()
+        self.assertEqual((job.status, job.attempts), ('queued', 1))
+        self.assertGreater(job.next_attempt_at, timezone.now())
+        # Not due yet
+        self.assertEqual(self.run_worker(), (0, 0, 0))
+
+        OutboundEmail.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(self.run_worker(), (1, 0, 0))
+        self.assertIn('Ada', self.smtp.messages[0])
+
+    def test_gives_up_after_max_attempts(self):
+        enqueue_email(EMAIL_WELCOME, 'down@example.com', full_name='Ada')
+        OutboundEmail.objects.update(attempts=4)
+        self.smtp.fail_next = 1
+        self.assertEqual(self.run_worker(), (0, 0, 1))
+        job = OutboundEmail.objects.get()
+        self.assertEqual((job.status, job.payload), ('failed', {}))
+
+
+class SMTPConnectionPoolTests(TestCase):
+    def setUp(self):
+        self.smtp = StubSMTPServer().start()
+        self.addCleanup(self.smtp.stop)
+        settings_override = override_settings(
+            EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+            EMAIL_HOST='127.0.0.1', EMAIL_PORT=self.smtp.port,
+            EMAIL_USE_TLS=False, EMAIL_HOST_USER='', EMAIL_HOST_PASSWORD='',
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_sends_reuse_one_connection(self):
+        for i in range(3):
+            self.assertTrue(send_email(f"Hello {i}", "plain", "<p>html</p>", 'pool@example.com'))
+        self.assertEqual(len(self.smtp.messages), 3)
+        self.assertEqual(self.smtp.connections, 1)
+
+    def test_broken_connection_is_replaced(self):
+        pool = SMTPConnectionPool(health_check_after=0)
+        self.addCleanup(pool.discard)
+        # Mimic the server dropping the connection while it sat idle
+        pool.connection().connection.sock.shutdown(socket.SHUT_RDWR)
+        pool.send_messages([EmailMultiAlternatives("After drop", "plain", 'a@example.com', ['b@example.com'])])
+        self.assertEqual(len(self.smtp.messages), 1)
+        self.assertEqual(self.smtp.connections, 2)
+
+
+class EmailTemplateTests(TestCase):
+    def test_otp_template_inlines_css_and_fills_both_parts(self):
+        html_message, plain_message = render_email('otp', otp_code='482913')
+        self.assertIn('482913', html_message)
+        self.assertIn('Your verification code is:\n482913', plain_message)
+        self.assertIn('letter-spacing: 8px', html_message.split('482913')[0].rsplit('<div', 1)[1])
+        # Only the media query is left for clients that read <style>
+        self.assertNotIn('.otp-code {', html_message.split('@media')[0])
+        self.assertNotIn('<', plain_message)
+
+    @override_settings(FRONTEND_URL='https://scholarscanner.example')
+    def test_welcome_escapes_name_in_html_only(self):
+        html_message, plain_message = render_email('welcome', name='Ann <Lee>')
+        self.assertIn('Hi Ann &lt;Lee&gt;!', html_message)
+        self.assertIn('Hi Ann <Lee>!', plain_message)
+        self.assertIn('href="https://scholarscanner.example/scholarships/search"', html_message)
+        self.assertIn('https://scholarscanner.example/scholarships/search', plain_message)
+
+    def test_templates_compile_once(self):
+        self.assertIs(get_template('password_reset'), get_template('password_reset'))
+        with self.assertRaises(KeyError):
+            render_email('password_reset')
+
+
+class DeadlineReminderTests(TestCase):
+    def setUp(self):
+        self.smtp = StubSMTPServer().start()
+        self.addCleanup(self.smtp.stop)
+        settings_override = override_settings(
+            EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+            EMAIL_HOST='127.0.0.1', EMAIL_PORT=self.smtp.port,
+            EMAIL_USE_TLS=False, EMAIL_HOST_USER='', EMAIL_HOST_PASSWORD='',
+            EMAIL_PROVIDER_RATE_LIMITS={},
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        today = timezone.localdate()
+        country, _ = Country.objects.get_or_create(name="Canada")
+        self.ada = User.objects.create_user(email='ada@example.com', password='pass12345', full_name='Ada')
+        self.bob = User.objects.create_user(email='bob@example.com', password='pass12345')
+        self.soon, self.next_week, self.later = [
+            Scholarship.objects.create(
+                title=title, description="<p>d</p>", country=country, deadline=today + timedelta(days=days)
+            )
+            for title, days in (("Soon Grant", 1), ("Next Week Award", 6), ("Later Fund", 30))
+        ]
+        for scholarship in (self.soon, self.next_week, self.later):
+            SavedScholarship.objects.create(user=self.ada, scholarship=scholarship)
+        SavedScholarship.objects.create(user=self.bob, scholarship=self.next_week)
+
+    def send(self, *args):
+        call_command('send_deadline_reminders', *args, stdout=StringIO())
+
+    def test_one_digest_per_user_and_no_repeats(self):
+        self.send()
+        self.assertEqual(len(self.smtp.messages), 2)
+        ada_mail = next(m for m in self.smtp.messages if 'ada@example.com' in m)
+        self.assertIn('Soon Grant', ada_mail)
+        self.assertIn('Next Week Award', ada_mail)
+        self.assertNotIn('Later Fund', ada_mail)
+        self.assertEqual(
+            set(DeadlineReminder.objects.filter(user=self.ada).values_list('scholarship_id', 'window')),
+            {(self.soon.pk, 1), (self.next_week.pk, 7)},
+        )
+        self.assertFalse(DeadlineReminder.objects.filter(sent_at__isnull=True).exists())
+
+        self.send()
+        self.assertEqual(len(self.smtp.messages), 2)
+
+    def test_narrower_window_sends_again(self):
+        self.send()
+        # A week later the award is one day out and gets its last-call reminder
+        stats = DeadlineReminderMailer(today=timezone.localdate() + timedelta(days=5)).run()
+        self.assertEqual((stats.digests, stats.reminders), (2, 2))
+        self.assertEqual(len(self.smtp.messages), 4)
+
+    def test_failed_send_releases_markers(self):
+        self.smtp.fail_next = 1
+        stats = DeadlineReminderMailer(batch_size=1).run()
+        self.assertEqual((stats.digests, stats.failed), (1, 1))
+        self.assertEqual(DeadlineReminder.objects.filter(sent_at__isnull=True).count(), 0)
+
+        stats = DeadlineReminderMailer().run()
+        self.assertEqual((stats.digests, stats.failed), (1, 0))
+        self.assertEqual(len(self.smtp.messages), 2)
+
+    def test_dry_run_records_nothing(self):
+        self.send('--dry-run')
+        self.assertEqual(self.smtp.messages, [])
+        self.assertFalse(DeadlineReminder.objects.exists())
+
+
+class OTPVerificationTests(ClearCachesMixin, APITestCase):
+    def register(self, otp_code, email='new@example.com'):
+        return self.client.post('/api/user/auth/register/', {
+            'email': email, 'password': 'Sturdy-pass-123', 'password2': 'Sturdy-pass-123',
+            'full_name': 'New Student', 'otp_code': otp_code,
+        })
+
+    def test_consume_is_one_conditional_update(self):
+        otp = EmailVerification.generate_otp('one@example.com')
+        with self.assertNumQueries(1):
+            self.assertTrue(consume_otp('one@example.com', otp.otp_code))
+        self.assertFalse(consume_otp('one@example.com', otp.otp_code))
+
+    def test_registration_consumes_the_code_once(self):
+        otp = EmailVerification.generate_otp('new@example.com')
+        response = self.client.post('/api/user/auth/verify-otp/', {'email': 'new@example.com', 'otp_code': otp.otp_code})
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self.register(otp.otp_code).status_code, 201)
+        otp.refresh_from_db()
+        self.assertTrue(otp.is_used and otp.is_verified)
+
+        User.objects.filter(email='new@example.com').delete()
+        response = self.register(otp.otp_code)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('otp_code', response.data)
+
+    def test_password_reset_code_cannot_register(self):
+        otp = EmailVerification.generate_otp('new@example.com', 'password_reset')
+        self.assertEqual(self.register(otp.otp_code).status_code, 400)
+        self.assertFalse(User.objects.filter(email='new@example.com').exists())
+
+    def test_expired_code(self):
+        otp = EmailVerification.generate_otp('late@example.com')
+        EmailVerification.objects.filter(pk=otp.pk).update(created_at=timezone.now() - timedelta(minutes=11))
+        response = self.client.post('/api/user/auth/verify-otp/', {'email': 'late@example.com', 'otp_code': otp.otp_code})
+        self.assertEqual(response.data['error'], 'OTP has expired. Please request a new one.')
+        self.assertFalse(consume_otp('late@example.com', otp.otp_code))
+
+    def test_purge_deletes_expired_rows_in_batches(self):
+        for i in range(5):
+            EmailVerification.generate_otp(f'old{i}@example.com')
+        EmailVerification.objects.update(created_at=timezone.now() - timedelta(hours=1))
+        fresh = EmailVerification.generate_otp('fresh@example.com')
+
+        out = StringIO()
+        call_command('purge_otps', '--batch-size', '2', stdout=out)
+        self.assertIn('Deleted 5 expired OTPs', out.getvalue())
+        self.assertEqual(list(EmailVerification.objects.values_list('pk', flat=True)), [fresh.pk])
+
+
+@override_settings(OTP_STORE='cache', OTP_MAX_ATTEMPTS=3)
+class CacheOTPStoreTests(ClearCachesMixin, APITestCase):
+    def test_registration_flow_never_touches_the_table(self):
+        response = self.client.post('/api/user/auth/send-verification-email/', {'email': 'new@example.com'})
+        self.assertEqual(response.status_code, 200)
+        otp_code = OutboundEmail.objects.get().payload['otp_code']
+
+        response = self.client.post('/api/user/auth/send-verification-email/', {'email': 'new@example.com'})
+        self.assertFalse(response.data['canResend'])
+
+        response = self.client.post('/api/user/auth/verify-otp/', {'email': 'new@example.com', 'otp_code': otp_code})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post('/api/user/auth/register/', {
+            'email': 'new@example.com', 'password': 'Sturdy-pass-123', 'password2': 'Sturdy-pass-123',
+            'otp_code': otp_code,
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(EmailVerification.objects.exists())
+        self.assertEqual(check_otp('new@example.com', otp_code), OTP_INVALID)
+
+    def test_codes_are_consumed_once_and_replaced_on_reissue(self):
+        first = issue_otp('one@example.com')
+        second = issue_otp('one@example.com')
+        if first != second:
+            self.assertFalse(consume_otp('one@example.com', first))
+        self.assertTrue(consume_otp('one@example.com', second))
+        self.assertFalse(consume_otp('one@example.com', second))
+
+    def test_wrong_guesses_burn_the_code(self):
+        otp_code = issue_otp('guess@example.com', PASSWORD_RESET)
+        wrong = '000000' if otp_code != '000000' else '111111'
+        for _ in range(3):
+            self.assertFalse(consume_otp('guess@example.com', wrong, PASSWORD_RESET))
+        self.assertFalse(consume_otp('guess@example.com', otp_code, PASSWORD_RESET))
+        # A new code starts a fresh count
+        otp_code = issue_otp('guess@example.com', PASSWORD_RESET)
+        self.assertTrue(consume_otp('guess@example.com', otp_code, PASSWORD_RESET))
+
+    def test_check_warns_when_paired_with_the_database_queue(self):
+        with override_settings(EMAIL_QUEUE_BACKEND='database'):
+            self.assertEqual([w.id for w in check_otp_store_pairing(None)], ['users.W001'])
+        with override_settings(EMAIL_QUEUE_BACKEND='redis'):
+            self.assertEqual(check_otp_store_pairing(None), [])
+
+
+@override_settings(RECOMMENDATION_MATRIX_MAX_AGE=0)
+class RecommendationTests(ClearCachesMixin, APITestCase):
+    url = '/api/user/recommendations/'
+
+    def setUp(self):
+        super().setUp()
+        self.canada, _ = Country.objects.get_or_create(name="Canada")
+        self.japan, _ = Country.objects.get_or_create(name="Japan")
+        self.masters, _ = Level.objects.get_or_create(name="Masters")
+        self.phd, _ = Level.objects.get_or_create(name="PhD")
+        self.undergraduate, _ = Level.objects.get_or_create(name="Undergraduate")
+        today = timezone.localdate()
+        self.saved = self.create("Saved", self.canada, self.masters, today + timedelta(days=60))
+        self.similar = self.create("Similar", self.canada, self.masters, today + timedelta(days=90))
+        self.doctoral = self.create("Doctoral", self.japan, self.phd, today + timedelta(days=90))
+        self.bachelor = self.create("Bachelor", self.japan, self.undergraduate, today + timedelta(days=5))
+        self.expired = self.create("Expired", self.canada, self.masters, today - timedelta(days=1))
+        self.user = User.objects.create_user(email='ranked@example.com', password='pass12345')
+        SavedScholarship.objects.create(user=self.user, scholarship=self.saved)
+        self.client.force_authenticate(self.user)
+
+    def create(self, title, country, level, deadline):
+        scholarship = Scholarship.objects.create(title=title, description="-", country=country, deadline=deadline)
+        scholarship.levels.add(level)
+        return scholarship
+
+    def titles(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [card['title'] for card in response.data['results']]
+
+    def test_history_and_education_rank_open_scholarships(self):
+        # Only Similar shares features with the saved scholarship; Saved and Expired never show
+        self.assertEqual(self.titles(), ["Similar"])
+
+        profile = self.user.profile
+        profile.education = 'masters'
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.save()
+        # Sharing country and level with the saved one still beats the education boost alone
+        self.assertEqual(self.titles(), ["Similar", "Doctoral"])
+
+    def test_users_without_history_get_the_closing_soonest(self):
+        SavedScholarship.objects.filter(user=self.user).delete()
+        caches['default'].clear()
+        self.assertEqual(self.titles(limit=2), ["Bachelor", "Saved"])
+
+    def test_results_are_cached_until_the_history_changes(self):
+        self.titles()
+        # Only the card lookup; the ranking comes from the cache
+        with self.assertNumQueries(1):
+            self.assertEqual(self.titles(), ["Similar"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ScholarshipApplication.objects.create(user=self.user, scholarship=self.doctoral)
+        # Applying counts double, so Japan now outweighs Canada; Bachelor also closes sooner
+        self.assertEqual(self.titles(), ["Bachelor", "Similar"])
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+
+@skipUnless(np, 'NumPy is not installed')
+class FeatureMatrixRankingTests(TestCase):
+    def test_numpy_ranking_matches_the_python_fallback(self):
+        rng = random.Random(7)
+        today = timezone.localdate()
+        fields = ('country', 'levels', 'field_of_study', 'fund_type', 'scholarship_category')
+        rows = 2000
+        matrix = FeatureMatrix(
+            generation=1,
+            ids=list(range(1, rows + 1)),
+            deadlines=[(today + timedelta(days=rng.randint(-30, 120))).toordinal() for _ in range(rows)],
+            row_features=[tuple((field, rng.randint(1, 8)) for field in fields) for _ in range(rows)],
+            level_names={},
+        )
+        weight_sets = [
+            {},
+            {('country', 1): 2.0},
+            # Few distinct totals, so many rows tie at the cut-off
+            {('levels', 2): 3.0, ('fund_type', 3): 1.0},
+            {(field, rng.randint(1, 8)): rng.choice([0.5, 1.0, 2.0, 3.0]) for field in fields},
+        ]
+        for weights in weight_sets:
+            for limit in (1, 10, 50):
+                exclude = rng.sample(range(1, rows + 1), 20)
+                exclude_rows = [matrix.rows[pk] for pk in exclude]
+                self.assertEqual(
+                    matrix._rank_numpy(weights, today.toordinal(), exclude_rows, limit),
+                    matrix._rank_python(weights, today.toordinal(), set(exclude_rows), limit),
+                )
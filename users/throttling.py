@@ -1,8 +1,33 @@
+from django.conf import settings
+from django.core.cache import caches
 from rest_framework import throttling
 import os
 
 
-class LoginRateThrottle(throttling.AnonRateThrottle):
+class SharedCacheThrottleMixin:
+    """
+    Keep throttle history in the shared throttle cache alias instead of the
+    default cache, so limits hold across every worker rather than per process.
+    """
+
+    @property
+    def cache(self):
+        return caches[settings.THROTTLE_CACHE_ALIAS]
+
+
+class AnonRateThrottle(SharedCacheThrottleMixin, throttling.AnonRateThrottle):
+    pass
+
+
+class UserRateThrottle(SharedCacheThrottleMixin, throttling.UserRateThrottle):
+    pass
+
+
+class ScopedRateThrottle(SharedCacheThrottleMixin, throttling.ScopedRateThrottle):
+    pass
+
+
+class LoginRateThrottle(AnonRateThrottle):
     """
     Throttle class specifically for login attempts.
     Limits the number of login attempts per IP address.
@@ -18,7 +43,7 @@ class LoginRateThrottle(throttling.AnonRateThrottle):
         }
     
     
-class EmailVerificationRateThrottle(throttling.AnonRateThrottle):
+class EmailVerificationRateThrottle(AnonRateThrottle):
     """
     Throttle class for email verification requests.
     Limits the number of verification emails sent based on a combination of IP and email.
@@ -55,7 +80,7 @@ class EmailVerificationRateThrottle(throttling.AnonRateThrottle):
         }
 
 
-class RegistrationRateThrottle(throttling.AnonRateThrottle):
+class RegistrationRateThrottle(AnonRateThrottle):
     """
     Throttle class for registration attempts.
     Limits the number of registration attempts per IP address.
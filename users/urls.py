@@ -21,6 +21,7 @@ urlpatterns = [
     path('auth/token/verify/', TokenVerifyView.as_view(), name='token_verify'),
     path('auth/me/', views.UserViewSet.as_view({'get': 'me'}), name='me'),
     path('auth/change-password/', views.UserViewSet.as_view({'post': 'change_password'}), name='change-password'),
+    path('recommendations/', views.recommendations, name='recommendations'),
       # Email Verification endpoints
     path('auth/send-verification-email/', views.send_verification_email, name='send_verification_email'),
     path('auth/verify-otp/', views.verify_otp, name='verify_otp'),
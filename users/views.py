@@ -4,6 +4,7 @@ from rest_framework.response import Response
 from rest_framework.decorators import action, api_view, permission_classes, throttle_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
 import logging
@@ -12,14 +13,26 @@ from .throttling import RegistrationRateThrottle, EmailVerificationRateThrottle
 # Set up logging
 logger = logging.getLogger(__name__)
 
-from .models import UserProfile, SavedScholarship, ScholarshipApplication, EmailVerification
+from .models import UserProfile, SavedScholarship, ScholarshipApplication
 from .serializers import (
     UserSerializer, UserRegistrationSerializer, ChangePasswordSerializer,
-    SavedScholarshipSerializer, ScholarshipApplicationSerializer, UserProfileSerializer,
+    SavedScholarshipSerializer, SavedScholarshipBatchSerializer, ScholarshipApplicationSerializer, UserProfileSerializer,
     EmailVerificationSerializer, OTPVerificationSerializer, PasswordResetRequestSerializer, PasswordResetConfirmSerializer
 )
 from .permissions import IsOwnerOrReadOnly
-from .email_service import send_verification_email as send_email_with_otp, send_welcome_email, send_password_reset_email as send_password_reset_otp
+from .saved_ids import refresh_saved_ids
+from .application_summary import get_application_summary
+from .recommendations import RECOMMENDATION_LIMIT, get_recommendations, invalidate_recommendations
+from rest_framework.settings import api_settings
+from scholarships.feeds import get_feed_cards
+from scholarships.mixins import SparseFieldsetMixin
+from scholarships.serializers import ScholarshipCardSerializer
+from scholarships.models import Scholarship, SCHOLARSHIP_M2M_FIELDS
+from .email_queue import enqueue_email, EMAIL_OTP, EMAIL_WELCOME, EMAIL_PASSWORD_RESET
+from .otp import (
+    EMAIL_VERIFICATION, PASSWORD_RESET, OTP_EXPIRED, OTP_VALID,
+    check_otp, consume_otp, issue_otp, otp_issued_at,
+)
 
 User = get_user_model()
 
@@ -97,8 +110,8 @@ class RegisterView(generics.CreateAPIView):
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
         
-        # Send welcome email
-        send_welcome_email(user)
+        # Queue the welcome email; the process_email_queue worker delivers it
+        enqueue_email(EMAIL_WELCOME, user.email, full_name=user.full_name)
         
         # Generate JWT tokens for the new user
         from rest_framework_simplejwt.tokens import RefreshToken
@@ -134,15 +147,12 @@ def send_verification_email(request):
             )
         
         try:
-            # Check for recent OTPs for this email that might still be valid
-            recent_otp = EmailVerification.objects.filter(
-                email=email,
-                is_used=False,
-                created_at__gte=timezone.now() - timedelta(minutes=9)  # Just under the 10-minute expiry
-            ).first()
-            
-            if recent_otp:
-                time_elapsed = timezone.now() - recent_otp.created_at
+            # Check for a recent OTP for this email that might still be valid
+            issued_at = otp_issued_at(email, EMAIL_VERIFICATION)
+
+            # Just under the 10-minute expiry
+            if issued_at and issued_at >= timezone.now() - timedelta(minutes=9):
+                time_elapsed = timezone.now() - issued_at
                 time_elapsed_seconds = time_elapsed.total_seconds()
                 remaining_seconds = 60 - time_elapsed_seconds
                 
@@ -164,19 +174,14 @@ def send_verification_email(request):
         except Exception as e:
             logger.error(f"Error checking recent OTPs: {e}")
         
-        # Generate and send OTP
-        otp_obj = EmailVerification.generate_otp(email)
+        # Generate OTP and queue the email
+        otp_code = issue_otp(email, EMAIL_VERIFICATION)
+        enqueue_email(EMAIL_OTP, email, otp_code=otp_code)
         
-        if send_email_with_otp(email, otp_obj.otp_code):
-            return Response({
-                'message': f'Verification code sent to {email}. Please check your email.',
-                'email': email
-            }, status=status.HTTP_200_OK)
-        else:
-            return Response(
-                {'error': 'Failed to send verification email. Please try again.'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        return Response({
+            'message': f'Verification code sent to {email}. Please check your email.',
+            'email': email
+        }, status=status.HTTP_200_OK)
     
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -191,30 +196,22 @@ def verify_otp(request):
         email = serializer.validated_data['email']
         otp_code = serializer.validated_data['otp_code']
         
-        try:
-            otp_obj = EmailVerification.objects.filter(
-                email=email,
-                otp_code=otp_code,
-                is_used=False,
-                is_verified=False
-            ).latest('created_at')
-            
-            if otp_obj.is_valid():
-                return Response({
-                    'message': 'OTP verified successfully. You can now complete your registration.',
-                    'verified': True
-                }, status=status.HTTP_200_OK)
-            else:
-                return Response(
-                    {'error': 'OTP has expired. Please request a new one.'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-                
-        except EmailVerification.DoesNotExist:
+        # Only checks the code; registration consumes it
+        otp_status = check_otp(email, otp_code, EMAIL_VERIFICATION)
+        if otp_status == OTP_VALID:
+            return Response({
+                'message': 'OTP verified successfully. You can now complete your registration.',
+                'verified': True
+            }, status=status.HTTP_200_OK)
+        if otp_status == OTP_EXPIRED:
             return Response(
-                {'error': 'Invalid OTP code.'},
+                {'error': 'OTP has expired. Please request a new one.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        return Response(
+            {'error': 'Invalid OTP code.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
     
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -237,15 +234,12 @@ def resend_otp(request):
             )
         
         try:
-            # Check for very recent OTPs for this email to prevent hammering the endpoint
-            recent_otp = EmailVerification.objects.filter(
-                email=email,
-                is_used=False,
-                created_at__gte=timezone.now() - timedelta(seconds=30)  # Shorter window for resend
-            ).first()
-            
-            if recent_otp:
-                time_elapsed = timezone.now() - recent_otp.created_at
+            # Check for a very recent OTP for this email to prevent hammering the endpoint
+            issued_at = otp_issued_at(email, EMAIL_VERIFICATION)
+
+            # Shorter window for resend
+            if issued_at and issued_at >= timezone.now() - timedelta(seconds=30):
+                time_elapsed = timezone.now() - issued_at
                 time_elapsed_seconds = time_elapsed.total_seconds()
                 remaining_seconds = 30 - time_elapsed_seconds
                 
@@ -258,48 +252,132 @@ def resend_otp(request):
         except Exception as e:
             logger.error(f"Error checking recent OTPs: {e}")
             
-        # Generate new OTP
-        otp_obj = EmailVerification.generate_otp(email)
+        # Generate new OTP and queue the email
+        otp_code = issue_otp(email, EMAIL_VERIFICATION)
+        enqueue_email(EMAIL_OTP, email, otp_code=otp_code)
         
-        if send_email_with_otp(email, otp_obj.otp_code):
-            return Response({
-                'message': f'New verification code sent to {email}.',
-                'email': email
-            }, status=status.HTTP_200_OK)
-        else:
-            return Response(
-                {'error': 'Failed to send verification email. Please try again.'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        return Response({
+            'message': f'New verification code sent to {email}.',
+            'email': email
+        }, status=status.HTTP_200_OK)
     
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class SavedScholarshipViewSet(viewsets.ModelViewSet):
+class SavedScholarshipViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """API endpoint for saved scholarships"""
     
     serializer_class = SavedScholarshipSerializer
     permission_classes = [IsAuthenticated]
+    membership_max_ids = 200
     
     def get_queryset(self):
-        return SavedScholarship.objects.filter(user=self.request.user)
+        # Scholarships, their country and every taxonomy the nested serializer
+        # renders are loaded up front, so the query count does not grow with the list
+        queryset = (
+            SavedScholarship.objects.filter(user=self.request.user)
+            .select_related('scholarship__country')
+            .prefetch_related(*(f'scholarship__{field}' for field in SCHOLARSHIP_M2M_FIELDS))
+            .order_by('-date_saved', '-id')
+        )
+        return self.sparse_queryset(queryset)
     
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+        refresh_saved_ids(self.request.user.pk)
+
+    def perform_destroy(self, instance):
+        instance.delete()
+        refresh_saved_ids(self.request.user.pk)
 
+    @action(detail=False, methods=['post'])
+    def batch(self, request):
+        """Save and unsave several scholarships in one request"""
+        serializer = SavedScholarshipBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        to_save = set(serializer.validated_data['save'])
+        to_unsave = set(serializer.validated_data['unsave'])
+
+        existing = set(Scholarship.objects.filter(pk__in=to_save).values_list('pk', flat=True))
+        with transaction.atomic():
+            # The (user, scholarship) unique pair makes repeated saves no-ops
+            SavedScholarship.objects.bulk_create(
+                [SavedScholarship(user=request.user, scholarship_id=pk) for pk in existing],
+                ignore_conflicts=True,
+            )
+            if to_unsave:
+                SavedScholarship.objects.filter(user=request.user, scholarship_id__in=to_unsave).delete()
+            refresh_saved_ids(request.user.pk)
+            # bulk_create sends no post_save
+            invalidate_recommendations(request.user.pk)
+
+        return Response({
+            'saved': sorted(existing),
+            'unsaved': sorted(to_unsave),
+            'not_found': sorted(to_save - existing),
+        })
+
+    @action(detail=False, methods=['get'])
+    def membership(self, request):
+        """
+        Report which of ``?ids=1,2,3`` the user has saved, as the list of saved
+        ids and a bitmap string aligned with the requested ids ("101").
+        """
+        try:
+            ids = [int(part) for part in request.query_params.get('ids', '').split(',') if part.strip()]
+        except ValueError:
+            return Response({'ids': ['Provide a comma-separated list of scholarship ids.']},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > self.membership_max_ids:
+            return Response({'ids': [f'At most {self.membership_max_ids} ids can be checked at once.']},
+                            status=status.HTTP_400_BAD_REQUEST)
 
-class ScholarshipApplicationViewSet(viewsets.ModelViewSet):
+        saved = set(
+            SavedScholarship.objects.filter(user=request.user, scholarship_id__in=ids)
+            .values_list('scholarship_id', flat=True)
+        )
+        return Response({
+            'saved': [pk for pk in ids if pk in saved],
+            'bitmap': ''.join('1' if pk in saved else '0' for pk in ids),
+        })
+
+
+class ScholarshipApplicationViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """API endpoint for scholarship applications"""
     
     serializer_class = ScholarshipApplicationSerializer
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        return ScholarshipApplication.objects.filter(user=self.request.user)
+        # The serializer reads the scholarship's title, provider and amount for every row
+        queryset = (
+            ScholarshipApplication.objects.filter(user=self.request.user)
+            .select_related('scholarship')
+            .order_by('-last_updated', '-id')
+        )
+        return self.sparse_queryset(queryset)
     
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    @action(detail=False, methods=['get'])
+    def summary(self, request):
+        """Dashboard totals: counts and amounts per status, upcoming deadlines and latest updates"""
+        return Response(get_application_summary(request.user))
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def recommendations(request):
+    """Open scholarships ranked for the user from their profile, saved and applied history and deadlines"""
+    try:
+        limit = min(max(int(request.query_params['limit']), 1), RECOMMENDATION_LIMIT)
+    except (KeyError, ValueError):
+        limit = api_settings.PAGE_SIZE
+    cards = get_feed_cards(get_recommendations(request.user)[:limit])
+    serializer = ScholarshipCardSerializer(cards, many=True, context={'request': request})
+    return Response({'results': serializer.data})
+
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
@@ -313,21 +391,15 @@ def password_reset_request(request):
         
         try:
             # Generate OTP for password reset
-            otp_obj = EmailVerification.generate_otp(email, 'password_reset')
+            otp_code = issue_otp(email, PASSWORD_RESET)
             
-            # Send password reset email
-            email_sent = send_password_reset_otp(email, otp_obj.otp_code)
+            # Queue the password reset email
+            enqueue_email(EMAIL_PASSWORD_RESET, email, otp_code=otp_code)
             
-            if email_sent:
-                return Response({
-                    'message': 'Password reset code has been sent to your email address.',
-                    'email': email
-                }, status=status.HTTP_200_OK)
-            else:
-                return Response(
-                    {'error': 'Failed to send password reset email. Please try again.'},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
+            return Response({
+                'message': 'Password reset code has been sent to your email address.',
+                'email': email
+            }, status=status.HTTP_200_OK)
                 
         except Exception as e:
             logger.error(f"Password reset request failed for {email}: {e}")
@@ -354,21 +426,17 @@ def password_reset_confirm(request):
             # Get the user
             user = User.objects.get(email=email)
             
-            # Mark OTP as used
-            otp_obj = EmailVerification.objects.filter(
-                email=email,
-                otp_code=otp_code,
-                verification_type='password_reset',
-                is_used=False
-            ).latest('created_at')
-            
-            otp_obj.is_used = True
-            otp_obj.is_verified = True
-            otp_obj.save()
-            
-            # Update user password
-            user.set_password(new_password)
-            user.save()
+            with transaction.atomic():
+                # Checks and uses up the OTP in one UPDATE; rolled back if the password can't be saved
+                if not consume_otp(email, otp_code, PASSWORD_RESET):
+                    return Response(
+                        {'error': 'Invalid or expired OTP code.'},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                
+                # Update user password
+                user.set_password(new_password)
+                user.save()
             
             logger.info(f"Password reset successful for user: {email}")
             
@@ -381,11 +449,6 @@ def password_reset_confirm(request):
                 {'error': 'User not found.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        except EmailVerification.DoesNotExist:
-            return Response(
-                {'error': 'Invalid or expired OTP code.'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
         except Exception as e:
             logger.error(f"Password reset confirmation failed for {email}: {e}")
             return Response(